@@ -1,7 +1,10 @@
-import random
+import os
 import sys
+import copy
 import time
 import json
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 current_file = Path(__file__).resolve()
@@ -10,6 +13,7 @@ project_root = current_file.parents[2]
 if str(project_root) not in sys.path:
     sys.path.append(str(project_root))
 
+from src.common.distance_oracle import DenseDistanceOracle
 from src.common.utils import load_tsp_data, load_optimal_cost, get_results_dir
 
 
@@ -19,68 +23,155 @@ class GeneticAlgorithmTSP:
     Operators:
         Selection  : Tournament selection (size=5)
         Crossover  : Ordered Crossover (OX)
-        Mutation   : Swap mutation
+        Mutation   : Swap mutation (optionally restricted to k-nearest candidates)
         Elitism    : Best individual always survives
     """
 
-    def __init__(self, num_cities, pop_size=100, mutation_rate=0.01, generations=500, seed=None):
-        self.num_cities = num_cities
+    def __init__(self, num_cities, pop_size=100, mutation_rate=0.01, generations=500, seed=None,
+                 neighbors=None, instance=None):
+        self.num_cities = instance.num_cities if instance is not None else num_cities
         self.pop_size = pop_size
         self.mutation_rate = mutation_rate
         self.generations = generations
         self.seed = seed
 
-        if self.seed is not None:
-            random.seed(self.seed)
+        # Optional (N, k) candidate lists from build_neighbor_lists();
+        # when given, mutation only creates candidate edges
+        self.neighbors = neighbors
 
-        # Load TSP data
-        self.distance_matrix, _, _ = load_tsp_data(num_cities)
+        # Local generator — keeps runs reproducible without touching global state
+        self.rng = np.random.default_rng(self.seed)
 
-        # Load optimal cost from Brute Force solution for gap calculation
-        self.optimal_cost = load_optimal_cost(num_cities)
-        if self.optimal_cost == 0.0:
-            print(f"  [WARN] Optimal cost unavailable for N={num_cities}. Gap will be N/A.")
+        if instance is not None:
+            # Already-loaded instance (e.g. shared by the benchmark runner)
+            self.distance_matrix = instance.distance_matrix
+            self.distances = instance.distance_oracle
+            self.optimal_cost = instance.optimal_cost
+        else:
+            # Load TSP data
+            self.distance_matrix, _, _ = load_tsp_data(num_cities)
+            self.distances = DenseDistanceOracle(self.distance_matrix)
+
+            # Load optimal cost from Brute Force solution for gap calculation
+            self.optimal_cost = load_optimal_cost(num_cities)
+            if self.optimal_cost == 0.0:
+                print(f"  [WARN] Optimal cost unavailable for N={num_cities}. Gap will be N/A.")
 
     def calculate_distance(self, route):
         """Calculates closed-loop total distance of a route."""
-        distance = 0
-        for i in range(len(route) - 1):
-            distance += self.distance_matrix[route[i]][route[i + 1]]
-        distance += self.distance_matrix[route[-1]][route[0]]
-        return distance
+        return self.distances.tour_cost(route)
+
+    def evaluate_population(self, population):
+        """Closed-loop distances of every route in a (pop_size, N) array.
+
+        One batched distance lookup for all edges of all routes (a gather
+        over the matrix, or on-the-fly Euclidean distances for
+        coordinate-only instances), followed by a row-wise sum.
+        """
+        next_cities = np.roll(population, -1, axis=1)
+        return self.distances.edges(population, next_cities).sum(axis=1)
 
     def create_population(self):
-        """Creates initial population of random routes."""
-        base_route = list(range(self.num_cities))
-        return [random.sample(base_route, self.num_cities) for _ in range(self.pop_size)]
-
-    def selection(self, population, distances):
-        """Tournament selection (tournament size = 5)."""
-        candidates = random.sample(range(len(population)), 5)
-        best_idx = min(candidates, key=lambda i: distances[i])
-        return population[best_idx]
-
-    def crossover(self, parent1, parent2):
-        """Ordered Crossover (OX)."""
-        size = self.num_cities
-        start, end = sorted(random.sample(range(size), 2))
-        child = [-1] * size
-        child[start:end] = parent1[start:end]
-
-        pointer = 0
-        for city in parent2:
-            if city not in child:
-                while child[pointer] != -1:
-                    pointer += 1
-                child[pointer] = city
-        return child
-
-    def mutate(self, route):
-        """Swap mutation: randomly swap two cities."""
-        if random.random() < self.mutation_rate:
-            i, j = random.sample(range(self.num_cities), 2)
-            route[i], route[j] = route[j], route[i]
-        return route
+        """Creates initial population as a (pop_size, N) array of random routes."""
+        base_routes = np.tile(np.arange(self.num_cities), (self.pop_size, 1))
+        return self.rng.permuted(base_routes, axis=1)
+
+    def selection(self, population, distances, num_parents):
+        """Tournament selection (tournament size = 5) for num_parents winners at once."""
+        candidates = self.rng.integers(0, len(population), size=(num_parents, 5))
+        winners = candidates[np.arange(num_parents), np.argmin(distances[candidates], axis=1)]
+        return population[winners]
+
+    def _distinct_pairs(self, size, count):
+        """count pairs of distinct random indices in [0, size)."""
+        i = self.rng.integers(0, size, count)
+        j = (i + self.rng.integers(1, size, count)) % size
+        return i, j
+
+    def crossover(self, parents1, parents2):
+        """Ordered Crossover (OX) on a batch of parent pairs.
+
+        Row k of the result keeps parents1[k][start:end] in place and fills
+        the remaining slots, left to right, with the missing cities in the
+        order they appear in parents2[k]. A membership mask replaces the
+        list scan, so each child costs O(N).
+        """
+        count, size = parents1.shape
+        start, end = self._distinct_pairs(size, count)
+        start, end = np.minimum(start, end), np.maximum(start, end)
+
+        positions = np.arange(size)
+        in_segment = (positions >= start[:, None]) & (positions < end[:, None])
+
+        # copied[k, city] is True when parents1[k] contributes that city
+        copied = np.zeros((count, size), dtype=bool)
+        np.put_along_axis(copied, parents1, in_segment, axis=1)
+        from_parent2 = ~np.take_along_axis(copied, parents2, axis=1)
+
+        # Each row has as many free slots as missing cities, so row-major
+        # boolean assignment lines them up in order
+        children = parents1.copy()
+        children[~in_segment] = parents2[from_parent2]
+        return children
+
+    def mutate(self, routes):
+        """Swap mutation on a batch: each route swaps two cities with probability mutation_rate.
+
+        With candidate lists, a random city a picks one of its nearest
+        neighbours c, and c is swapped into the slot right after a.
+        """
+        mutated = np.flatnonzero(self.rng.random(len(routes)) < self.mutation_rate)
+        if len(mutated) == 0:
+            return routes
+
+        if self.neighbors is None:
+            i, j = self._distinct_pairs(self.num_cities, len(mutated))
+        else:
+            a_pos = self.rng.integers(0, self.num_cities, len(mutated))
+            a = routes[mutated, a_pos]
+            c = self.neighbors[a, self.rng.integers(0, self.neighbors.shape[1], len(mutated))]
+            i = (a_pos + 1) % self.num_cities
+            j = np.argmax(routes[mutated] == c[:, None], axis=1)
+        city_i = routes[mutated, i]
+        routes[mutated, i] = routes[mutated, j]
+        routes[mutated, j] = city_i
+        return routes
+
+    def next_generation(self, population, distances):
+        """Builds the next generation, keeping the best individual (elitism)."""
+        num_children = self.pop_size - 1
+        parents1 = self.selection(population, distances, num_children)
+        parents2 = self.selection(population, distances, num_children)
+        children = self.mutate(self.crossover(parents1, parents2))
+        return np.vstack([population[np.argmin(distances)][None, :], children])
+
+    def evolve(self, population, generations):
+        """Evolves a population for a number of generations.
+
+        Returns:
+            population (np.ndarray): Population after the last generation
+            best_route (np.ndarray): Best route seen (open, length N)
+            best_distance (float): Distance of best_route
+            history (list[float]): Best distance so far at each generation
+        """
+        best_distance = float("inf")
+        best_route = population[0].copy()
+        history = []
+
+        for gen in range(generations):
+            distances = self.evaluate_population(population)
+            best_idx = int(np.argmin(distances))
+            min_dist = float(distances[best_idx])
+
+            if min_dist < best_distance:
+                best_distance = min_dist
+                best_route = population[best_idx].copy()
+
+            history.append(best_distance)
+
+            population = self.next_generation(population, distances)
+
+        return population, best_route, best_distance, history
 
     def run(self):
         """
@@ -98,53 +189,157 @@ class GeneticAlgorithmTSP:
 
         start_time = time.time()
         population = self.create_population()
-        global_best_distance = float("inf")
-        global_best_route = []
-        convergence_history = []  # best cost per generation
+        _, global_best_route, global_best_distance, convergence_history = self.evolve(
+            population, self.generations)
+        duration = time.time() - start_time
 
-        for gen in range(self.generations):
-            distances = [self.calculate_distance(ind) for ind in population]
-            min_dist = min(distances)
+        closed_path = self._report(global_best_route, global_best_distance, duration)
+        return closed_path, global_best_distance, duration, convergence_history
+
+    def run_islands(self, num_islands=4, migration_interval=50, num_migrants=2,
+                    topology="ring", workers=None):
+        """
+        Runs the island-model GA across worker processes.
 
-            if min_dist < global_best_distance:
-                global_best_distance = min_dist
-                best_idx = distances.index(min_dist)
-                global_best_route = population[best_idx][:]
+        Each island evolves its own population of pop_size routes with an
+        independent RNG stream spawned from the run seed. Every
+        migration_interval generations the best num_migrants routes of each
+        island replace the worst routes of its neighbours.
+
+        Args:
+            num_islands: Number of sub-populations (K)
+            migration_interval: Generations between migrations (M)
+            num_migrants: Routes each island sends per migration
+            topology: 'ring' (island i -> i+1) or 'full' (every island -> all others)
+            workers: Worker processes (default: min(K, CPU count)); 1 runs in-process
+
+        Returns:
+            Same tuple as run(). convergence_history holds the best cost
+            across all islands at each generation.
+        """
+        if topology not in ("ring", "full"):
+            raise ValueError(f"Unknown migration topology: {topology!r}")
+        if workers is None:
+            workers = min(num_islands, os.cpu_count() or 1)
 
-            convergence_history.append(global_best_distance)
+        print(f"Starting Island-Model GA (N={self.num_cities}, islands={num_islands}, "
+              f"pop={self.pop_size}, gen={self.generations}, "
+              f"migration={migration_interval}/{topology}, workers={workers})")
 
-            # Build next generation with elitism
-            elite_idx = distances.index(min_dist)
-            new_population = [population[elite_idx]]
-            while len(new_population) < self.pop_size:
-                p1 = self.selection(population, distances)
-                p2 = self.selection(population, distances)
-                child = self.mutate(self.crossover(p1, p2))
-                new_population.append(child)
+        start_time = time.time()
+        rngs = [np.random.default_rng(s)
+                for s in np.random.SeedSequence(self.seed).spawn(num_islands)]
+        base_rng, populations = self.rng, []
+        for rng in rngs:
+            self.rng = rng
+            populations.append(self.create_population())
+        self.rng = base_rng
 
-            population = new_population
+        global_best_distance = float("inf")
+        global_best_route = populations[0][0].copy()
+        convergence_history = []
+
+        if workers > 1:
+            executor = ProcessPoolExecutor(max_workers=workers,
+                                           initializer=_init_island_worker,
+                                           initargs=(self,))
+            map_islands = executor.map
+        else:
+            executor = None
+            _init_island_worker(copy.copy(self))
+            map_islands = map
+
+        try:
+            remaining = self.generations
+            while remaining > 0:
+                epoch = min(migration_interval, remaining)
+                tasks = [(populations[k], rngs[k], epoch) for k in range(num_islands)]
+                results = list(map_islands(_evolve_island, tasks))
+                remaining -= epoch
+
+                histories = []
+                for k, (population, distances, best_route, best_distance, history, rng) in enumerate(results):
+                    populations[k], rngs[k] = population, rng
+                    histories.append(history)
+                    if best_distance < global_best_distance:
+                        global_best_distance = best_distance
+                        global_best_route = best_route
+                epoch_best = np.min(histories, axis=0)
+                if convergence_history:
+                    epoch_best = np.minimum(epoch_best, convergence_history[-1])
+                convergence_history.extend(float(v) for v in epoch_best)
+
+                if remaining > 0 and num_islands > 1:
+                    self._migrate(populations, [r[1] for r in results],
+                                  num_migrants, topology)
+        finally:
+            if executor is not None:
+                executor.shutdown()
 
         duration = time.time() - start_time
 
+        closed_path = self._report(global_best_route, global_best_distance, duration)
+        return closed_path, global_best_distance, duration, convergence_history
+
+    def _migrate(self, populations, distances, num_migrants, topology):
+        """Replaces the worst routes of each island with migrants from its neighbours."""
+        num_islands = len(populations)
+        migrants = [populations[k][np.argsort(distances[k])[:num_migrants]]
+                    for k in range(num_islands)]
+
+        for k in range(num_islands):
+            if topology == "ring":
+                incoming = migrants[k - 1]
+            else:
+                incoming = np.vstack([migrants[j] for j in range(num_islands) if j != k])
+            # Never overwrite the island's own best route
+            incoming = incoming[:self.pop_size - 1]
+            worst = np.argsort(distances[k])[len(distances[k]) - len(incoming):]
+            populations[k][worst] = incoming
+
+    def _report(self, best_route, best_distance, duration):
+        """Prints the run summary and returns the closed tour."""
         # Build closed tour
-        closed_path = [int(c) for c in global_best_route]
+        closed_path = [int(c) for c in best_route]
         closed_path.append(closed_path[0])
 
         # Optimality gap
         if self.optimal_cost > 0:
-            gap = (global_best_distance - self.optimal_cost) / self.optimal_cost * 100
+            gap = (best_distance - self.optimal_cost) / self.optimal_cost * 100
         else:
             gap = None
 
         print(f"   -> Completed in {duration:.4f}s | Generations: {self.generations}")
-        print(f"   -> GA Best Cost: {global_best_distance:.4f}")
+        print(f"   -> GA Best Cost: {best_distance:.4f}")
         if gap is not None:
             print(f"   -> Optimality Gap: {gap:.2f}%")
         else:
             print("   -> Optimality Gap: N/A")
         print("-" * 40)
 
-        return closed_path, global_best_distance, duration, convergence_history
+        return closed_path
+
+
+# ── Island-model worker helpers ────────────────────────────────────────────
+# Module-level so they can be pickled by ProcessPoolExecutor. Each worker
+# receives the GA (distance matrix + parameters) once, then only
+# populations and RNG states travel per epoch.
+
+_ISLAND_GA = None
+
+
+def _init_island_worker(ga):
+    global _ISLAND_GA
+    _ISLAND_GA = ga
+
+
+def _evolve_island(task):
+    """Runs one island for an epoch; returns its evaluated population and RNG."""
+    population, rng, generations = task
+    _ISLAND_GA.rng = rng
+    population, best_route, best_distance, history = _ISLAND_GA.evolve(population, generations)
+    distances = _ISLAND_GA.evaluate_population(population)
+    return population, distances, best_route, best_distance, history, _ISLAND_GA.rng
 
 
 if __name__ == "__main__":
@@ -0,0 +1,212 @@
+import os
+import sys
+import json
+import math
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+current_file = Path(__file__).resolve()
+project_root = current_file.parents[2]
+if str(project_root) not in sys.path:
+    sys.path.append(str(project_root))
+
+from src.classical.or_tools_solver import ORToolsTSPSolver
+from src.common.utils import load_optimal_cost, load_tsp_data, get_results_dir
+
+
+# First-solution strategy + metaheuristic pairs tried by default
+DEFAULT_PORTFOLIO = [
+    {"first_solution_strategy": "PATH_CHEAPEST_ARC", "metaheuristic": "GUIDED_LOCAL_SEARCH"},
+    {"first_solution_strategy": "PATH_CHEAPEST_ARC", "metaheuristic": "TABU_SEARCH"},
+    {"first_solution_strategy": "SAVINGS", "metaheuristic": "GUIDED_LOCAL_SEARCH"},
+    {"first_solution_strategy": "CHRISTOFIDES", "metaheuristic": "SIMULATED_ANNEALING"},
+    {"first_solution_strategy": "LOCAL_CHEAPEST_INSERTION", "metaheuristic": "GUIDED_LOCAL_SEARCH"},
+    {"first_solution_strategy": "PARALLEL_CHEAPEST_INSERTION", "metaheuristic": "GENERIC_TABU_SEARCH"},
+]
+
+
+def config_name(config):
+    """Readable key of a portfolio configuration, e.g. 'SAVINGS+GUIDED_LOCAL_SEARCH'."""
+    return f"{config['first_solution_strategy']}+{config['metaheuristic']}"
+
+
+class ORToolsPortfolioSolver:
+    """Runs several OR-Tools configurations in parallel and keeps the best tour.
+
+    Each configuration is solved in its own worker process with its own
+    RoutingModel (built from the pre-scaled transit matrix). The time
+    budget is shared: configurations run in rounds of `workers`, and each
+    gets time_limit_sec / rounds seconds, so the whole portfolio finishes
+    within roughly time_limit_sec of wall-clock time.
+    """
+
+    def __init__(self, distance_matrix, configs=None, time_limit_sec=10.0,
+                 workers=None, scale=1000):
+        self.distance_matrix = distance_matrix
+        self.num_cities = len(distance_matrix)
+        self.configs = configs if configs is not None else DEFAULT_PORTFOLIO
+        self.time_limit_sec = time_limit_sec
+        self.workers = workers if workers is not None else min(len(self.configs), os.cpu_count() or 1)
+        self.scale = scale
+
+    def solve(self):
+        """Solves TSP with every configuration of the portfolio.
+
+        Returns:
+            dict with: best_tour, best_cost, duration_sec, convergence_history
+            (of the winning configuration), winning_config, tied_configs,
+            portfolio_results
+            None if no configuration found a solution.
+
+        Configurations that reach the best cost all appear in tied_configs;
+        the first of them in portfolio order is the winning_config.
+        """
+        rounds = math.ceil(len(self.configs) / self.workers)
+        per_config_limit = self.time_limit_sec / rounds
+        tasks = [(config, per_config_limit, self.scale) for config in self.configs]
+
+        start_time = time.time()
+        if self.workers > 1:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_portfolio_worker,
+                                     initargs=(self.distance_matrix,)) as executor:
+                results = list(executor.map(_solve_config, tasks))
+        else:
+            _init_portfolio_worker(self.distance_matrix)
+            results = [_solve_config(task) for task in tasks]
+        duration = time.time() - start_time
+
+        portfolio_results = []
+        solved = []
+        for config, result in zip(self.configs, results):
+            portfolio_results.append({
+                "config": config_name(config),
+                "best_cost": float(result["best_cost"]) if result else None,
+                "duration_sec": result["duration_sec"] if result else None
+            })
+            if result is not None:
+                solved.append((config, result))
+
+        if not solved:
+            return None
+
+        best_cost = min(result["best_cost"] for _, result in solved)
+        tied = [(config, result) for config, result in solved
+                if math.isclose(result["best_cost"], best_cost, rel_tol=1e-9)]
+        # Small instances are solved to the optimum by most configurations.
+        # Every config uses its full time slice, so solve times cannot break
+        # the tie; portfolio order does, and the win statistics credit all of them
+        winning_config, result = tied[0]
+        return {
+            "best_tour": result["best_tour"],
+            "best_cost": result["best_cost"],
+            "duration_sec": duration,
+            "convergence_history": result["convergence_history"],
+            "winning_config": config_name(winning_config),
+            "tied_configs": [config_name(config) for config, _ in tied],
+            "portfolio_results": portfolio_results
+        }
+
+
+# ── Worker helpers ─────────────────────────────────────────────────────────
+# Module-level so they can be pickled by ProcessPoolExecutor. The matrix is
+# sent once per worker; each task only carries its configuration.
+
+_PORTFOLIO_MATRIX = None
+
+
+def _init_portfolio_worker(distance_matrix):
+    global _PORTFOLIO_MATRIX
+    _PORTFOLIO_MATRIX = distance_matrix
+
+
+def _solve_config(task):
+    config, time_limit_sec, scale = task
+    solver = ORToolsTSPSolver(_PORTFOLIO_MATRIX, use_transit_matrix=True, scale=scale,
+                              time_limit_sec=time_limit_sec, **config)
+    return solver.solve()
+
+
+# ── Win statistics ─────────────────────────────────────────────────────────
+
+def _wins_path():
+    return get_results_dir("ortools") / "portfolio_wins.json"
+
+
+def record_portfolio_win(num_cities, winning_configs):
+    """Counts a win for every config in winning_configs (all configurations
+    tied on the best cost) at size N in portfolio_wins.json."""
+    path = _wins_path()
+    wins = {}
+    if path.exists():
+        with open(path, "r") as f:
+            wins = json.load(f)
+
+    by_config = wins.setdefault(str(num_cities), {})
+    for name in winning_configs:
+        by_config[name] = by_config.get(name, 0) + 1
+
+    with open(path, "w") as f:
+        json.dump(wins, f, indent=4)
+
+
+if __name__ == "__main__":
+    print("Solving TSP using the OR-Tools portfolio...")
+    print("-" * 60)
+
+    output_dir = get_results_dir("ortools")
+    scenarios = [5, 6, 7]
+
+    for n in scenarios:
+        output_path = output_dir / f"tsp_n{n}_ortools_portfolio_solution.json"
+
+        print(f" [N={n}] Processing: tsp_n{n}.json")
+        try:
+            distance_matrix, _, _ = load_tsp_data(n)
+            solver = ORToolsPortfolioSolver(distance_matrix, time_limit_sec=5.0)
+            result = solver.solve()
+
+            if result is None:
+                print(f"    -> ERROR: No solution found.")
+                continue
+
+            record_portfolio_win(n, result["tied_configs"])
+
+            optimal_cost = load_optimal_cost(n)
+            best_cost = result["best_cost"]
+            gap = ((best_cost - optimal_cost) / optimal_cost * 100
+                   if optimal_cost > 0 else None)
+
+            output_data = {
+                "algorithm": "Google OR-Tools Portfolio",
+                "num_cities": n,
+                "best_tour": result["best_tour"],
+                "best_cost": float(best_cost),
+                "optimal_cost": float(optimal_cost),
+                "optimality_gap_percent": round(gap, 4) if gap is not None else None,
+                "duration_sec": round(result["duration_sec"], 6),
+                "run_params": {
+                    "winning_config": result["winning_config"],
+                    "tied_configs": result["tied_configs"],
+                    "time_limit_sec": solver.time_limit_sec,
+                    "workers": solver.workers
+                },
+                "portfolio_results": result["portfolio_results"],
+                "convergence_history": [round(v, 4) for v in result["convergence_history"]]
+            }
+
+            with open(output_path, "w") as f:
+                json.dump(output_data, f, indent=4)
+
+            print(f"    -> Winner: {result['winning_config']}")
+            print(f"    -> Cost: {best_cost:.4f}")
+            if gap is not None:
+                print(f"    -> Optimality Gap: {gap:.2f}%")
+            print(f"    -> SAVED: {output_path.name}\n")
+
+        except Exception as e:
+            print(f"    -> ERROR: {e}")
+            import traceback; traceback.print_exc()
+
+    print("-" * 60)
+    print("All tasks completed.")
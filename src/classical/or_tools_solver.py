@@ -1,6 +1,7 @@
 import sys
 import json
 import time
+import numpy as np
 from pathlib import Path
 from ortools.constraint_solver import pywrapcp, routing_enums_pb2
 
@@ -13,46 +14,117 @@ from src.common.utils import load_optimal_cost, load_tsp_data, get_raw_dir, get_
 
 
 class ORToolsTSPSolver:
-    """Solves TSP using Google OR-Tools (PATH_CHEAPEST_ARC strategy).
+    """Solves TSP using Google OR-Tools (PATH_CHEAPEST_ARC strategy by default).
     
     Used as a deterministic industry-standard benchmark (Plan B).
     Distances are rounded to integers for OR-Tools, but the real
     floating-point cost is recalculated from the original matrix.
+
+    Optional modes:
+        use_transit_matrix : Register a pre-scaled integer cost matrix, so
+                             no Python callback runs during search
+        scale              : Integer scale factor applied before rounding
+                             (e.g. 1000 keeps three decimals)
+        metaheuristic      : 'GUIDED_LOCAL_SEARCH', 'TABU_SEARCH', ... —
+                             improves the first solution until
+                             time_limit_sec / solution_limit is reached
     """
 
-    def __init__(self, distance_matrix):
+    def __init__(self, distance_matrix, first_solution_strategy="PATH_CHEAPEST_ARC",
+                 use_transit_matrix=False, scale=1, metaheuristic=None,
+                 time_limit_sec=None, solution_limit=None):
         self.distance_matrix = distance_matrix
         self.num_cities = len(distance_matrix)
+        self.first_solution_strategy = first_solution_strategy
+        self.use_transit_matrix = use_transit_matrix
+        self.scale = scale
+        self.metaheuristic = metaheuristic
+        self.time_limit_sec = time_limit_sec
+        self.solution_limit = solution_limit
+
+        if metaheuristic is not None and time_limit_sec is None and solution_limit is None:
+            raise ValueError("A metaheuristic needs time_limit_sec or solution_limit to stop.")
 
         self.manager = pywrapcp.RoutingIndexManager(self.num_cities, 1, 0)
         self.routing = pywrapcp.RoutingModel(self.manager)
 
-        self._register_distance_callback()
+        if self.use_transit_matrix:
+            self._register_distance_matrix()
+        else:
+            self._register_distance_callback()
         self._set_search_parameters()
 
+        # Registered once: every solve() on this model reuses the same callback
+        self._convergence_history = []
+        self._best_objective = None
+        self.routing.AddAtSolutionCallback(self._record_solution)
+
+    def _record_solution(self):
+        # Best-so-far: GLS / tabu search also accept worsening solutions. The
+        # best is picked on the solver's (rounded, scaled) objective, like the
+        # returned solution, but recorded as the float cost of its route
+        objective = self.routing.CostVar().Max()
+        if self._best_objective is None or objective < self._best_objective:
+            self._best_objective = objective
+            route = []
+            index = self.routing.Start(0)
+            while not self.routing.IsEnd(index):
+                route.append(int(self.manager.IndexToNode(index)))
+                index = self.routing.NextVar(index).Value()
+            route.append(route[0])
+            self._best_cost = self._route_cost(route)
+        self._convergence_history.append(self._best_cost)
+
+    def _route_cost(self, route):
+        """Real float cost of a closed route (OR-Tools solves on rounded ints)."""
+        return sum(
+            self.distance_matrix[route[i]][route[i + 1]]
+            for i in range(len(route) - 1)
+        )
+
     def _register_distance_callback(self):
         def distance_callback(from_index, to_index):
             from_node = self.manager.IndexToNode(from_index)
             to_node = self.manager.IndexToNode(to_index)
             # OR-Tools requires integer costs — round to nearest integer
-            return int(round(self.distance_matrix[from_node][to_node]))
+            return int(round(self.distance_matrix[from_node][to_node] * self.scale))
 
         transit_idx = self.routing.RegisterTransitCallback(distance_callback)
         self.routing.SetArcCostEvaluatorOfAllVehicles(transit_idx)
 
+    def _register_distance_matrix(self):
+        # Scaled and rounded once; OR-Tools keeps the matrix on the C++ side.
+        # With a single depot at node 0, node indices equal routing indices.
+        int_matrix = np.rint(np.asarray(self.distance_matrix, dtype=float) * self.scale)
+        transit_idx = self.routing.RegisterTransitMatrix(int_matrix.astype(np.int64).tolist())
+        self.routing.SetArcCostEvaluatorOfAllVehicles(transit_idx)
+
     def _set_search_parameters(self):
         self.search_parameters = pywrapcp.DefaultRoutingSearchParameters()
-        self.search_parameters.first_solution_strategy = (
-            routing_enums_pb2.FirstSolutionStrategy.PATH_CHEAPEST_ARC
+        self.search_parameters.first_solution_strategy = getattr(
+            routing_enums_pb2.FirstSolutionStrategy, self.first_solution_strategy
         )
+        if self.metaheuristic is not None:
+            self.search_parameters.local_search_metaheuristic = getattr(
+                routing_enums_pb2.LocalSearchMetaheuristic, self.metaheuristic
+            )
+        if self.time_limit_sec is not None:
+            self.search_parameters.time_limit.FromMilliseconds(int(self.time_limit_sec * 1000))
+        if self.solution_limit is not None:
+            self.search_parameters.solution_limit = self.solution_limit
 
     def solve(self):
         """Solves TSP and returns best tour with real float cost.
 
         Returns:
-            dict with: best_tour, best_cost, duration_sec
+            dict with: best_tour, best_cost, duration_sec, convergence_history
+            (float cost of the best solution so far at every accepted solution,
+            the same best-so-far curve GA and SA report)
             None if no solution found.
         """
+        self._convergence_history = []
+        self._best_objective = None
+
         start_time = time.time()
         solution = self.routing.SolveWithParameters(self.search_parameters)
         duration = time.time() - start_time
@@ -69,15 +141,13 @@ class ORToolsTSPSolver:
         route.append(route[0])  # close the tour
 
         # Recalculate real float cost (OR-Tools solved on rounded ints)
-        real_cost = sum(
-            self.distance_matrix[route[i]][route[i + 1]]
-            for i in range(len(route) - 1)
-        )
+        real_cost = self._route_cost(route)
 
         return {
             "best_tour": route,
             "best_cost": real_cost,
-            "duration_sec": duration
+            "duration_sec": duration,
+            "convergence_history": list(self._convergence_history)
         }
 
 
@@ -3,8 +3,9 @@ import random
 import sys
 import time
 import json
+import numpy as np
 from pathlib import Path
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 current_file = Path(__file__).resolve()
 project_root = current_file.parents[2]
@@ -12,45 +13,93 @@ project_root = current_file.parents[2]
 if str(project_root) not in sys.path:
     sys.path.append(str(project_root))
 
-from src.common.utils import load_tsp_data, load_optimal_cost, get_results_dir
+from src.common.distance_oracle import DenseDistanceOracle
+from src.common.utils import TSPInstance, load_tsp_data, load_optimal_cost, get_results_dir
 
 
 class SimulatedAnnealingTSP:
     """Solves TSP using Simulated Annealing (SA).
     
-    Neighbour : 2-opt (reverse a random segment)
+    Neighbour : 2-opt (reverse a random segment), scored in O(1) from the
+                four affected edges before it is applied
     Acceptance: Metropolis criterion exp(-ΔE / T)
     Cooling   : Geometric cooling T *= alpha each step
     """
 
     def __init__(self, num_cities: int, initial_temp: float = 1000.0,
-                 alpha: float = 0.99, stopping_temp: float = 1e-6, seed: int = None):
-        self.num_cities = num_cities
+                 alpha: float = 0.99, stopping_temp: float = 1e-6, seed: int = None,
+                 neighbors: np.ndarray = None, instance: TSPInstance = None):
+        self.num_cities = instance.num_cities if instance is not None else num_cities
         self.initial_temp = initial_temp
         self.alpha = alpha
         self.stopping_temp = stopping_temp
         self.seed = seed
 
+        # Optional (N, k) candidate lists from build_neighbor_lists();
+        # when given, every 2-opt move creates a candidate edge
+        self.neighbors = neighbors
+        self._candidates = neighbors.tolist() if neighbors is not None else None
+
         if self.seed is not None:
             random.seed(self.seed)
 
-        self.distance_matrix, self.coordinates, _ = load_tsp_data(num_cities)
-        self.optimal_cost = load_optimal_cost(num_cities)
-        if self.optimal_cost == 0.0:
-            print(f"  [WARN] Optimal cost unavailable for N={num_cities}. Gap will be N/A.")
+        if instance is not None:
+            # Already-loaded instance (e.g. shared by the benchmark runner)
+            self.distance_matrix = instance.distance_matrix
+            self.distances = instance.distance_oracle
+            self.coordinates = instance.coordinates
+            self.optimal_cost = instance.optimal_cost
+        else:
+            self.distance_matrix, self.coordinates, _ = load_tsp_data(num_cities)
+            self.distances = DenseDistanceOracle(self.distance_matrix)
+            self.optimal_cost = load_optimal_cost(num_cities)
+            if self.optimal_cost == 0.0:
+                print(f"  [WARN] Optimal cost unavailable for N={num_cities}. Gap will be N/A.")
 
     def calculate_distance(self, route: List[int]) -> float:
         """Closed-loop total distance of a tour."""
-        total = sum(self.distance_matrix[route[i]][route[i + 1]]
-                    for i in range(len(route) - 1))
-        total += self.distance_matrix[route[-1]][route[0]]
-        return total
+        return self.distances.tour_cost(route)
+
+    def _two_opt_move(self, route: List[int], position: Optional[List[int]]) -> Tuple[int, int]:
+        """Random 2-opt move: positions (i, j), i <= j, of the segment to reverse.
 
-    def _two_opt_neighbour(self, route: List[int]) -> List[int]:
-        """2-opt move: reverse a random segment of the route."""
-        i, j = sorted(random.sample(range(self.num_cities), 2))
-        new_route = route[:i] + route[i:j + 1][::-1] + route[j + 1:]
-        return new_route
+        With candidate lists, a random city a and one of its nearest
+        neighbours c are chosen, and the move reverses the segment that
+        makes (a, c) a tour edge.
+        """
+        if self._candidates is None:
+            i, j = sorted(random.sample(range(self.num_cities), 2))
+            return i, j
+
+        a_pos = random.randrange(self.num_cities)
+        c_pos = position[random.choice(self._candidates[route[a_pos]])]
+        if a_pos < c_pos:
+            return a_pos + 1, c_pos
+        return c_pos + 1, a_pos
+
+    def _two_opt_delta(self, route: List[int], i: int, j: int) -> float:
+        """Cost change of reversing route[i..j], from the four affected edges.
+
+        Reversal replaces edges (a, b) and (c, d) with (a, c) and (b, d),
+        where a, b = route[i-1], route[i] and c, d = route[j], route[j+1].
+        Assumes a symmetric distance matrix (inner edges keep their length).
+        """
+        n = len(route)
+        if i == 0 and j == n - 1:
+            return 0.0  # reversing the whole tour yields the same cycle
+
+        a, b = route[i - 1], route[i]
+        c, d = route[j], route[(j + 1) % n]
+        dist = self.distances.pair
+        return dist(a, c) + dist(b, d) - dist(a, b) - dist(c, d)
+
+    @staticmethod
+    def _apply_two_opt(route: List[int], position: Optional[List[int]], i: int, j: int) -> None:
+        """Reverses route[i..j] in place and updates the city -> position index (if kept)."""
+        route[i:j + 1] = route[i:j + 1][::-1]
+        if position is not None:
+            for p in range(i, j + 1):
+                position[route[p]] = p
 
     def run(self) -> Tuple[List[int], float, float, List[float]]:
         """
@@ -69,6 +118,13 @@ class SimulatedAnnealingTSP:
         current_route = list(range(self.num_cities))
         random.shuffle(current_route)
 
+        # City -> position index, only needed to locate candidate neighbours
+        position = None
+        if self._candidates is not None:
+            position = [0] * self.num_cities
+            for p, city in enumerate(current_route):
+                position[city] = p
+
         current_cost = self.calculate_distance(current_route)
         best_route = current_route[:]
         best_cost = current_cost
@@ -78,13 +134,13 @@ class SimulatedAnnealingTSP:
         convergence_history: List[float] = []
 
         while temp > self.stopping_temp:
-            new_route = self._two_opt_neighbour(current_route)
-            new_cost = self.calculate_distance(new_route)
-            delta = new_cost - current_cost
+            i, j = self._two_opt_move(current_route, position)
+            delta = self._two_opt_delta(current_route, i, j)
 
+            # The route is only touched once the move is accepted
             if delta < 0 or random.random() < math.exp(-delta / temp):
-                current_route = new_route
-                current_cost = new_cost
+                self._apply_two_opt(current_route, position, i, j)
+                current_cost += delta
 
             if current_cost < best_cost:
                 best_cost = current_cost
@@ -97,6 +153,8 @@ class SimulatedAnnealingTSP:
             if iteration % 100 == 0:
                 convergence_history.append(best_cost)
 
+        # Re-score once to drop rounding drift accumulated from the deltas
+        best_cost = self.calculate_distance(best_route)
         duration = time.time() - start_time
 
         # Build closed tour
@@ -118,6 +176,122 @@ class SimulatedAnnealingTSP:
 
         return closed_tour, best_cost, duration, convergence_history
 
+    def run_parallel_tempering(self, num_replicas: int = 8, min_temp: float = 0.1,
+                               num_steps: int = 100_000,
+                               swap_interval: int = 100) -> Tuple[List[int], float, float, List[float]]:
+        """
+        Runs parallel tempering: R replica chains on a geometric temperature
+        ladder from min_temp up to initial_temp.
+
+        All routes live in one (R, N) array. Each step draws one 2-opt move
+        per chain, scores every move from its four edges and applies the
+        Metropolis test to all chains at once. Every swap_interval steps,
+        neighbouring temperatures exchange configurations with probability
+        min(1, exp((1/T_k - 1/T_k+1) * (E_k - E_k+1))).
+
+        Per-temperature acceptance and swap rates are stored in
+        self.replica_stats for tuning the ladder.
+
+        Returns:
+            Same tuple as run(); convergence_history is the best cost across
+            replicas sampled every 100 steps.
+        """
+        print(f"Starting Parallel Tempering SA (N={self.num_cities}, replicas={num_replicas}, "
+              f"T=[{min_temp}, {self.initial_temp}], steps={num_steps})")
+
+        start_time = time.time()
+        rng = np.random.default_rng(self.seed)
+        n, edges = self.num_cities, self.distances.edges
+        temps = np.geomspace(min_temp, self.initial_temp, num_replicas)  # index 0 = coldest
+        rows = np.arange(num_replicas)
+
+        routes = rng.permuted(np.tile(np.arange(n), (num_replicas, 1)), axis=1)
+        positions = np.argsort(routes, axis=1)
+        costs = edges(routes, np.roll(routes, -1, axis=1)).sum(axis=1).astype(float)
+
+        best_idx = int(np.argmin(costs))
+        best_cost = float(costs[best_idx])
+        best_route = routes[best_idx].copy()
+
+        accepted = np.zeros(num_replicas, dtype=np.int64)
+        swap_attempts = np.zeros(num_replicas - 1, dtype=np.int64)
+        swap_accepted = np.zeros(num_replicas - 1, dtype=np.int64)
+        convergence_history: List[float] = []
+
+        for step in range(1, num_steps + 1):
+            if self.neighbors is None:
+                i = rng.integers(0, n, num_replicas)
+                j = (i + rng.integers(1, n, num_replicas)) % n
+                lo, hi = np.minimum(i, j), np.maximum(i, j)
+            else:
+                a_pos = rng.integers(0, n, num_replicas)
+                c = self.neighbors[routes[rows, a_pos],
+                                   rng.integers(0, self.neighbors.shape[1], num_replicas)]
+                c_pos = positions[rows, c]
+                lo = np.minimum(a_pos, c_pos) + 1
+                hi = np.maximum(a_pos, c_pos)
+
+            a, b = routes[rows, lo - 1], routes[rows, lo]
+            c, d = routes[rows, hi], routes[rows, (hi + 1) % n]
+            delta = edges(a, c) + edges(b, d) - edges(a, b) - edges(c, d)
+            delta[(lo == 0) & (hi == n - 1)] = 0.0
+
+            accept = rng.random(num_replicas) < np.exp(-np.maximum(delta, 0.0) / temps)
+            for r in np.flatnonzero(accept):
+                routes[r, lo[r]:hi[r] + 1] = routes[r, lo[r]:hi[r] + 1][::-1]
+                positions[r, routes[r, lo[r]:hi[r] + 1]] = np.arange(lo[r], hi[r] + 1)
+            costs += np.where(accept, delta, 0.0)
+            accepted += accept
+
+            k = int(np.argmin(costs))
+            if costs[k] < best_cost:
+                best_cost = float(costs[k])
+                best_route = routes[k].copy()
+
+            # Replica exchange between neighbouring temperatures (alternating parity)
+            if step % swap_interval == 0 and num_replicas > 1:
+                for k in range((step // swap_interval) % 2, num_replicas - 1, 2):
+                    swap_attempts[k] += 1
+                    log_p = (1.0 / temps[k] - 1.0 / temps[k + 1]) * (costs[k] - costs[k + 1])
+                    if log_p >= 0 or rng.random() < math.exp(log_p):
+                        swap_accepted[k] += 1
+                        routes[[k, k + 1]] = routes[[k + 1, k]]
+                        positions[[k, k + 1]] = positions[[k + 1, k]]
+                        costs[[k, k + 1]] = costs[[k + 1, k]]
+
+            if step % 100 == 0:
+                convergence_history.append(best_cost)
+
+        # Re-score once to drop rounding drift accumulated from the deltas
+        best_cost = self.calculate_distance(best_route.tolist())
+        duration = time.time() - start_time
+
+        self.replica_stats = {
+            "temperatures": [float(t) for t in temps],
+            "acceptance_rates": [float(v) for v in accepted / num_steps],
+            "swap_acceptance_rates": [float(v) for v in swap_accepted / np.maximum(swap_attempts, 1)]
+        }
+
+        closed_tour = [int(c) for c in best_route]
+        closed_tour.append(closed_tour[0])
+
+        if self.optimal_cost > 0:
+            gap = (best_cost - self.optimal_cost) / self.optimal_cost * 100
+        else:
+            gap = None
+
+        print(f"   -> Completed in {duration:.4f}s | Steps: {num_steps}")
+        print(f"   -> PT Best Cost: {best_cost:.4f}")
+        if gap is not None:
+            print(f"   -> Optimality Gap: {gap:.2f}%")
+        else:
+            print("   -> Optimality Gap: N/A")
+        for t, acc in zip(temps, self.replica_stats["acceptance_rates"]):
+            print(f"      T={t:10.4f} | acceptance={acc:.3f}")
+        print("-" * 40)
+
+        return closed_tour, best_cost, duration, convergence_history
+
 
 if __name__ == "__main__":
     scenarios = [5, 6, 7]
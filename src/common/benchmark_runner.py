@@ -1,7 +1,11 @@
+import hashlib
+import inspect
 import json
+import os
 import time
 import sys
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
 # Adjust path to import solvers
@@ -13,46 +17,132 @@ if str(project_root) not in sys.path:
 from src.classical.genetic_algo import GeneticAlgorithmTSP
 from src.classical.sim_annealing import SimulatedAnnealingTSP
 from src.classical.or_tools_solver import ORToolsTSPSolver
-from src.common.utils import get_results_dir, load_tsp_data, load_optimal_cost
+from src.common.neighbor_lists import build_neighbor_lists
+from src.common.shared_instance import SharedInstanceStore, attach_instance
+from src.common.utils import get_results_dir, load_tsp_instance
 
-def run_30_tests(algorithm_name, n, runs=30):
-    """Runs designated algorithm 30 times with different seeds."""
-    print(f"\n[BENCHMARK] Algorithm: {algorithm_name} | N: {n} | Runs: {runs}")
-    
-    results = []
+
+# Instances attached by each pool worker at start-up, keyed by N
+_WORKER_INSTANCES = {}
+
+
+def _init_benchmark_worker(handles):
+    for n, handle in handles.items():
+        _WORKER_INSTANCES[n] = attach_instance(handle)
+
+
+def run_single_test(algorithm_name, n, seed, neighbors=None, instance=None):
+    """Runs one (algorithm, N, seed) job and returns (best_cost, duration_sec).
+
+    The instance is taken from the argument, then from the worker's shared
+    instances, and only loaded from disk as a last resort.
+    """
+    if instance is None:
+        instance = _WORKER_INSTANCES.get(n) or load_tsp_instance(n)
+
+    if algorithm_name == "ga":
+        solver = GeneticAlgorithmTSP(num_cities=n, seed=seed, neighbors=neighbors, instance=instance)
+        _, best_cost, duration, _ = solver.run()
+    elif algorithm_name == "sa":
+        solver = SimulatedAnnealingTSP(num_cities=n, seed=seed, neighbors=neighbors, instance=instance)
+        _, best_cost, duration, _ = solver.run()
+    elif algorithm_name == "ortools":
+        # OR-Tools needs every distance up front: coordinate-only instances
+        # (e.g. shared from a binary or TSPLIB file) are expanded here
+        distance_matrix = instance.distance_matrix
+        if distance_matrix is None:
+            distance_matrix = instance.distance_oracle.dense_matrix()
+        solver = ORToolsTSPSolver(distance_matrix)
+        res = solver.solve()
+        best_cost = res["best_cost"]
+        duration = res["duration_sec"]
+    else:
+        raise ValueError(f"Unknown algorithm: {algorithm_name!r}")
+    return float(best_cost), float(duration)
+
+
+def _checkpoint_path(algorithm_name, n):
     output_dir = get_results_dir(algorithm_name.lower().replace(" ", ""))
-    optimal_cost = load_optimal_cost(n)
-    
-    # OR-Tools is deterministic by default in our setup, but we'll loop it for structural consistency
-    for i in range(runs):
-        seed = 2000 + i
-        
-        if algorithm_name == "ga":
-            solver = GeneticAlgorithmTSP(num_cities=n, seed=seed)
-            _, best_cost, duration, _ = solver.run()
-        elif algorithm_name == "sa":
-            solver = SimulatedAnnealingTSP(num_cities=n, seed=seed)
-            _, best_cost, duration, _ = solver.run()
-        elif algorithm_name == "ortools":
-            # For OR-Tools, load matrix first
-            distance_matrix, _, _ = load_tsp_data(n)
-            solver = ORToolsTSPSolver(distance_matrix)
-            res = solver.solve()
-            best_cost = res["best_cost"]
-            duration = res["duration_sec"]
-        
-        # Calculate gap if optimal cost is available
-        gap = None
-        if optimal_cost > 0:
-            gap = round((best_cost - optimal_cost) / optimal_cost * 100, 4)
+    return output_dir / f"tsp_n{n}_benchmark_30runs.checkpoint.jsonl"
+
+
+_SOLVERS = {"ga": GeneticAlgorithmTSP, "sa": SimulatedAnnealingTSP, "ortools": ORToolsTSPSolver}
+
+
+def _solver_params(algorithm_name):
+    """Default constructor arguments run_single_test runs the solver with."""
+    signature = inspect.signature(_SOLVERS[algorithm_name].__init__)
+    return {name: p.default for name, p in signature.parameters.items()
+            if p.default is not inspect.Parameter.empty
+            and name not in ("seed", "neighbors", "instance")}
+
+
+def _instance_fingerprint(instance):
+    """SHA-1 over the instance arrays and optimal cost (gaps are stored per run)."""
+    digest = hashlib.sha1(str(instance.optimal_cost).encode())
+    for array in (instance.coordinates, instance.distance_matrix):
+        if array is not None:
+            array = np.ascontiguousarray(array)
+            digest.update(str((array.dtype.str, array.shape)).encode())
+            digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+def _checkpoint_header(algorithm_name, instance, neighbor_k):
+    """What the checkpointed runs were computed from; a mismatch makes them stale."""
+    return {
+        "algorithm": algorithm_name,
+        "instance": instance.name,
+        "instance_fingerprint": _instance_fingerprint(instance),
+        "neighbor_k": neighbor_k if algorithm_name in ("ga", "sa") else None,
+        "solver_params": _solver_params(algorithm_name)
+    }
+
+
+def _load_checkpoint(path, header):
+    """Completed runs keyed by seed; a torn last line from a crash is ignored.
+
+    The first line of a checkpoint is its header. If it does not match
+    header (other run parameters, or a regenerated instance), the stored
+    runs are stale: the file is discarded and the pair starts over.
+    """
+    completed = {}
+    if path.exists():
+        with open(path, "r") as f:
+            lines = f.readlines()
+        try:
+            stored = json.loads(lines[0])["header"] if lines else None
+        except (json.JSONDecodeError, KeyError, TypeError):
+            stored = None
+        if stored != header:
+            print(f" [STALE] {path.name}: run parameters or instance changed — starting over.")
+            path.unlink()
+            lines = []
+
+        for line in lines[1:]:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            completed[record["seed"]] = record
+
+        # Drop a torn last line, or the next appended run would be glued onto it
+        if lines and not lines[-1].endswith("\n"):
+            with open(path, "w") as f:
+                f.write(json.dumps({"header": header}) + "\n")
+                for record in completed.values():
+                    f.write(json.dumps(record) + "\n")
+
+    if not path.exists():
+        with open(path, "w") as f:
+            f.write(json.dumps({"header": header}) + "\n")
+    return completed
 
-        results.append({
-            "run": i + 1,
-            "seed": seed,
-            "best_cost": float(best_cost),
-            "duration_sec": float(duration),
-            "optimality_gap_percent": gap
-        })
+
+def _write_summary(algorithm_name, n, runs, results):
+    """Statistical summary of all runs → tsp_n{N}_benchmark_30runs.json."""
+    output_dir = get_results_dir(algorithm_name.lower().replace(" ", ""))
+    results = sorted(results, key=lambda r: r["run"])
 
     # Statistical Calculations
     costs = [r["best_cost"] for r in results]
@@ -77,10 +167,144 @@ def run_30_tests(algorithm_name, n, runs=30):
     with open(output_file, "w") as f:
         json.dump(summary, f, indent=4)
         
-    print(f"[COMPLETED] Stats for N={n}: Mean Cost={summary['stats']['mean_cost']:.2f}")
+    print(f"[COMPLETED] Stats for {algorithm_name} N={n}: Mean Cost={summary['stats']['mean_cost']:.2f}")
     return summary
 
+
+def run_benchmark_sweep(algorithms, sizes, runs=30, workers=None, neighbor_k=None, resume=True):
+    """Runs every (algorithm, N, seed) job of a sweep over a process pool.
+
+    Each finished run is appended to a per-(algorithm, N) checkpoint file
+    (tsp_n{N}_benchmark_30runs.checkpoint.jsonl) as soon as it completes,
+    so an interrupted sweep resumes where it stopped. The checkpoint header
+    records the solver parameters, neighbor_k and a fingerprint of the
+    instance; runs checkpointed under different ones are discarded. Once all
+    runs of an (algorithm, N) pair are done, the usual summary JSON is written.
+
+    A run that raises does not stop the others. Once every other run is
+    checkpointed and every complete pair summarised, a RuntimeError is
+    raised from the first failure; a rerun retries only the failed runs.
+
+    Each instance is loaded once. With workers > 1 its arrays are published
+    as memory-mapped files (SharedInstanceStore) that every worker maps
+    read-only instead of receiving a pickled copy.
+
+    Note: with workers > 1, runs share the CPU, so duration_sec reflects
+    a loaded machine. Use workers=1 when timings are the measurement.
+
+    Args:
+        algorithms: e.g. ["ga", "sa", "ortools"]
+        sizes: city counts, e.g. [5, 6, 7]
+        runs: runs per pair; seeds are 2000 + i
+        workers: pool size (default: CPU count); 1 runs in-process
+        neighbor_k: build k-nearest candidate lists once per N for GA/SA
+        resume: reuse checkpointed runs (False starts from scratch)
+
+    Returns:
+        dict: {(algorithm, N): summary} for every pair
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    instances = {n: load_tsp_instance(n) for n in sizes}
+
+    completed, jobs, neighbors = {}, [], {}
+    for algorithm_name in algorithms:
+        for n in sizes:
+            checkpoint = _checkpoint_path(algorithm_name, n)
+            if not resume and checkpoint.exists():
+                checkpoint.unlink()
+            header = _checkpoint_header(algorithm_name, instances[n], neighbor_k)
+            completed[(algorithm_name, n)] = _load_checkpoint(checkpoint, header)
+
+            if neighbor_k and algorithm_name in ("ga", "sa") and n not in neighbors:
+                neighbors[n] = build_neighbor_lists(instances[n].coordinates, k=neighbor_k)
+
+            for i in range(runs):
+                seed = 2000 + i
+                if seed not in completed[(algorithm_name, n)]:
+                    jobs.append((algorithm_name, n, i, seed))
+
+    skipped = sum(len(done) for done in completed.values())
+    print(f"\n[BENCHMARK] {len(jobs)} runs queued ({skipped} already checkpointed) | Workers: {workers}")
+
+    def record(job, outcome):
+        algorithm_name, n, i, seed = job
+        best_cost, duration = outcome
+        optimal_cost = instances[n].optimal_cost
+
+        # Calculate gap if optimal cost is available
+        gap = None
+        if optimal_cost > 0:
+            gap = round((best_cost - optimal_cost) / optimal_cost * 100, 4)
+
+        result = {
+            "run": i + 1,
+            "seed": seed,
+            "best_cost": best_cost,
+            "duration_sec": duration,
+            "optimality_gap_percent": gap
+        }
+        with open(_checkpoint_path(algorithm_name, n), "a") as f:
+            f.write(json.dumps(result) + "\n")
+        completed[(algorithm_name, n)][seed] = result
+
+    failures = []
+
+    def fail(job, error):
+        print(f" [ERROR] {job[0]} N={job[1]} seed={job[3]}: {error!r}")
+        failures.append((job, error))
+
+    def job_args(job):
+        algorithm_name, n, _, seed = job
+        return algorithm_name, n, seed, neighbors.get(n) if algorithm_name in ("ga", "sa") else None
+
+    if workers > 1 and len(jobs) > 1:
+        with SharedInstanceStore() as store:
+            handles = {n: store.publish(instance) for n, instance in instances.items()}
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_benchmark_worker,
+                                     initargs=(handles,)) as executor:
+                futures = {executor.submit(run_single_test, *job_args(job)): job for job in jobs}
+                for future in as_completed(futures):
+                    job = futures[future]
+                    try:
+                        record(job, future.result())
+                    except Exception as e:
+                        fail(job, e)
+    else:
+        for job in jobs:
+            try:
+                record(job, run_single_test(*job_args(job), instance=instances[job[1]]))
+            except Exception as e:
+                fail(job, e)
+
+    summaries = {}
+    for (algorithm_name, n), done in completed.items():
+        results = [r for r in done.values() if r["seed"] < 2000 + runs]
+        if len(results) < runs:
+            print(f" [INCOMPLETE] {algorithm_name} N={n}: {len(results)}/{runs} runs — rerun to resume.")
+            continue
+        summaries[(algorithm_name, n)] = _write_summary(algorithm_name, n, runs, results)
+
+    if failures:
+        (algorithm_name, n, _, seed), error = failures[0]
+        raise RuntimeError(f"{len(failures)} benchmark run(s) failed, first: "
+                           f"{algorithm_name} N={n} seed={seed}") from error
+    return summaries
+
+
+def run_30_tests(algorithm_name, n, runs=30, neighbor_k=None, workers=1):
+    """Runs designated algorithm 30 times with different seeds.
+
+    If neighbor_k is set, k-nearest candidate lists are built once for the
+    instance and shared by every GA/SA run. Completed runs are
+    checkpointed, so a crashed benchmark resumes instead of restarting.
+    """
+    print(f"\n[BENCHMARK] Algorithm: {algorithm_name} | N: {n} | Runs: {runs}")
+    summaries = run_benchmark_sweep([algorithm_name], [n], runs=runs, workers=workers,
+                                    neighbor_k=neighbor_k)
+    return summaries[(algorithm_name, n)]
+
+
 if __name__ == "__main__":
-    for n in [5, 6, 7]:
-        for algo in ["ga", "sa", "ortools"]:
-            run_30_tests(algo, n)
+    run_benchmark_sweep(["ga", "sa", "ortools"], [5, 6, 7])
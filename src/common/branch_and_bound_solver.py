@@ -0,0 +1,355 @@
+import os
+import sys
+import json
+import time
+import numpy as np
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Configure project root for relative imports
+current_file = Path(__file__).resolve()
+project_root = current_file.parents[2]
+if str(project_root) not in sys.path:
+    sys.path.append(str(project_root))
+
+
+def _prim_mst(weights):
+    """Minimum spanning tree of a dense weight matrix (vectorized Prim).
+
+    Returns:
+        total (float): MST weight
+        parent (np.ndarray): parent[v] of each node in the tree (-1 for node 0)
+    """
+    k = len(weights)
+    parent = np.full(k, -1)
+    if k <= 1:
+        return 0.0, parent
+
+    in_tree = np.zeros(k, dtype=bool)
+    in_tree[0] = True
+    best = weights[0].copy()
+    best_from = np.zeros(k, dtype=int)
+    best[0] = np.inf
+    total = 0.0
+
+    for _ in range(k - 1):
+        v = int(np.argmin(best))
+        total += best[v]
+        parent[v] = best_from[v]
+        in_tree[v] = True
+        best[v] = np.inf
+        closer = ~in_tree & (weights[v] < best)
+        best[closer] = weights[v][closer]
+        best_from[closer] = v
+
+    return total, parent
+
+
+def _one_tree_bound(matrix, upper_bound, iterations=200):
+    """Held-Karp 1-tree lower bound with subgradient optimization.
+
+    A 1-tree is an MST over cities 1..N-1 plus the two cheapest edges
+    from city 0. Node penalties pi are adjusted so that every city tends
+    towards degree 2; each 1-tree weight minus 2·Σpi is a valid lower
+    bound on the optimal tour.
+
+    Returns:
+        bound (float): best lower bound found
+        pi (np.ndarray): node penalties that produced it
+    """
+    n = len(matrix)
+    pi = np.zeros(n)
+    best_bound, best_pi = -np.inf, pi.copy()
+    step_scale = 2.0
+
+    for _ in range(iterations):
+        modified = matrix + pi[:, None] + pi[None, :]
+        np.fill_diagonal(modified, np.inf)
+
+        # MST over cities 1..N-1; tree node v is city v+1 and node 0 is the root
+        mst_weight, parent = _prim_mst(modified[1:, 1:])
+        degree = np.zeros(n)
+        np.add.at(degree, np.arange(2, n), 1)
+        np.add.at(degree, parent[1:] + 1, 1)
+
+        closest = np.argsort(modified[0, 1:])[:2] + 1
+        degree[0] = 2
+        degree[closest] += 1
+
+        bound = mst_weight + modified[0, closest].sum() - 2 * pi.sum()
+        if bound > best_bound:
+            best_bound, best_pi = bound, pi.copy()
+
+        subgradient = degree - 2
+        norm = float(subgradient @ subgradient)
+        if norm == 0:
+            break  # the 1-tree is a tour, so the bound is tight
+        pi = pi + step_scale * (upper_bound - bound) / norm * subgradient
+        step_scale *= 0.97
+
+    return float(best_bound), best_pi
+
+
+class BranchAndBoundSolver:
+    """Solves TSP by depth-first branch and bound over a process pool.
+
+    Tours start at city 0 and are extended one city at a time. A partial
+    path is pruned when its lower bound reaches the incumbent:
+        prefix cost + MST(unvisited) + cheapest links last→unvisited→0,
+    evaluated with the node penalties of the root Held-Karp 1-tree bound
+    (which keeps it valid and makes it much tighter).
+
+    The tree is split into all prefixes of split_depth cities after city 0;
+    each prefix is one pool task. Workers share the incumbent upper bound
+    through a multiprocessing.Value, so a tour found by one worker prunes
+    the others immediately. When time_limit runs out, the smallest bound of
+    all unexplored nodes gives a certified lower bound and optimality gap.
+
+    Practical for exact N ≈ 20-30; larger instances return a proven gap.
+    """
+
+    def __init__(self, distance_matrix, time_limit=60.0, workers=None, split_depth=2):
+        self.matrix = np.asarray(distance_matrix, dtype=float)
+        self.num_cities = min(self.matrix.shape)
+        self.time_limit = time_limit
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.split_depth = split_depth
+
+    def solve(self):
+        """Runs the search.
+
+        Returns:
+            dict with: best_tour, best_cost, lower_bound, gap_percent,
+            proven_optimal, nodes_explored, duration_sec
+        """
+        start_time = time.time()
+        deadline = start_time + self.time_limit
+        n = self.num_cities
+
+        best_tour = _two_opt(self.matrix, _nearest_neighbour_tour(self.matrix))
+        best_cost = _tour_cost(self.matrix, best_tour)
+
+        if n <= 3:
+            root_bound, pi = best_cost, np.zeros(n)
+        else:
+            root_bound, pi = _one_tree_bound(self.matrix, best_cost)
+
+        upper_bound = mp.get_context().Value("d", best_cost)
+        _init_worker(self.matrix, pi, upper_bound, deadline)
+
+        # Root split: every prefix of split_depth cities, best bound first
+        tasks = []
+        depth = min(self.split_depth, n - 2)
+        frontier = [([0], 0.0)]
+        for _ in range(depth):
+            frontier = [(path + [c], cost + self.matrix[path[-1], c])
+                        for path, cost in frontier
+                        for c in range(1, n) if c not in path]
+        for path, cost in frontier:
+            bound = _path_bound(path, cost)
+            if bound < best_cost:
+                tasks.append((bound, path, cost))
+        tasks.sort(key=lambda t: t[0])
+
+        open_bounds, nodes = [], 0
+        if self.workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=(self.matrix, pi, upper_bound, deadline)) as executor:
+                results = list(executor.map(_search_prefix, tasks))
+        else:
+            results = [_search_prefix(task) for task in tasks]
+
+        for cost, tour, open_bound, explored in results:
+            nodes += explored
+            if tour is not None and cost < best_cost:
+                best_cost, best_tour = cost, tour
+            if open_bound is not None:
+                open_bounds.append(open_bound)
+
+        # Anything not fully explored is bounded by its open nodes; the
+        # root 1-tree bound holds regardless
+        lower_bound = min([best_cost] + open_bounds)
+        lower_bound = min(best_cost, max(lower_bound, root_bound))
+        proven = not open_bounds or lower_bound >= best_cost - 1e-9
+        gap = (best_cost - lower_bound) / best_cost * 100 if best_cost > 0 else 0.0
+        duration = time.time() - start_time
+
+        return {
+            "best_tour": [int(c) for c in best_tour] + [int(best_tour[0])],
+            "best_cost": float(best_cost),
+            "lower_bound": float(lower_bound),
+            "gap_percent": 0.0 if proven else float(gap),
+            "proven_optimal": bool(proven),
+            "nodes_explored": int(nodes),
+            "duration_sec": duration
+        }
+
+
+# ── Heuristic start and worker helpers ─────────────────────────────────────
+# Module-level so they can be pickled by ProcessPoolExecutor. Each worker
+# receives the matrix, penalties and shared incumbent once at start-up.
+
+_MATRIX = None
+_PI = None
+_UPPER_BOUND = None
+_DEADLINE = None
+
+
+def _init_worker(matrix, pi, upper_bound, deadline):
+    global _MATRIX, _PI, _UPPER_BOUND, _DEADLINE
+    _MATRIX, _PI, _UPPER_BOUND, _DEADLINE = matrix, pi, upper_bound, deadline
+
+
+def _tour_cost(matrix, tour):
+    return float(matrix[tour, np.roll(tour, -1)].sum())
+
+
+def _nearest_neighbour_tour(matrix):
+    n = len(matrix)
+    tour, visited = [0], np.zeros(n, dtype=bool)
+    visited[0] = True
+    for _ in range(n - 1):
+        row = np.where(visited, np.inf, matrix[tour[-1]])
+        tour.append(int(np.argmin(row)))
+        visited[tour[-1]] = True
+    return tour
+
+
+def _two_opt(matrix, tour):
+    """First-improvement 2-opt until no move shortens the tour."""
+    tour = list(tour)
+    n = len(tour)
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, n - 1):
+            for j in range(i + 1, n):
+                a, b = tour[i - 1], tour[i]
+                c, d = tour[j], tour[(j + 1) % n]
+                if matrix[a, c] + matrix[b, d] < matrix[a, b] + matrix[c, d] - 1e-10:
+                    tour[i:j + 1] = tour[i:j + 1][::-1]
+                    improved = True
+    return tour
+
+
+def _path_bound(path, cost):
+    """Lower bound on any tour that starts with the given path."""
+    n = len(_MATRIX)
+    last = path[-1]
+    if len(path) == n:
+        return cost + _MATRIX[last, 0]
+
+    unvisited = np.setdiff1d(np.arange(n), path, assume_unique=True)
+    pi_u = _PI[unvisited]
+    modified = _MATRIX[np.ix_(unvisited, unvisited)] + pi_u[:, None] + pi_u[None, :]
+    mst_weight, _ = _prim_mst(modified)
+    link_in = np.min(_MATRIX[last, unvisited] + pi_u) + _PI[last]
+    link_out = np.min(_MATRIX[unvisited, 0] + pi_u) + _PI[0]
+    penalty = _PI[last] + _PI[0] + 2 * pi_u.sum()
+    return cost + mst_weight + link_in + link_out - penalty
+
+
+def _search_prefix(task):
+    """Depth-first search below one prefix.
+
+    Returns:
+        best_cost (float), best_tour (list or None),
+        open_bound (float or None — smallest bound left unexplored at the
+        deadline, None if the subtree was finished), nodes_explored (int)
+    """
+    _, path, cost = task
+    n = len(_MATRIX)
+    best_cost, best_tour = float("inf"), None
+    stack = [(_path_bound(path, cost), path, cost)]
+    explored = 0
+
+    while stack:
+        if time.time() > _DEADLINE:
+            return best_cost, best_tour, min(b for b, _, _ in stack), explored
+
+        bound, path, cost = stack.pop()
+        explored += 1
+        if bound >= _UPPER_BOUND.value:
+            continue
+
+        if len(path) == n:
+            total = cost + _MATRIX[path[-1], 0]
+            with _UPPER_BOUND.get_lock():
+                if total < _UPPER_BOUND.value:
+                    _UPPER_BOUND.value = total
+            if total < best_cost:
+                best_cost, best_tour = total, path
+            continue
+
+        children = []
+        for c in np.argsort(_MATRIX[path[-1]]):
+            c = int(c)
+            if c == 0 or c in path:
+                continue
+            child_path = path + [c]
+            child_cost = cost + _MATRIX[path[-1], c]
+            child_bound = _path_bound(child_path, child_cost)
+            if child_bound < _UPPER_BOUND.value:
+                children.append((child_bound, child_path, child_cost))
+
+        # Push the most promising child last so it is explored first
+        children.sort(key=lambda t: -t[0])
+        stack.extend(children)
+
+    return best_cost, best_tour, None, explored
+
+
+if __name__ == "__main__":
+    print("Starting Branch-and-Bound Solver → data/ground_truth/")
+    print("-" * 60)
+
+    from src.common.utils import get_raw_dir, get_ground_truth_dir
+
+    raw_dir = get_raw_dir()
+    gt_dir = get_ground_truth_dir()
+    gt_dir.mkdir(parents=True, exist_ok=True)
+
+    scenarios = [25, 30, 35, 40]
+
+    for n in scenarios:
+        input_path = raw_dir / f"tsp_n{n}.json"
+        output_path = gt_dir / f"tsp_n{n}_solution.json"
+
+        if not input_path.exists():
+            print(f" [N={n}] WARNING: {input_path.name} not found.")
+            continue
+
+        print(f" [N={n}] Processing: {input_path.name}")
+        try:
+            with open(input_path, "r") as f:
+                tsp_data = json.load(f)
+
+            matrix = np.array(tsp_data["distance_matrix"])
+            solver = BranchAndBoundSolver(matrix, time_limit=600.0)
+            result = solver.solve()
+
+            solution_data = {
+                "algorithm": "Branch and Bound",
+                "num_cities": n,
+                "optimal_path": result["best_tour"],
+                "optimal_cost": result["best_cost"],
+                "lower_bound": result["lower_bound"],
+                "proven_gap_percent": round(result["gap_percent"], 6),
+                "proven_optimal": result["proven_optimal"]
+            }
+
+            with open(output_path, "w") as f:
+                json.dump(solution_data, f, indent=4)
+
+            print(f"    -> Best Path: {result['best_tour']}")
+            print(f"    -> Cost: {result['best_cost']:.4f} | Lower Bound: {result['lower_bound']:.4f} "
+                  f"| Gap: {result['gap_percent']:.4f}% | Proven: {result['proven_optimal']}")
+            print(f"    -> SAVED: data/ground_truth/{output_path.name}\n")
+
+        except Exception as e:
+            print(f"    -> ERROR: {e}")
+            import traceback; traceback.print_exc()
+
+    print("-" * 60)
+    print("All tasks completed.")
@@ -0,0 +1,89 @@
+import math
+import numpy as np
+from abc import ABC, abstractmethod
+
+
+class DistanceOracle(ABC):
+    """Distance lookups used by GA, SA and tour-cost code instead of a raw matrix.
+
+    Backends:
+        DenseDistanceOracle     : NxN matrix in memory (or memory-mapped)
+        EuclideanDistanceOracle : distances computed from coordinates on
+                                  demand — O(N) memory, for instances where
+                                  an NxN matrix does not fit
+    """
+
+    num_cities = 0
+
+    @abstractmethod
+    def edges(self, a, b):
+        """Vectorized distances d(a[k], b[k]) for index arrays of any (broadcastable) shapes."""
+
+    @abstractmethod
+    def pair(self, a, b):
+        """Distance between two cities as a Python float."""
+
+    def tour_cost(self, route):
+        """Closed-loop length of a route given as a sequence of cities."""
+        route = np.asarray(route)
+        return float(self.edges(route, np.roll(route, -1)).sum())
+
+    def dense_matrix(self, block_size=1024):
+        """The full NxN matrix, built from edges() in blocks of rows — for
+        solvers such as OR-Tools that need every distance up front."""
+        n = self.num_cities
+        matrix = np.empty((n, n))
+        columns = np.arange(n)[None, :]
+        for start in range(0, n, block_size):
+            rows = np.arange(start, min(start + block_size, n))[:, None]
+            matrix[start:start + len(rows)] = self.edges(rows, columns)
+        return matrix
+
+
+class DenseDistanceOracle(DistanceOracle):
+    """Oracle over a precomputed NxN distance matrix."""
+
+    def __init__(self, distance_matrix):
+        self.matrix = distance_matrix
+        self.num_cities = len(distance_matrix)
+
+    def edges(self, a, b):
+        return self.matrix[a, b]
+
+    def pair(self, a, b):
+        return self.matrix.item(a, b)
+
+    def dense_matrix(self, block_size=1024):
+        return np.asarray(self.matrix)
+
+
+class EuclideanDistanceOracle(DistanceOracle):
+    """Oracle computing Euclidean distances from coordinates on demand.
+
+    Batches of edges are evaluated in one vectorized pass and single pairs
+    with plain-float math, so memory stays O(N).
+    """
+
+    def __init__(self, coordinates):
+        self.coordinates = np.asarray(coordinates, dtype=float)
+        self.num_cities = len(self.coordinates)
+
+        # Plain lists make scalar lookups in pair() much cheaper than ndarray indexing
+        self._xs = self.coordinates[:, 0].tolist()
+        self._ys = self.coordinates[:, 1].tolist()
+
+    def edges(self, a, b):
+        diff = self.coordinates[a] - self.coordinates[b]
+        return np.sqrt((diff * diff).sum(axis=-1))
+
+    def pair(self, a, b):
+        return math.hypot(self._xs[a] - self._xs[b], self._ys[a] - self._ys[b])
+
+
+def make_distance_oracle(distance_matrix=None, coordinates=None):
+    """Dense oracle when a matrix is available, otherwise Euclidean from coordinates."""
+    if distance_matrix is not None:
+        return DenseDistanceOracle(distance_matrix)
+    if coordinates is not None:
+        return EuclideanDistanceOracle(coordinates)
+    raise ValueError("A distance oracle needs a distance matrix or coordinates.")
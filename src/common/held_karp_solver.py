@@ -0,0 +1,141 @@
+import sys
+import json
+import numpy as np
+from pathlib import Path
+
+# Configure project root for relative imports
+current_file = Path(__file__).resolve()
+project_root = current_file.parents[2]
+if str(project_root) not in sys.path:
+    sys.path.append(str(project_root))
+
+
+class HeldKarpSolver:
+    """Solves TSP exactly with Held-Karp bitmask dynamic programming — Ground Truth generator.
+
+    Complexity: O(2^N · N²) time, O(2^N · N) memory — practical up to N ≈ 22.
+    City 0 is the fixed start; cost[S, k] is the shortest path from city 0
+    through the cities in subset S ending at city k+1. Subsets are processed
+    in order of size, and for each end city the whole layer is relaxed with
+    one vectorized min over predecessor cities.
+
+    Tables are float32 (costs) and int8 (predecessors), i.e. 5 bytes per
+    (subset, city) entry — about 220 MB at N = 22. The returned cost is
+    re-summed in float64 from the original matrix.
+    """
+
+    MAX_CITIES = 22
+
+    def __init__(self, distance_matrix, dtype=np.float32):
+        self.matrix = np.asarray(distance_matrix, dtype=float)
+        self.num_cities = min(self.matrix.shape)
+        self.dtype = dtype
+
+        if self.num_cities > self.MAX_CITIES:
+            raise ValueError(
+                f"Held-Karp is limited to N <= {self.MAX_CITIES} "
+                f"(got N={self.num_cities}); tables would not fit in memory."
+            )
+
+    def solve(self):
+        """Returns (best_path, min_cost) for the optimal closed tour."""
+        n = self.num_cities
+        if n <= 2:
+            path = list(range(n)) + [0]
+            return path, self._path_cost(path)
+
+        m = n - 1  # cities 1..n-1 are encoded as bits 0..m-1
+        dist = self.matrix[1:, 1:].astype(self.dtype)
+        full = (1 << m) - 1
+
+        cost = np.full((1 << m, m), np.inf, dtype=self.dtype)
+        parent = np.full((1 << m, m), -1, dtype=np.int8)
+        singles = 1 << np.arange(m)
+        cost[singles, np.arange(m)] = self.matrix[0, 1:]
+
+        subsets = np.arange(1 << m)
+        popcount = np.zeros(1 << m, dtype=np.int8)
+        for bit in range(m):
+            popcount += ((subsets >> bit) & 1).astype(np.int8)
+
+        for size in range(2, m + 1):
+            layer = subsets[popcount == size]
+            for k in range(m):
+                with_k = layer[(layer >> k) & 1 == 1]
+                prev = with_k ^ (1 << k)
+                # candidates[s, j] = cost of reaching j in prev[s], then j -> k
+                candidates = cost[prev] + dist[:, k]
+                best_j = np.argmin(candidates, axis=1)
+                cost[with_k, k] = candidates[np.arange(len(with_k)), best_j]
+                parent[with_k, k] = best_j
+
+        closing = cost[full] + self.matrix[1:, 0].astype(self.dtype)
+        last = int(np.argmin(closing))
+
+        # Walk predecessors back from the full subset
+        reversed_path = []
+        subset, k = full, last
+        while k != -1:
+            reversed_path.append(k + 1)
+            prev_k = int(parent[subset, k])
+            subset ^= 1 << k
+            k = prev_k
+
+        best_path = [0] + reversed_path[::-1] + [0]
+        return best_path, self._path_cost(best_path)
+
+    def _path_cost(self, path):
+        return float(sum(self.matrix[path[i]][path[i + 1]] for i in range(len(path) - 1)))
+
+
+if __name__ == "__main__":
+    print("Starting Held-Karp Solver → data/ground_truth/")
+    print("-" * 60)
+
+    from src.common.utils import get_raw_dir, get_ground_truth_dir
+
+    raw_dir = get_raw_dir()
+    gt_dir = get_ground_truth_dir()
+    gt_dir.mkdir(parents=True, exist_ok=True)
+
+    scenarios = [5, 6, 7, 10, 15, 20]
+
+    for n in scenarios:
+        input_path = raw_dir / f"tsp_n{n}.json"
+        output_path = gt_dir / f"tsp_n{n}_solution.json"
+
+        if not input_path.exists():
+            print(f" [N={n}] WARNING: {input_path.name} not found.")
+            continue
+
+        print(f" [N={n}] Processing: {input_path.name}")
+        try:
+            with open(input_path, "r") as f:
+                tsp_data = json.load(f)
+
+            matrix = np.array(tsp_data["distance_matrix"])
+            print(f"    -> Matrix shape: {matrix.shape}")
+
+            solver = HeldKarpSolver(matrix)
+            path, cost = solver.solve()
+
+            solution_data = {
+                "algorithm": "Held-Karp",
+                "num_cities": n,
+                "optimal_path": [int(c) for c in path],
+                "optimal_cost": float(cost)
+            }
+
+            with open(output_path, "w") as f:
+                json.dump(solution_data, f, indent=4)
+
+            print(f"    -> Optimal Path: {path}")
+            print(f"    -> Cost: {cost:.4f}")
+            print(f"    -> SAVED: data/ground_truth/{output_path.name}\n")
+
+        except Exception as e:
+            print(f"    -> ERROR: {e}")
+            import traceback; traceback.print_exc()
+
+    print("-" * 60)
+    print("All tasks completed.")
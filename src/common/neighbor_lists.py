@@ -0,0 +1,33 @@
+import numpy as np
+from scipy.spatial import cKDTree
+
+
+def build_neighbor_lists(coordinates, k=10):
+    """k-nearest-neighbour candidate lists for every city.
+
+    Built once per instance with a KD-tree over the city coordinates and
+    shared by GA and SA to restrict local-search moves to short candidate
+    edges instead of uniformly random endpoints.
+
+    Args:
+        coordinates: Nx2 coordinate array (as returned by load_tsp_data)
+        k: Number of neighbours per city (capped at N-1)
+
+    Returns:
+        np.ndarray: (N, k) int array; row i lists the k nearest other
+        cities of city i, closest first.
+    """
+    coordinates = np.asarray(coordinates, dtype=float)
+    num_cities = len(coordinates)
+    k = min(k, num_cities - 1)
+    if k < 1:
+        raise ValueError("Neighbor lists need at least 2 cities.")
+
+    _, idx = cKDTree(coordinates).query(coordinates, k=k + 1)
+
+    # Drop each city from its own list; with duplicate coordinates it is
+    # not guaranteed to come back first, so filter by index (stable sort
+    # keeps the distance order of the rest)
+    not_self = idx != np.arange(num_cities)[:, None]
+    order = np.argsort(~not_self, axis=1, kind="stable")
+    return np.take_along_axis(idx, order, axis=1)[:, :k]
@@ -0,0 +1,97 @@
+import sys
+import tempfile
+import numpy as np
+from pathlib import Path
+
+current_file = Path(__file__).resolve()
+project_root = current_file.parents[2]
+if str(project_root) not in sys.path:
+    sys.path.append(str(project_root))
+
+from src.common.distance_oracle import DenseDistanceOracle, EuclideanDistanceOracle
+from src.common.tsplib import TSPLIBDistanceOracle
+from src.common.utils import TSPInstance
+
+
+def _oracle_spec(oracle):
+    """Picklable description of a distance oracle, rebuilt by attach_instance."""
+    # TSPLIBDistanceOracle subclasses EuclideanDistanceOracle, so test it first
+    if isinstance(oracle, TSPLIBDistanceOracle):
+        return {"type": "tsplib", "edge_weight_type": oracle.edge_weight_type}
+    if isinstance(oracle, EuclideanDistanceOracle):
+        return {"type": "euclidean"}
+    if isinstance(oracle, DenseDistanceOracle):
+        return {"type": "dense"}
+    raise ValueError(f"Cannot publish an instance with a {type(oracle).__name__}")
+
+
+class SharedInstanceStore:
+    """Publishes loaded TSP instances to worker processes without pickling.
+
+    Each array is written once to a temporary .npy file. Workers open it
+    with np.load(mmap_mode="r"), so every process maps the same pages of
+    the OS page cache instead of holding its own copy (an N = 5000 float64
+    matrix is 200 MB). Only the small handle dict travels to the workers;
+    it also names the distance oracle, so a coordinate-only TSPLIB
+    instance keeps its integer-rounded distances on the worker side.
+
+    Usage:
+        with SharedInstanceStore() as store:
+            handle = store.publish(instance)
+            ... ProcessPoolExecutor(initializer=..., initargs=(handle,)) ...
+        # worker side: instance = attach_instance(handle)
+    """
+
+    def __init__(self):
+        self._tmpdir = tempfile.TemporaryDirectory(prefix="tsp_shared_")
+        self.directory = Path(self._tmpdir.name)
+
+    def publish(self, instance):
+        """Writes the instance arrays and returns a picklable handle."""
+        matrix_path = self.directory / f"{instance.name}_distance_matrix.npy"
+        coords_path = self.directory / f"{instance.name}_coordinates.npy"
+        if instance.distance_matrix is not None:
+            np.save(matrix_path, np.asarray(instance.distance_matrix))
+        np.save(coords_path, np.asarray(instance.coordinates))
+
+        return {
+            "name": instance.name,
+            "num_cities": instance.num_cities,
+            "optimal_cost": instance.optimal_cost,
+            "distance_matrix": str(matrix_path) if instance.distance_matrix is not None else None,
+            "coordinates": str(coords_path),
+            "oracle": _oracle_spec(instance.distance_oracle)
+        }
+
+    def close(self):
+        self._tmpdir.cleanup()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def attach_instance(handle):
+    """Opens a published instance as read-only memory maps."""
+    matrix_path = handle["distance_matrix"]
+    distance_matrix = np.load(matrix_path, mmap_mode="r") if matrix_path is not None else None
+    coordinates = np.load(handle["coordinates"], mmap_mode="r")
+
+    spec = handle["oracle"]
+    if spec["type"] == "tsplib":
+        oracle = TSPLIBDistanceOracle(coordinates, spec["edge_weight_type"])
+    elif spec["type"] == "euclidean":
+        oracle = EuclideanDistanceOracle(coordinates)
+    else:
+        oracle = DenseDistanceOracle(distance_matrix)
+
+    return TSPInstance(
+        handle["num_cities"],
+        distance_matrix,
+        coordinates,
+        optimal_cost=handle["optimal_cost"],
+        name=handle["name"],
+        distance_oracle=oracle
+    )
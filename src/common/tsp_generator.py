@@ -3,38 +3,108 @@ from pathlib import Path
 import json
 
 
+def pairwise_distances(coordinates, out=None, block_size=1024, dtype=np.float64):
+    """Euclidean distance matrix computed in row blocks.
+
+    Each block of rows is a broadcast over all coordinates with in-place
+    arithmetic, so peak temporary memory is about 2 x block_size x N
+    values. `out` may be any NxN array, including a np.memmap /
+    open_memmap file for instances whose matrix does not fit in RAM.
+    """
+    coords = np.asarray(coordinates, dtype=np.float64)
+    xs, ys = coords[:, 0], coords[:, 1]
+    n = len(coords)
+    if out is None:
+        out = np.empty((n, n), dtype=dtype)
+
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        dx = xs[start:stop, None] - xs[None, :]
+        dy = ys[start:stop, None] - ys[None, :]
+        dx *= dx
+        dy *= dy
+        dx += dy
+        out[start:stop] = np.sqrt(dx, out=dx)
+    return out
+
+
 class TSPGenerator:
-    """Class to generate and save TSP instances with random coordinates."""
+    """Class to generate and save TSP instances with random coordinates.
+
+    Distributions (all inside the 0-100 square):
+        uniform   : integer coordinates, uniformly random (original setup)
+        clustered : Gaussian clusters around random centres
+        realistic : towns of power-law sizes and spreads plus sparse rural
+                    background points — closer to real delivery networks
+    """
+
+    DISTRIBUTIONS = ("uniform", "clustered", "realistic")
+
+    def __init__(self, num_cities, seed=2026, distribution="uniform"):
+        if distribution not in self.DISTRIBUTIONS:
+            raise ValueError(f"Unknown distribution: {distribution!r}")
 
-    def __init__(self, num_cities, seed=2026):
         self.num_cities = num_cities
         self.seed = seed
-        np.random.seed(self.seed)
+        self.distribution = distribution
+        # Local generators — never touch the global NumPy random state
+        self.rng = np.random.default_rng(self.seed)
         self.coordinates = []
         self.distance_matrix = []
 
     def generate_data(self):
-        """Generates random coordinates between 0-100 and computes the distance matrix."""
-
-        self.coordinates = np.random.randint(0, 101, size=(self.num_cities, 2))
+        """Generates random coordinates in the 0-100 square for the chosen distribution."""
+
+        if self.distribution == "uniform":
+            # Legacy RandomState stream, so a seed gives the same instances as the
+            # original np.random.seed() code (data/raw, ground truth and results)
+            self.coordinates = np.random.RandomState(self.seed).randint(0, 101, size=(self.num_cities, 2))
+        elif self.distribution == "clustered":
+            self.coordinates = self._clustered()
+        else:
+            self.coordinates = self._realistic()
         return self.coordinates
 
-    def calculate_distance_matrix(self):
-        """Calculates the Euclidean distance matrix from the coordinates."""
+    def _clustered(self):
+        num_clusters = max(1, int(np.sqrt(self.num_cities) / 2))
+        centres = self.rng.uniform(10, 90, size=(num_clusters, 2))
+        labels = self.rng.integers(0, num_clusters, self.num_cities)
+        points = centres[labels] + self.rng.normal(0, 4.0, size=(self.num_cities, 2))
+        return np.clip(points, 0, 100).round(2)
+
+    def _realistic(self):
+        # 85% of stops in towns, the rest spread over the countryside
+        num_towns = max(1, int(np.sqrt(self.num_cities)))
+        num_urban = int(self.num_cities * 0.85)
+
+        weights = self.rng.pareto(1.2, num_towns) + 1
+        labels = self.rng.choice(num_towns, num_urban, p=weights / weights.sum())
+        centres = self.rng.uniform(5, 95, size=(num_towns, 2))
+        spreads = np.clip(np.sqrt(weights) * 0.8, 0.3, 8.0)
+
+        urban = centres[labels] + self.rng.normal(size=(num_urban, 2)) * spreads[labels, None]
+        rural = self.rng.uniform(0, 100, size=(self.num_cities - num_urban, 2))
+        points = np.vstack([urban, rural])
+        return np.clip(self.rng.permutation(points), 0, 100).round(2)
+
+    def calculate_distance_matrix(self, out_path=None, dtype=np.float64, block_size=1024):
+        """Calculates the Euclidean distance matrix from the coordinates.
+
+        With out_path, the matrix is written straight into a .npy memory map
+        at that path instead of being held in RAM.
+        """
 
         if len(self.coordinates) == 0:
             self.generate_data()
 
-        matrix = np.zeros((self.num_cities, self.num_cities))
+        out = None
+        if out_path is not None:
+            out = np.lib.format.open_memmap(out_path, mode="w+", dtype=dtype,
+                                            shape=(self.num_cities, self.num_cities))
 
-        for i in range(self.num_cities):
-            for j in range(self.num_cities):
-                if i != j:
-                    # euclidian distance = sqrt((x2-x1)^2 + (y2-y1)^2)
-                    dist = np.linalg.norm(self.coordinates[i] - self.coordinates[j])
-                    matrix[i][j] = dist
-                else:
-                    matrix[i][j] = 0.0
+        matrix = pairwise_distances(self.coordinates, out=out, block_size=block_size, dtype=dtype)
+        if out is not None:
+            matrix.flush()
 
         self.distance_matrix = matrix
         return matrix
@@ -62,6 +132,89 @@ class TSPGenerator:
 
         print(f"Instance saved to {json_file}")
 
+    def save_to_binary(self, store_matrix=True, matrix_dtype=np.float64, output_dir=None, stem=None):
+        """Saves TSP instance to data/raw/ in the binary, memory-mappable format.
+
+        Files (read back lazily by utils.load_tsp_data):
+            tsp_n{n}.meta.json             small header (size, file names, dtype)
+            tsp_n{n}_coordinates.npy       Nx2 coordinates
+            tsp_n{n}_distance_matrix.npy   NxN matrix (optional)
+
+        The matrix is float64 by default, so tour costs match the JSON
+        instance and ground truth exactly; matrix_dtype=np.float32 halves
+        the file at a relative error of about 1e-7 per edge.
+
+        With store_matrix=False only coordinates are written and the
+        matrix is built from them on load (and cached, see
+        utils.load_tsp_data) — the right choice for large N.
+        If no matrix was computed yet, it is written block by block straight
+        into the output file.
+        """
+
+        if output_dir is None:
+            current_file = Path(__file__).resolve()
+            project_root = current_file.parent.parent.parent
+            output_dir = project_root / "data" / "raw"
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        if stem is None:
+            stem = f"tsp_n{self.num_cities}"
+        coords_file = f"{stem}_coordinates.npy"
+        matrix_file = f"{stem}_distance_matrix.npy" if store_matrix else None
+
+        if len(self.coordinates) == 0:
+            self.generate_data()
+        np.save(output_dir / coords_file, np.asarray(self.coordinates))
+        if store_matrix:
+            if len(self.distance_matrix) == 0:
+                self.calculate_distance_matrix(out_path=output_dir / matrix_file, dtype=matrix_dtype)
+            else:
+                np.save(output_dir / matrix_file, np.asarray(self.distance_matrix, dtype=matrix_dtype))
+
+        meta = {
+            "format_version": 1,
+            "num_cities": self.num_cities,
+            "distribution": self.distribution,
+            "seed": self.seed,
+            "coordinates": coords_file,
+            "distance_matrix": matrix_file,
+            "matrix_dtype": np.dtype(matrix_dtype).name if store_matrix else None
+        }
+        meta_file = output_dir / f"{stem}.meta.json"
+        with open(meta_file, 'w') as f:
+            json.dump(meta, f, indent=4)
+
+        print(f"Binary instance saved to {meta_file}")
+
+
+def generate_suite(sizes, instances_per_size, distribution="uniform", seed=2026,
+                   store_matrix=False, output_dir=None):
+    """Mass-produces a benchmark suite in the binary format.
+
+    Every instance gets an independent seed spawned from `seed`, so the
+    suite is reproducible and instances are uncorrelated. Files go to
+    data/raw/suites/{distribution}/tsp_n{N}_i{k}.*
+
+    Returns:
+        list[Path]: header (.meta.json) paths of the generated instances
+    """
+    if output_dir is None:
+        output_dir = Path(__file__).resolve().parents[2] / "data" / "raw" / "suites" / distribution
+    output_dir = Path(output_dir)
+
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes) * instances_per_size)
+    headers = []
+    for s_idx, n in enumerate(sizes):
+        for k in range(instances_per_size):
+            child_seed = int(seeds[s_idx * instances_per_size + k].generate_state(1)[0])
+            gen = TSPGenerator(num_cities=n, seed=child_seed, distribution=distribution)
+            gen.generate_data()
+            stem = f"tsp_n{n}_i{k}"
+            gen.save_to_binary(store_matrix=store_matrix, output_dir=output_dir, stem=stem)
+            headers.append(output_dir / f"{stem}.meta.json")
+    return headers
+
 
 if __name__ == "__main__":
     """Example usage of TSPGenerator."""
@@ -76,4 +229,10 @@ if __name__ == "__main__":
         tsp_gen.calculate_distance_matrix()
         tsp_gen.save_to_json()
 
-    print(f"TSP instances with {scenarios} cities generated and saved.")
\ No newline at end of file
+    print(f"TSP instances with {scenarios} cities generated and saved.")
+
+    # Large instances only in the binary format — JSON stays for small N
+    for n in [1000, 5000]:
+        tsp_gen = TSPGenerator(num_cities=n, seed=2026)
+        tsp_gen.generate_data()
+        tsp_gen.save_to_binary()  # matrix is written block-wise into the .npy file
\ No newline at end of file
@@ -0,0 +1,420 @@
+import gzip
+import math
+import sys
+import numpy as np
+from pathlib import Path
+
+current_file = Path(__file__).resolve()
+project_root = current_file.parents[2]
+if str(project_root) not in sys.path:
+    sys.path.append(str(project_root))
+
+from src.common.distance_oracle import EuclideanDistanceOracle
+
+
+# Published optimal tour lengths (TSPLIB 95) for regression tracking
+TSPLIB_OPTIMA = {
+    "a280": 2579, "ali535": 202339, "att48": 10628, "att532": 27686,
+    "bayg29": 1610, "bays29": 2020, "berlin52": 7542, "bier127": 118282,
+    "brazil58": 25395, "brg180": 1950, "burma14": 3323, "ch130": 6110,
+    "ch150": 6528, "d198": 15780, "d493": 35002, "d657": 48912,
+    "d1291": 50801, "d1655": 62128, "d2103": 80450, "dantzig42": 699,
+    "eil51": 426, "eil76": 538, "eil101": 629, "fl417": 11861,
+    "fnl4461": 182566, "fri26": 937, "gil262": 2378, "gr17": 2085,
+    "gr21": 2707, "gr24": 1272, "gr48": 5046, "gr96": 55209,
+    "gr120": 6942, "gr137": 69853, "gr202": 40160, "gr229": 134602,
+    "gr431": 171414, "gr666": 294358, "hk48": 11461, "kroA100": 21282,
+    "kroB100": 22141, "kroC100": 20749, "kroD100": 21294, "kroE100": 22068,
+    "kroA150": 26524, "kroB150": 26130, "kroA200": 29368, "kroB200": 29437,
+    "lin105": 14379, "lin318": 42029, "nrw1379": 56638, "p654": 34643,
+    "pa561": 2763, "pcb442": 50778, "pcb1173": 56892, "pcb3038": 137694,
+    "pla7397": 23260728, "pla33810": 66048945, "pla85900": 142382641,
+    "pr76": 108159, "pr107": 44303, "pr124": 59030, "pr136": 96772,
+    "pr144": 58537, "pr152": 73682, "pr226": 80369, "pr264": 49135,
+    "pr299": 48191, "pr439": 107217, "pr1002": 259045, "pr2392": 378032,
+    "rat99": 1211, "rat195": 2323, "rat575": 6773, "rat783": 8806,
+    "rd100": 7910, "rd400": 15281, "rl1304": 252948, "st70": 675,
+    "swiss42": 1273, "ts225": 126643, "tsp225": 3916, "u159": 42080,
+    "u574": 36905, "u724": 41910, "u1060": 224094, "ulysses16": 6859,
+    "ulysses22": 7013, "usa13509": 19982859, "vm1084": 239297,
+}
+
+COORDINATE_TYPES = ("EUC_2D", "CEIL_2D", "ATT", "GEO")
+
+# Triangle stored by each EXPLICIT format, as (triangle, diagonal offset).
+# The *_COL formats list a symmetric matrix in the same order as the
+# opposite *_ROW format, so they share its layout.
+_EXPLICIT_LAYOUTS = {
+    "FULL_MATRIX": None,
+    "UPPER_ROW": ("upper", 1),
+    "LOWER_COL": ("upper", 1),
+    "UPPER_DIAG_ROW": ("upper", 0),
+    "LOWER_DIAG_COL": ("upper", 0),
+    "LOWER_ROW": ("lower", 1),
+    "UPPER_COL": ("lower", 1),
+    "LOWER_DIAG_ROW": ("lower", 0),
+    "UPPER_DIAG_COL": ("lower", 0),
+}
+
+# Constants of the TSPLIB reference implementation for GEO distances
+_GEO_PI = 3.141592
+_GEO_RADIUS = 6378.388
+
+
+class TSPLIBProblem:
+    """Contents of a TSPLIB .tsp or .tour file.
+
+    coordinates is an Nx2 array for coordinate instances (EUC_2D, CEIL_2D,
+    ATT, GEO) and None otherwise; distance_matrix is only filled for
+    EXPLICIT instances. display_coordinates holds DISPLAY_DATA_SECTION
+    points, and tour the first TOUR_SECTION as 0-based city indices.
+    """
+
+    def __init__(self, header):
+        self.header = header
+        self.name = header.get("NAME", "")
+        self.comment = header.get("COMMENT", "")
+        self.problem_type = header.get("TYPE", "TSP")
+        self.dimension = int(header.get("DIMENSION", 0))
+        self.edge_weight_type = header.get("EDGE_WEIGHT_TYPE", "")
+        self.edge_weight_format = header.get("EDGE_WEIGHT_FORMAT", "")
+        self.coordinates = None
+        self.display_coordinates = None
+        self.distance_matrix = None
+        self.tour = None
+
+    def distance_oracle(self):
+        """Oracle computing this instance's TSPLIB distances on demand."""
+        if self.coordinates is None:
+            raise ValueError(f"{self.name} has no node coordinates")
+        return TSPLIBDistanceOracle(self.coordinates, self.edge_weight_type)
+
+    def dense_distance_matrix(self, block_size=1024, dtype=np.float64):
+        """The explicit matrix, or the NxN matrix built from coordinates."""
+        if self.distance_matrix is not None:
+            return self.distance_matrix
+        if self.coordinates is None:
+            raise ValueError(f"{self.name} has neither coordinates nor an explicit matrix")
+        return tsplib_distance_matrix(self.coordinates, self.edge_weight_type,
+                                      block_size=block_size, dtype=dtype)
+
+
+# ── Distance functions ─────────────────────────────────────────────────────
+
+def _geo_radians(coordinates):
+    """DDD.MM (degrees.minutes) coordinates → radians, as TSPLIB defines them."""
+    degrees = np.trunc(coordinates)
+    minutes = coordinates - degrees
+    return _GEO_PI * (degrees + 5.0 * minutes / 3.0) / 180.0
+
+
+def _distance(a, b, edge_weight_type):
+    """Vectorized TSPLIB distance between point arrays of shape (..., 2).
+
+    GEO points must already be converted with _geo_radians.
+    """
+    if edge_weight_type == "GEO":
+        q1 = np.cos(a[..., 1] - b[..., 1])
+        q2 = np.cos(a[..., 0] - b[..., 0])
+        q3 = np.cos(a[..., 0] + b[..., 0])
+        cosine = np.clip(0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3), -1.0, 1.0)
+        return np.floor(_GEO_RADIUS * np.arccos(cosine) + 1.0)
+
+    dx = a[..., 0] - b[..., 0]
+    dy = a[..., 1] - b[..., 1]
+    squared = dx * dx + dy * dy
+    if edge_weight_type == "EUC_2D":
+        return np.floor(np.sqrt(squared) + 0.5)
+    if edge_weight_type == "CEIL_2D":
+        return np.ceil(np.sqrt(squared))
+    if edge_weight_type == "ATT":
+        r = np.sqrt(squared / 10.0)
+        t = np.floor(r + 0.5)
+        return np.where(t < r, t + 1.0, t)
+    raise ValueError(f"Unsupported EDGE_WEIGHT_TYPE: {edge_weight_type!r}")
+
+
+def _pair_distance(x1, y1, x2, y2, edge_weight_type):
+    """Scalar version of _distance on plain floats."""
+    if edge_weight_type == "GEO":
+        q1 = math.cos(y1 - y2)
+        q2 = math.cos(x1 - x2)
+        q3 = math.cos(x1 + x2)
+        cosine = min(1.0, max(-1.0, 0.5 * ((1.0 + q1) * q2 - (1.0 - q1) * q3)))
+        return float(int(_GEO_RADIUS * math.acos(cosine) + 1.0))
+
+    d = math.hypot(x1 - x2, y1 - y2)
+    if edge_weight_type == "EUC_2D":
+        return float(math.floor(d + 0.5))
+    if edge_weight_type == "CEIL_2D":
+        return float(math.ceil(d))
+    if edge_weight_type == "ATT":
+        r = d / math.sqrt(10.0)
+        t = math.floor(r + 0.5)
+        return float(t + 1 if t < r else t)
+    raise ValueError(f"Unsupported EDGE_WEIGHT_TYPE: {edge_weight_type!r}")
+
+
+def tsplib_distance_matrix(coordinates, edge_weight_type, block_size=1024, dtype=np.float64):
+    """NxN matrix of TSPLIB distances, computed in blocks of rows."""
+    points = np.asarray(coordinates, dtype=np.float64)
+    if edge_weight_type == "GEO":
+        points = _geo_radians(points)
+    n = len(points)
+
+    matrix = np.empty((n, n), dtype=dtype)
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        matrix[start:stop] = _distance(points[start:stop, None, :], points[None, :, :],
+                                       edge_weight_type)
+    np.fill_diagonal(matrix, 0)
+    return matrix
+
+
+class TSPLIBDistanceOracle(EuclideanDistanceOracle):
+    """Oracle for TSPLIB coordinate instances (EUC_2D, CEIL_2D, ATT, GEO).
+
+    Same O(N) memory as EuclideanDistanceOracle, but with the
+    rounded integer distances the published optima are measured in.
+    """
+
+    def __init__(self, coordinates, edge_weight_type="EUC_2D"):
+        if edge_weight_type not in COORDINATE_TYPES:
+            raise ValueError(f"Unsupported EDGE_WEIGHT_TYPE: {edge_weight_type!r}")
+        super().__init__(coordinates)
+        self.edge_weight_type = edge_weight_type
+
+        self._points = self.coordinates
+        if edge_weight_type == "GEO":
+            self._points = _geo_radians(self.coordinates)
+            self._xs = self._points[:, 0].tolist()
+            self._ys = self._points[:, 1].tolist()
+
+    def edges(self, a, b):
+        d = _distance(self._points[a], self._points[b], self.edge_weight_type)
+        # GEO gives 1 rather than 0 for a city to itself
+        return np.where(np.asarray(a) == np.asarray(b), 0.0, d)
+
+    def pair(self, a, b):
+        if a == b:
+            return 0.0
+        return _pair_distance(self._xs[a], self._ys[a], self._xs[b], self._ys[b],
+                              self.edge_weight_type)
+
+
+# ── Reading ────────────────────────────────────────────────────────────────
+
+def _open_text(path, mode="r"):
+    """Opens plain or gzip-compressed (.gz) TSPLIB files in text mode."""
+    path = Path(path)
+    if path.suffix == ".gz":
+        return gzip.open(path, mode + "t")
+    return open(path, mode)
+
+
+class _NumberStream:
+    """Pulls whitespace-separated numbers from an open file one line at a time.
+
+    TSPLIB sections may wrap values across lines arbitrarily, so numbers
+    left over from a line are kept for the next take().
+    """
+
+    def __init__(self, f):
+        self._f = f
+        self._pending = np.empty(0)
+
+    def take(self, count):
+        out = np.empty(count, dtype=np.float64)
+        filled = min(count, len(self._pending))
+        out[:filled] = self._pending[:filled]
+        self._pending = self._pending[filled:]
+
+        while filled < count:
+            line = self._f.readline()
+            if not line:
+                raise ValueError(f"Unexpected end of file: expected {count} values, got {filled}")
+            values = np.array(line.split(), dtype=np.float64)
+            k = min(count - filled, len(values))
+            out[filled:filled + k] = values[:k]
+            self._pending = values[k:]
+            filled += k
+        return out
+
+    def take_until(self, sentinel=-1):
+        """All numbers up to the sentinel (or end of file)."""
+        chunks = [self._pending]
+        self._pending = np.empty(0)
+        while True:
+            hits = np.flatnonzero(chunks[-1] == sentinel)
+            if len(hits):
+                chunks[-1] = chunks[-1][:hits[0]]
+                break
+            line = self._f.readline()
+            if not line or line.strip().upper() == "EOF":
+                break
+            chunks.append(np.array(line.split(), dtype=np.float64))
+        return np.concatenate(chunks)
+
+
+def _read_node_coordinates(stream, n):
+    """N lines of "id x y" → Nx2 array ordered by node id."""
+    rows = stream.take(3 * n).reshape(n, 3)
+    coordinates = np.empty((n, 2), dtype=np.float64)
+    coordinates[rows[:, 0].astype(np.int64) - 1] = rows[:, 1:]
+    return coordinates
+
+
+def _read_explicit_matrix(stream, n, edge_weight_format):
+    """Fills a symmetric NxN matrix row by row from an EDGE_WEIGHT_SECTION."""
+    if edge_weight_format not in _EXPLICIT_LAYOUTS:
+        raise ValueError(f"Unsupported EDGE_WEIGHT_FORMAT: {edge_weight_format!r}")
+
+    layout = _EXPLICIT_LAYOUTS[edge_weight_format]
+    if layout is None:
+        return stream.take(n * n).reshape(n, n)
+
+    triangle, offset = layout
+    matrix = np.zeros((n, n), dtype=np.float64)
+    for i in range(n):
+        if triangle == "upper":
+            matrix[i, i + offset:] = stream.take(n - i - offset)
+        else:
+            matrix[i, :i + 1 - offset] = stream.take(i + 1 - offset)
+
+    # Mirror the stored triangle; the diagonal is left as stored
+    mirrored = matrix.T.copy()
+    np.fill_diagonal(mirrored, 0)
+    return matrix + mirrored
+
+
+def read_tsplib(path):
+    """Parses a TSPLIB .tsp / .tour file (optionally .gz) into a TSPLIBProblem.
+
+    The header is read line by line; numeric sections are converted one
+    line at a time straight into preallocated arrays, so even pla85900
+    never holds the file as Python lists.
+    """
+    header = {}
+    problem = None
+
+    with _open_text(path) as f:
+        stream = _NumberStream(f)
+        while True:
+            line = f.readline()
+            if not line:
+                break
+            line = line.strip()
+            if not line:
+                continue
+
+            key, _, value = line.partition(":")
+            key = key.strip().upper()
+            if key == "EOF":
+                break
+
+            if not key.endswith("_SECTION"):
+                header[key] = value.strip()
+                continue
+
+            if problem is None:
+                problem = TSPLIBProblem(header)
+            n = problem.dimension
+
+            if key == "NODE_COORD_SECTION":
+                problem.coordinates = _read_node_coordinates(stream, n)
+            elif key == "DISPLAY_DATA_SECTION":
+                problem.display_coordinates = _read_node_coordinates(stream, n)
+            elif key == "EDGE_WEIGHT_SECTION":
+                problem.distance_matrix = _read_explicit_matrix(stream, n, problem.edge_weight_format)
+            elif key == "TOUR_SECTION":
+                tour = stream.take_until(-1).astype(np.int64) - 1
+                if problem.tour is None:
+                    problem.tour = tour
+            elif key == "FIXED_EDGES_SECTION":
+                stream.take_until(-1)
+            else:
+                raise ValueError(f"Unsupported TSPLIB section: {key}")
+
+    if problem is None:
+        problem = TSPLIBProblem(header)
+    if problem.coordinates is not None and problem.edge_weight_type not in COORDINATE_TYPES:
+        raise ValueError(f"Unsupported EDGE_WEIGHT_TYPE: {problem.edge_weight_type!r}")
+    return problem
+
+
+def read_tour(path):
+    """Reads a TSPLIB .tour file and returns the tour as 0-based city indices."""
+    problem = read_tsplib(path)
+    if problem.tour is None:
+        raise ValueError(f"No TOUR_SECTION in {path}")
+    return problem.tour
+
+
+# ── Writing ────────────────────────────────────────────────────────────────
+
+def _write_header(f, fields):
+    for key, value in fields:
+        if value not in (None, ""):
+            f.write(f"{key} : {value}\n")
+
+
+def write_tsp(path, name, coordinates=None, distance_matrix=None, edge_weight_type="EUC_2D",
+              comment="", block_size=4096):
+    """Writes an instance as a TSPLIB .tsp file.
+
+    With coordinates a NODE_COORD_SECTION is written; otherwise the matrix
+    is written as EXPLICIT UPPER_ROW. Rows are written in blocks, so a
+    memory-mapped matrix is never fully loaded.
+    """
+    if coordinates is None and distance_matrix is None:
+        raise ValueError("write_tsp needs coordinates or a distance matrix")
+
+    n = len(coordinates) if coordinates is not None else len(distance_matrix)
+    with _open_text(path, "w") as f:
+        fields = [("NAME", name), ("COMMENT", comment), ("TYPE", "TSP"), ("DIMENSION", n)]
+        if coordinates is not None:
+            _write_header(f, fields + [("EDGE_WEIGHT_TYPE", edge_weight_type)])
+            f.write("NODE_COORD_SECTION\n")
+            for start in range(0, n, block_size):
+                block = np.asarray(coordinates[start:start + block_size], dtype=np.float64)
+                ids = np.arange(start + 1, start + 1 + len(block))
+                np.savetxt(f, np.column_stack([ids, block]), fmt=["%d", "%.17g", "%.17g"])
+        else:
+            _write_header(f, fields + [("EDGE_WEIGHT_TYPE", "EXPLICIT"),
+                                       ("EDGE_WEIGHT_FORMAT", "UPPER_ROW")])
+            f.write("EDGE_WEIGHT_SECTION\n")
+            for i in range(n - 1):
+                row = np.asarray(distance_matrix[i, i + 1:], dtype=np.float64)
+                f.write(" ".join(f"{d:.17g}" for d in row) + "\n")
+        f.write("EOF\n")
+
+
+def write_tour(path, tour, name, comment=""):
+    """Writes a tour (0-based city indices, open or closed) as a TSPLIB .tour file."""
+    tour = np.asarray(tour, dtype=np.int64)
+    if len(tour) > 1 and tour[0] == tour[-1]:
+        tour = tour[:-1]
+
+    with _open_text(path, "w") as f:
+        _write_header(f, [("NAME", name), ("COMMENT", comment), ("TYPE", "TOUR"),
+                          ("DIMENSION", len(tour))])
+        f.write("TOUR_SECTION\n")
+        np.savetxt(f, tour + 1, fmt="%d")
+        f.write("-1\nEOF\n")
+
+
+if __name__ == "__main__":
+    from src.common.utils import get_tsplib_dir, load_tsplib_instance
+
+    # Sanity check: the optimal tours shipped with TSPLIB must reproduce the published optima
+    tsplib_dir = get_tsplib_dir()
+    for tsp_path in sorted(tsplib_dir.glob("*.tsp*")):
+        name = tsp_path.name.split(".")[0]
+        instance = load_tsplib_instance(name, dense=False)
+        line = f"{name:>12}  N={instance.num_cities:<6} optimum={instance.optimal_cost:.0f}"
+
+        tour_path = tsplib_dir / f"{name}.opt.tour"
+        if tour_path.exists():
+            tour_cost = instance.distance_oracle.tour_cost(read_tour(tour_path))
+            line += f"  opt.tour={tour_cost:.0f}"
+        print(line)
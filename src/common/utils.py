@@ -1,7 +1,12 @@
 import json
+import os
 import numpy as np
 from pathlib import Path
 
+from src.common.distance_oracle import make_distance_oracle
+from src.common.tsp_generator import pairwise_distances
+from src.common.tsplib import TSPLIB_OPTIMA, read_tour, read_tsplib
+
 
 def _project_root() -> Path:
     """Returns the absolute project root directory."""
@@ -20,6 +25,11 @@ def get_ground_truth_dir() -> Path:
     return _project_root() / "data" / "ground_truth"
 
 
+def get_tsplib_dir() -> Path:
+    """data/tsplib/ — TSPLIB instances ({name}.tsp[.gz], optional {name}.opt.tour)."""
+    return _project_root() / "data" / "tsplib"
+
+
 def get_results_dir(algorithm: str) -> Path:
     """data/results/classical/{algorithm}/ — Algorithm output directory.
 
@@ -36,14 +46,106 @@ def get_results_dir(algorithm: str) -> Path:
 
 # ── Data loading helpers ───────────────────────────────────────────────────
 
+class TSPInstance:
+    """An already-loaded TSP instance that solvers can share.
+
+    Passing one to GeneticAlgorithmTSP / SimulatedAnnealingTSP
+    (instance=...) skips re-reading data/raw/ and data/ground_truth/.
+    Arrays may be read-only memory maps (see shared_instance.py).
+
+    distance_matrix may be None for coordinate-only instances; solvers
+    then go through distance_oracle, which computes distances on demand.
+    A prebuilt oracle (e.g. TSPLIB rounding rules) can be passed instead.
+    """
+
+    def __init__(self, num_cities, distance_matrix, coordinates, optimal_cost=0.0, name=None,
+                 distance_oracle=None):
+        self.num_cities = num_cities
+        self.distance_matrix = distance_matrix
+        self.coordinates = coordinates
+        self.optimal_cost = optimal_cost
+        self.name = name if name is not None else f"tsp_n{num_cities}"
+        if distance_oracle is None:
+            distance_oracle = make_distance_oracle(distance_matrix, coordinates)
+        self.distance_oracle = distance_oracle
+
+
+def load_tsp_instance(num_cities: int, dense: bool = True) -> TSPInstance:
+    """Load distance matrix, coordinates and optimal cost once as a TSPInstance.
+
+    With dense=False a coordinate-only binary instance is not expanded to
+    an NxN matrix; the instance uses a Euclidean distance oracle instead.
+    """
+    meta_path = get_raw_dir() / f"tsp_n{num_cities}.meta.json"
+    if meta_path.exists():
+        distance_matrix, coordinates = _load_binary_instance(meta_path, dense=dense)
+        print(f"Loaded TSP data for {num_cities} cities from {meta_path}")
+    else:
+        distance_matrix, coordinates, _ = load_tsp_data(num_cities)
+    return TSPInstance(num_cities, distance_matrix, coordinates,
+                       optimal_cost=load_optimal_cost(num_cities))
+
+
+def load_tsplib_instance(name: str, dense: bool = True) -> TSPInstance:
+    """Load a TSPLIB instance from data/tsplib/ by name (e.g. "berlin52").
+
+    Distances follow the file's EDGE_WEIGHT_TYPE (EUC_2D, CEIL_2D, ATT,
+    GEO or EXPLICIT), so tour costs are comparable with published optima.
+    With dense=False a coordinate instance keeps distance_matrix=None and
+    computes distances on demand (needed for e.g. pla85900).
+
+    optimal_cost comes from TSPLIB_OPTIMA, else from {name}.opt.tour,
+    else 0.0.
+    """
+    tsplib_dir = get_tsplib_dir()
+    candidates = [tsplib_dir / f"{name}.tsp", tsplib_dir / f"{name}.tsp.gz"]
+    file_path = next((p for p in candidates if p.exists()), None)
+    if file_path is None:
+        raise FileNotFoundError(f"TSPLIB instance {name!r} not found in {tsplib_dir}")
+
+    problem = read_tsplib(file_path)
+    if problem.distance_matrix is not None:
+        distance_matrix = problem.distance_matrix
+        oracle = None
+    else:
+        distance_matrix = problem.dense_distance_matrix() if dense else None
+        oracle = None if dense else problem.distance_oracle()
+
+    instance = TSPInstance(problem.dimension, distance_matrix, problem.coordinates,
+                           name=name, distance_oracle=oracle)
+
+    tour_path = tsplib_dir / f"{name}.opt.tour"
+    if name in TSPLIB_OPTIMA:
+        instance.optimal_cost = float(TSPLIB_OPTIMA[name])
+    elif tour_path.exists():
+        instance.optimal_cost = instance.distance_oracle.tour_cost(read_tour(tour_path))
+    else:
+        print(f"  [WARN] No known optimum for TSPLIB instance {name}")
+
+    print(f"Loaded TSPLIB instance {name} ({problem.dimension} cities) from {file_path}")
+    return instance
+
+
 def load_tsp_data(num_cities: int):
     """Load TSP distance matrix and coordinates from data/raw/.
 
+    The binary format (tsp_n{N}.meta.json + .npy files, written by
+    TSPGenerator.save_to_binary) is preferred when present: its arrays are
+    memory-mapped, so pages are only read when touched (a coordinate-only
+    instance maps a matrix cached next to it on first load). Otherwise the
+    JSON instance tsp_n{N}.json is parsed.
+
     Returns:
         distance_matrix (np.ndarray): NxN distance matrix
         coordinates     (np.ndarray): Nx2 coordinate array
         best_cost       (float):      0.0 (legacy field, unused)
     """
+    meta_path = get_raw_dir() / f"tsp_n{num_cities}.meta.json"
+    if meta_path.exists():
+        distance_matrix, coordinates = _load_binary_instance(meta_path)
+        print(f"Loaded TSP data for {num_cities} cities from {meta_path}")
+        return distance_matrix, coordinates, 0.0
+
     file_path = get_raw_dir() / f"tsp_n{num_cities}.json"
 
     if not file_path.exists():
@@ -61,6 +163,47 @@ def load_tsp_data(num_cities: int):
     return distance_matrix, coordinates, 0.0
 
 
+def _load_binary_instance(meta_path: Path, dense: bool = True):
+    """Memory-maps the arrays listed in a binary instance header.
+
+    A coordinate-only instance returns distance_matrix=None unless dense.
+    With dense, its matrix is built once into {stem}_distance_matrix.cache.npy
+    next to the header (rebuilt if the coordinates file is newer) and
+    memory-mapped like a stored matrix.
+    """
+    with open(meta_path, "r") as f:
+        meta = json.load(f)
+
+    coords_path = meta_path.parent / meta["coordinates"]
+    coordinates = np.load(coords_path, mmap_mode="r")
+    if meta.get("distance_matrix"):
+        distance_matrix = np.load(meta_path.parent / meta["distance_matrix"], mmap_mode="r")
+    elif not dense:
+        distance_matrix = None
+    else:
+        distance_matrix = _cached_distance_matrix(meta_path, coords_path, coordinates)
+
+    return distance_matrix, coordinates
+
+
+def _cached_distance_matrix(meta_path: Path, coords_path: Path, coordinates):
+    stem = meta_path.name[:-len(".meta.json")]
+    cache_path = meta_path.parent / f"{stem}_distance_matrix.cache.npy"
+
+    if not cache_path.exists() or cache_path.stat().st_mtime < coords_path.stat().st_mtime:
+        # Written in row blocks straight into the file, then renamed into
+        # place, so neither RAM nor a crashed build leaves a partial matrix
+        tmp_path = meta_path.parent / f"{stem}_distance_matrix.cache.tmp.npy"
+        n = len(coordinates)
+        out = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.float64, shape=(n, n))
+        pairwise_distances(coordinates, out=out)
+        out.flush()
+        del out
+        os.replace(tmp_path, cache_path)
+
+    return np.load(cache_path, mmap_mode="r")
+
+
 def load_optimal_cost(num_cities: int) -> float:
     """Load the known optimal cost from data/ground_truth/.
 
@@ -0,0 +1,258 @@
+import os
+import sys
+import copy
+import time
+import tempfile
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+current_file = Path(__file__).resolve()
+project_root = current_file.parents[2]
+if str(project_root) not in sys.path:
+    sys.path.append(str(project_root))
+
+
+# ── Process-pool worker helpers ────────────────────────────────────────────
+# Module-level so they can be pickled by ProcessPoolExecutor. Each worker
+# receives the simulator once without its cost diagonal and maps the
+# diagonal read-only from a shared .npy file instead.
+
+_EVAL_SIMULATOR = None
+
+
+def _init_evaluator_worker(simulator, diagonal_path):
+    global _EVAL_SIMULATOR
+    simulator.cost_diagonal = np.load(diagonal_path, mmap_mode="r")
+    _EVAL_SIMULATOR = simulator
+
+
+def _evaluate_block(params_block):
+    return _EVAL_SIMULATOR.compute_expectation(params_block)
+
+
+class BatchedQAOAEvaluator:
+    """Evaluates the QAOA expectation of a whole population at once.
+
+    Parameter vectors (rows [β_1..β_p, γ_1..γ_p]) are evaluated as columns
+    of a 2-D state block of shape (dim, B), so each phase and mixer layer
+    is one vectorized pass over all individuals and the precomputed cost
+    diagonal is shared. B is chosen so a block holds about block_entries
+    amplitudes: small states batch many individuals, which removes the
+    per-layer Python overhead, while states of block_entries or more fall
+    back to one individual at a time on the simulator's fused
+    single-state kernels.
+
+    With workers > 1 the blocks are spread over a process pool; the cost
+    diagonal is written once to a temporary .npy file that every worker
+    memory-maps instead of receiving a pickled copy.
+
+    If the simulator has an evaluation cache, the population is looked up
+    first and only the misses are simulated (elites carried over between
+    generations cost nothing); the new values are stored back.
+
+    Usage:
+        with BatchedQAOAEvaluator(simulator, workers=4) as evaluator:
+            values = evaluator.evaluate(population)  # (P, 2p) → (P,)
+    """
+
+    def __init__(self, simulator, block_entries=1 << 16, workers=1):
+        self.simulator = simulator
+        self.block_size = max(1, block_entries // simulator.dim)
+        self.workers = workers
+        self.num_evaluations = 0
+        self._pool = None
+        self._tmpdir = None
+
+        if workers > 1:
+            self._tmpdir = tempfile.TemporaryDirectory(prefix="qaoa_diag_")
+            diagonal_path = os.path.join(self._tmpdir.name, "cost_diagonal.npy")
+            np.save(diagonal_path, simulator.cost_diagonal)
+
+            worker_simulator = copy.copy(simulator)
+            worker_simulator.cost_diagonal = None
+            worker_simulator.cache = None
+            self._pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_evaluator_worker,
+                                             initargs=(worker_simulator, diagonal_path))
+
+    def evaluate(self, population):
+        """Expectation value of every row of population, shape (P, 2p) → (P,)."""
+        population = np.atleast_2d(np.asarray(population, dtype=np.float64))
+        cache = self.simulator.cache
+        if cache is None:
+            return self._simulate(population)
+
+        values, missing = cache.get_many(self.simulator.fingerprint, population)
+        if missing.any():
+            values[missing] = self._simulate(population[missing])
+            cache.put_many(self.simulator.fingerprint, population[missing], values[missing])
+        return values
+
+    def _simulate(self, population):
+        size = self.block_size
+        if self._pool is not None:
+            size = min(size, -(-len(population) // self.workers))
+        if size == 1:
+            blocks = list(population)
+        else:
+            blocks = [population[start:start + size].T for start in range(0, len(population), size)]
+
+        if self._pool is not None:
+            values = list(self._pool.map(_evaluate_block, blocks))
+        else:
+            values = [self.simulator.compute_expectation(block) for block in blocks]
+
+        self.num_evaluations += len(population)
+        return np.concatenate([np.atleast_1d(v) for v in values])
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        if self._tmpdir is not None:
+            self._tmpdir.cleanup()
+            self._tmpdir = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class HybridGAQAOA:
+    """Genetic algorithm over QAOA angles.
+
+    Each individual is a real vector [β_1..β_p, γ_1..γ_p] and its fitness
+    is the QAOA expectation (lower is better) from any QAOASimulator
+    (StatevectorQAOA, PermutationQAOA). Every generation is scored in one
+    call to a BatchedQAOAEvaluator.
+
+    Search box: β ∈ [-π/2, π/2] (the mixers are π-periodic up to a global
+    phase) and γ ∈ [0, π/σ_C] with σ_C the spread of the cost diagonal;
+    (β, γ) and (-β, -γ) give the same expectation, so γ ≥ 0 loses nothing.
+
+    initial_population (k, 2p) seeds the first individuals, e.g. with
+    QAOAParameterStore.seeds_for() from earlier runs.
+    """
+
+    def __init__(self, simulator, pop_size=30, generations=40, mutation_rate=0.2,
+                 mutation_scale=0.1, elite_size=2, seed=None, workers=1,
+                 initial_population=None):
+        self.simulator = simulator
+        self.reps = simulator.reps
+        self.pop_size = pop_size
+        self.generations = generations
+        self.mutation_rate = mutation_rate
+        self.mutation_scale = mutation_scale
+        self.elite_size = elite_size
+        self.workers = workers
+        self.initial_population = initial_population
+        self.num_evaluations = 0
+        self.rng = np.random.default_rng(seed)
+
+        gamma_scale = 1.0 / simulator.energy_scale()
+        self.lower = np.concatenate([np.full(self.reps, -np.pi / 2), np.zeros(self.reps)])
+        self.upper = np.concatenate([np.full(self.reps, np.pi / 2), np.full(self.reps, np.pi * gamma_scale)])
+
+    def create_population(self):
+        """Uniform random angles; seeded rows (initial_population, then the
+        simulator's linear-ramp default) replace the first individuals."""
+        population = self.rng.uniform(self.lower, self.upper, size=(self.pop_size, 2 * self.reps))
+        seeds = [self.simulator.default_params()[None]]
+        if self.initial_population is not None:
+            seeds.insert(0, np.atleast_2d(self.initial_population))
+        seeds = np.vstack(seeds)[:self.pop_size]
+        population[:len(seeds)] = np.clip(seeds, self.lower, self.upper)
+        return population
+
+    def selection(self, population, fitness, num_parents):
+        """Tournament selection (tournament size = 3) for num_parents winners at once."""
+        candidates = self.rng.integers(0, len(population), size=(num_parents, 3))
+        winners = candidates[np.arange(num_parents), np.argmin(fitness[candidates], axis=1)]
+        return population[winners]
+
+    def crossover(self, parents1, parents2, alpha=0.3):
+        """Blend crossover (BLX-α): each gene drawn around the parents' segment."""
+        weights = self.rng.uniform(-alpha, 1 + alpha, size=parents1.shape)
+        return np.clip(weights * parents1 + (1 - weights) * parents2, self.lower, self.upper)
+
+    def mutate(self, children):
+        """Gaussian mutation of each gene with probability mutation_rate."""
+        mask = self.rng.random(children.shape) < self.mutation_rate
+        noise = self.rng.normal(0.0, self.mutation_scale, size=children.shape) * (self.upper - self.lower)
+        return np.clip(children + mask * noise, self.lower, self.upper)
+
+    def evolve(self, population, evaluator):
+        """Runs all generations; returns (best_params, best_value, history)."""
+        fitness = evaluator.evaluate(population)
+        history = [float(fitness.min())]
+
+        for _ in range(self.generations):
+            order = np.argsort(fitness)
+            elites, elite_fitness = population[order[:self.elite_size]], fitness[order[:self.elite_size]]
+
+            num_children = self.pop_size - self.elite_size
+            parents1 = self.selection(population, fitness, num_children)
+            parents2 = self.selection(population, fitness, num_children)
+            children = self.mutate(self.crossover(parents1, parents2))
+
+            population = np.vstack([elites, children])
+            fitness = np.concatenate([elite_fitness, evaluator.evaluate(children)])
+            history.append(float(fitness.min()))
+
+        best = int(np.argmin(fitness))
+        return population[best], float(fitness[best]), history
+
+    def run(self):
+        """
+        Runs the GA-QAOA hybrid.
+
+        Returns:
+            best_params (np.ndarray): [β_1..β_p, γ_1..γ_p] of the best individual
+            best_value (float): Its QAOA expectation value
+            duration (float): Execution time in seconds
+            convergence_history (list[float]): Best expectation at each generation
+        """
+        print(f"Starting GA-QAOA (p={self.reps}, dim={self.simulator.dim}, "
+              f"pop={self.pop_size}, gen={self.generations}, workers={self.workers})")
+
+        start_time = time.time()
+        with BatchedQAOAEvaluator(self.simulator, workers=self.workers) as evaluator:
+            best_params, best_value, convergence_history = self.evolve(self.create_population(), evaluator)
+            self.num_evaluations = evaluator.num_evaluations
+        duration = time.time() - start_time
+
+        print(f"   -> Completed in {duration:.4f}s | Generations: {self.generations} | "
+              f"Evaluations: {self.num_evaluations}")
+        print(f"   -> GA-QAOA Best Expectation: {best_value:.4f}")
+        if self.simulator.cache is not None:
+            stats = self.simulator.cache.stats()
+            print(f"   -> Cache: {stats['hits']} hits / {stats['misses']} misses ({stats['hit_rate']:.1%})")
+        print("-" * 40)
+        return best_params, best_value, duration, convergence_history
+
+
+if __name__ == "__main__":
+    from src.common.utils import load_optimal_cost, load_tsp_data
+    from src.quantum.qaoa_params import QAOAParameterStore
+    from src.quantum.qaoa_standard import PermutationQAOA
+
+    # Each size is seeded with the angles found for the smaller ones
+    store = QAOAParameterStore()
+
+    for n in [5, 6, 7]:
+        distance_matrix, _, _ = load_tsp_data(n)
+        simulator = PermutationQAOA(distance_matrix, reps=3)
+
+        ga = HybridGAQAOA(simulator, pop_size=30, generations=40, seed=2026,
+                          initial_population=store.seeds_for(simulator, "random", n))
+        best_params, best_value, duration, history = ga.run()
+        store.record_for(simulator, "random", n, best_params, best_value)
+
+        # Most likely tour of the best angles
+        probs = simulator.probabilities(best_params)
+        route = simulator.routes[int(np.argmax(probs))]
+        print(f"N={n} | Most likely route: {route.tolist()} | "
+              f"Cost: {simulator.cost_diagonal[int(np.argmax(probs))]:.2f} | "
+              f"Optimal: {load_optimal_cost(n):.2f}")
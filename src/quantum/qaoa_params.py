@@ -0,0 +1,199 @@
+import json
+import os
+import sys
+import numpy as np
+from pathlib import Path
+
+current_file = Path(__file__).resolve()
+project_root = current_file.parents[2]
+if str(project_root) not in sys.path:
+    sys.path.append(str(project_root))
+
+
+def interpolate_params(params):
+    """INTERP warm start: angles for depth p → depth p+1.
+
+    Each of the β and γ schedules is resampled as
+        x'_i = (i-1)/p · x_{i-1} + (p-i+1)/p · x_i,   i = 1..p+1
+    with x_0 = x_{p+1} = 0, which keeps the shape of the optimized
+    schedule (β ramping down, γ ramping up) on the finer grid.
+    """
+    params = np.asarray(params, dtype=np.float64)
+    reps = len(params) // 2
+    extended = []
+    for angles in (params[:reps], params[reps:]):
+        padded = np.concatenate([[0.0], angles, [0.0]])
+        i = np.arange(1, reps + 2)
+        extended.append((i - 1) / reps * padded[i - 1] + (reps - i + 1) / reps * padded[i])
+    return np.concatenate(extended)
+
+
+def extend_params(params, reps):
+    """Applies interpolate_params until the vector has depth reps."""
+    params = np.asarray(params, dtype=np.float64)
+    if len(params) > 2 * reps:
+        raise ValueError(f"Cannot extend depth {len(params) // 2} parameters to depth {reps}.")
+    while len(params) < 2 * reps:
+        params = interpolate_params(params)
+    return params
+
+
+def qubo_energy_std(Q):
+    """Standard deviation of x^T Q x over uniformly random bitstrings, from Q alone.
+
+    With x_i = (1 - z_i)/2 the energy is c + Σ h_i z_i + Σ_{i<j} J_ij z_i z_j
+    and the ±1 spins are independent, so the variance is Σ h_i² + Σ J_ij² —
+    the same number as np.std(qubo_cost_diagonal(Q)) without the 2^n vector.
+    """
+    coo = Q.tocoo()
+    n = Q.shape[0]
+    diagonal = coo.row == coo.col
+    rows, cols, weights = coo.row[~diagonal], coo.col[~diagonal], coo.data[~diagonal]
+
+    fields = -0.5 * np.bincount(coo.row[diagonal], weights=coo.data[diagonal], minlength=n)
+    fields -= 0.25 * (np.bincount(rows, weights=weights, minlength=n) +
+                      np.bincount(cols, weights=weights, minlength=n))
+
+    # Couplings stored at (i, j) and (j, i) act on the same spin pair
+    pairs = np.minimum(rows, cols) * n + np.maximum(rows, cols)
+    unique_pairs, inverse = np.unique(pairs, return_inverse=True)
+    couplings = 0.25 * np.bincount(inverse, weights=weights, minlength=len(unique_pairs))
+    return float(np.sqrt((fields ** 2).sum() + (couplings ** 2).sum()))
+
+
+class QAOAParameterStore:
+    """JSON store of optimized QAOA angles, by instance family, ansatz, N and p.
+
+    γ is stored multiplied by the instance's energy scale (the standard
+    deviation of the cost over the simulated basis, as in
+    QAOASimulator.default_params), so angles transfer between instances
+    whose costs differ in magnitude; β is stored as is. The ansatz
+    ("x_mixer" for StatevectorQAOA and Qiskit's QAOA, "ring_swap" for
+    PermutationQAOA) keeps angles of different circuits apart.
+
+    warm_start() picks the closest recorded group of the same family and
+    ansatz — same N before nearest N, same p before lower p — takes the
+    element-wise median over its instances and INTERP-extends it to the
+    requested depth.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.records = []
+        if path is not None and os.path.exists(path):
+            with open(path, "r") as f:
+                self.records = json.load(f)["records"]
+
+    def __len__(self):
+        return len(self.records)
+
+    def record(self, family, ansatz, num_cities, params, value=None, scale=1.0, fingerprint=None):
+        """Adds optimized params [β_1..β_p, γ_1..γ_p] of one instance.
+
+        With a fingerprint, a later record of the same instance and depth
+        replaces the earlier one only if its value is lower.
+        """
+        params = np.asarray(params, dtype=np.float64)
+        reps = len(params) // 2
+        entry = {
+            "family": family,
+            "ansatz": ansatz,
+            "num_cities": int(num_cities),
+            "reps": reps,
+            "betas": params[:reps].tolist(),
+            "gammas": (params[reps:] * scale).tolist(),
+            "value": None if value is None else float(value),
+            "fingerprint": fingerprint,
+        }
+
+        if fingerprint is not None:
+            for k, old in enumerate(self.records):
+                if (old["fingerprint"] == fingerprint and old["reps"] == reps
+                        and old["family"] == family and old["ansatz"] == ansatz):
+                    if old["value"] is None or (value is not None and value < old["value"]):
+                        self.records[k] = entry
+                    return
+        self.records.append(entry)
+
+    def _closest_group(self, family, ansatz, num_cities, reps):
+        candidates = [r for r in self.records
+                      if r["family"] == family and r["ansatz"] == ansatz and r["reps"] <= reps]
+        if not candidates:
+            return []
+        best = min((abs(r["num_cities"] - num_cities), reps - r["reps"]) for r in candidates)
+        return [r for r in candidates
+                if (abs(r["num_cities"] - num_cities), reps - r["reps"]) == best]
+
+    def _denormalize(self, normalized, reps, scale):
+        params = extend_params(normalized, reps)
+        params[reps:] /= scale
+        return params
+
+    def warm_start(self, family, ansatz, num_cities, reps, scale=1.0):
+        """Median params of the closest recorded group at depth reps, or None."""
+        group = self._closest_group(family, ansatz, num_cities, reps)
+        if not group:
+            return None
+        normalized = np.median([r["betas"] + r["gammas"] for r in group], axis=0)
+        return self._denormalize(normalized, reps, scale)
+
+    def seeds(self, family, ansatz, num_cities, reps, scale=1.0, limit=10):
+        """Up to limit starting points (median first, then the group's own
+        instances) as a (k, 2p) array, e.g. a GA initial_population."""
+        group = self._closest_group(family, ansatz, num_cities, reps)
+        if not group:
+            return np.empty((0, 2 * reps))
+        rows = [self.warm_start(family, ansatz, num_cities, reps, scale)]
+        for r in sorted(group, key=lambda r: np.inf if r["value"] is None else r["value"]):
+            rows.append(self._denormalize(r["betas"] + r["gammas"], reps, scale))
+        return np.array(rows[:limit])
+
+    # Convenience wrappers for QAOASimulator instances
+
+    def warm_start_for(self, simulator, family, num_cities):
+        return self.warm_start(family, simulator.ansatz, num_cities, simulator.reps,
+                               scale=simulator.energy_scale())
+
+    def seeds_for(self, simulator, family, num_cities, limit=10):
+        return self.seeds(family, simulator.ansatz, num_cities, simulator.reps,
+                          scale=simulator.energy_scale(), limit=limit)
+
+    def record_for(self, simulator, family, num_cities, params, value=None):
+        self.record(family, simulator.ansatz, num_cities, params, value=value,
+                    scale=simulator.energy_scale(), fingerprint=simulator.fingerprint)
+
+    def save(self, path=None):
+        path = path or self.path
+        if path is None:
+            raise ValueError("No path given for saving the parameter store.")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"records": self.records}, f, indent=2)
+        os.replace(tmp_path, path)
+
+
+if __name__ == "__main__":
+    from src.common.utils import load_tsp_data
+    from src.quantum.qaoa_standard import PermutationQAOA
+
+    # Depth ladder on N=6: each p starts from the INTERP-extended optimum of p-1
+    store = QAOAParameterStore()
+    distance_matrix, _, _ = load_tsp_data(6)
+    for reps in range(1, 6):
+        cold = PermutationQAOA(distance_matrix, reps=reps).optimize(maxiter=500)
+
+        simulator = PermutationQAOA(distance_matrix, reps=reps)
+        warm = simulator.optimize(x0=store.warm_start_for(simulator, "random", 6), maxiter=500)
+        store.record_for(simulator, "random", 6, warm["optimal_params"], warm["optimal_value"])
+
+        print(f"p={reps} | Cold: {cold['optimal_value']:.4f} ({cold['num_evaluations']} evals) | "
+              f"Warm: {warm['optimal_value']:.4f} ({warm['num_evaluations']} evals)")
+
+    # Transfer to a new instance size: N=7 seeded from the N=6 median
+    distance_matrix, _, _ = load_tsp_data(7)
+    for reps in [3, 5]:
+        cold = PermutationQAOA(distance_matrix, reps=reps).optimize(maxiter=500)
+        simulator = PermutationQAOA(distance_matrix, reps=reps)
+        warm = simulator.optimize(x0=store.warm_start_for(simulator, "random", 7), maxiter=500)
+        print(f"N=7 p={reps} | Cold: {cold['optimal_value']:.4f} ({cold['num_evaluations']} evals) | "
+              f"Transferred: {warm['optimal_value']:.4f} ({warm['num_evaluations']} evals)")
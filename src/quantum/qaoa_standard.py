@@ -0,0 +1,586 @@
+import math
+import sys
+import time
+import numpy as np
+from abc import ABC, abstractmethod
+from pathlib import Path
+from scipy.optimize import minimize
+
+current_file = Path(__file__).resolve()
+project_root = current_file.parents[2]
+if str(project_root) not in sys.path:
+    sys.path.append(str(project_root))
+
+from src.quantum.qaoa_cache import array_fingerprint, qubo_fingerprint
+from src.quantum.qaoa_params import qubo_energy_std
+from src.quantum.qubo_evaluator import evaluate_samples
+
+
+# ── Statevector kernels ────────────────────────────────────────────────────
+#
+# States have shape (2^n,) or (2^n, *batch): trailing axes hold independent
+# states, and per-state angles broadcast against them. Qubit q is bit q of
+# the basis index (Qiskit's little-endian order), i.e. QUBO variable q.
+
+def qubo_cost_diagonal(Q, offset=0.0, dtype=np.float64):
+    """All 2^n energies x^T Q x + offset as one vector, index k ↔ x_q = bit q of k.
+
+    Built by doubling: the energies of the first m variables are extended
+    with variable m in one vectorized pass over the existing 2^m block,
+    adding Q_mm plus the couplings to the variables already set. Total
+    work is O(2^n) elementwise operations, no per-bitstring Python loop.
+    """
+    dense = Q.toarray() if hasattr(Q, "toarray") else np.asarray(Q, dtype=np.float64)
+    n = dense.shape[0]
+    couplings = np.triu(dense, 1) + np.tril(dense, -1).T  # upper-triangular, summed
+
+    energies = np.empty(1 << n, dtype=dtype)
+    energies[0] = offset
+    field = np.empty(1 << max(n - 1, 0), dtype=dtype)
+    for m in range(n):
+        size = 1 << m
+        # field[k] = Σ_{u<m} couplings[u, m]·x_u(k) over the 2^m prefixes
+        field[0] = dense[m, m]
+        for u in range(m):
+            block = 1 << u
+            np.add(field[:block], couplings[u, m], out=field[block:2 * block])
+        np.add(energies[:size], field[:size], out=energies[size:2 * size])
+    return energies
+
+
+def apply_phase(state, diagonal, gamma, chunk_size=1 << 18):
+    """state ← exp(-iγ·C)·state for the diagonal cost Hamiltonian C, in place.
+
+    Phases are computed in chunks of about chunk_size entries (rows times
+    batch size) so temporaries stay cache-sized, with float32 cos/sin to
+    match the complex64 state.
+    """
+    gamma = np.asarray(gamma, dtype=np.float64)
+    step = max(1, chunk_size // max(gamma.size, 1))
+    for start in range(0, len(diagonal), step):
+        angles = np.multiply.outer(diagonal[start:start + step], gamma).astype(np.float32)
+        phase = np.empty(angles.shape, dtype=state.dtype)
+        np.cos(angles, out=phase.real)
+        np.sin(angles, out=phase.imag)
+        np.negative(phase.imag, out=phase.imag)
+        state[start:start + step] *= phase
+    return state
+
+
+def _rotation_block(beta, num_qubits, dtype=np.complex64):
+    """exp(-iβX)^{⊗k} as a dense 2^k x 2^k matrix."""
+    c, s = np.cos(beta), np.sin(beta)
+    rotation = np.array([[c, -1j * s], [-1j * s, c]])
+    block = np.ones((1, 1))
+    for _ in range(num_qubits):
+        block = np.kron(block, rotation)
+    return block.astype(dtype)
+
+
+def apply_x_mixer(state, beta, num_qubits, block_qubits=4, chunk_size=1 << 18):
+    """state ← Π_q exp(-iβ·X_q)·state, in place.
+
+    For a single state the mixer is the same rotation on every qubit, so
+    block_qubits adjacent qubits are fused into one 2^k x 2^k matrix and
+    applied with matmul over (pre, 2^k, post) views, chunk by chunk —
+    far fewer memory passes than one butterfly per qubit.
+
+    Batched states (per-entry β on trailing axes) use per-qubit
+    butterflies: viewing the state as (2^(n-q-1), 2, 2^q, *batch), X_q
+    swaps the two halves of axis 1.
+    """
+    beta = np.asarray(beta, dtype=np.float64)
+    if beta.ndim == 0 and state.ndim == 1:
+        q = 0
+        while q < num_qubits:
+            k = min(block_qubits, num_qubits - q)
+            block = _rotation_block(float(beta), k, state.dtype)
+            view = state.reshape(-1, 1 << k, 1 << q)
+            pre, _, post = view.shape
+            if pre > 1:
+                step = max(1, chunk_size // (post << k))
+                for start in range(0, pre, step):
+                    view[start:start + step] = np.matmul(block, view[start:start + step])
+            else:
+                step = max(1, chunk_size >> k)
+                for start in range(0, post, step):
+                    view[:, :, start:start + step] = np.matmul(block, view[:, :, start:start + step])
+            q += k
+        return state
+
+    c = np.cos(beta).astype(np.float32)
+    s = np.sin(beta).astype(np.float32)
+    batch = state.shape[1:]
+    for q in range(num_qubits):
+        view = state.reshape((-1, 2, 1 << q) + batch)
+        a, b = view[:, 0], view[:, 1]
+        a_old = a.copy()
+        a *= c
+        a -= 1j * s * b
+        b *= c
+        b -= 1j * s * a_old
+    return state
+
+
+def apply_mixer_hamiltonian(state, num_qubits):
+    """Returns B·state for B = Σ_q X_q (out of place)."""
+    batch = state.shape[1:]
+    out = np.zeros_like(state)
+    for q in range(num_qubits):
+        view = state.reshape((-1, 2, 1 << q) + batch)
+        out.reshape(view.shape)[...] += view[:, ::-1]
+    return out
+
+
+def diagonal_overlap(bra, diagonal, ket, chunk_size=1 << 18):
+    """<bra|D|ket> for a diagonal operator D, accumulated in chunks (complex128)."""
+    total = 0j
+    for start in range(0, len(diagonal), chunk_size):
+        stop = start + chunk_size
+        total += np.vdot(bra[start:stop], diagonal[start:stop] * ket[start:stop])
+    return total
+
+
+def split_params(params, reps):
+    """Parameter vector [β_1..β_p, γ_1..γ_p] (batch on trailing axes) → (betas, gammas)."""
+    params = np.asarray(params, dtype=np.float64)
+    return params[:reps], params[reps:2 * reps]
+
+
+# ── Permutation subspace ───────────────────────────────────────────────────
+
+def lexicographic_permutations(m, dtype=np.int8):
+    """All m! permutations of range(m) in lexicographic order, shape (m!, m).
+
+    Built block-wise: the permutations starting with f are f followed by
+    the (m-1)-permutations relabelled onto the remaining values, which
+    keeps lexicographic order without a Python loop per permutation.
+    """
+    perms = np.zeros((1, 0), dtype=dtype)
+    for k in range(1, m + 1):
+        blocks = []
+        for first in range(k):
+            rest = perms + (perms >= first)
+            blocks.append(np.hstack([np.full((len(perms), 1), first, dtype=dtype), rest.astype(dtype)]))
+        perms = np.vstack(blocks)
+    return perms
+
+
+def permutation_ranks(perms):
+    """Lexicographic rank of each row via its Lehmer code."""
+    perms = np.asarray(perms)
+    m = perms.shape[-1]
+    lehmer = np.zeros(perms.shape, dtype=np.int64)
+    for k in range(m - 1):
+        lehmer[..., k] = (perms[..., k + 1:] < perms[..., k:k + 1]).sum(axis=-1)
+    weights = np.array([math.factorial(m - 1 - k) for k in range(m)], dtype=np.int64)
+    return lehmer @ weights
+
+
+def ring_swap_indices(perms):
+    """For each ring edge (k, k+1 mod m): rank of every permutation with positions k, k+1 swapped.
+
+    Each row is the index map of an involutive permutation operator T_e
+    on the subspace, so exp(-iβ·T_e) = cos β·I - i sin β·T_e.
+    """
+    m = perms.shape[1]
+    edges = [(k, (k + 1) % m) for k in range(m if m > 2 else m - 1)]
+    indices = np.empty((len(edges), len(perms)), dtype=np.int32)
+    for e, (a, b) in enumerate(edges):
+        swapped = perms.copy()
+        swapped[:, [a, b]] = swapped[:, [b, a]]
+        indices[e] = permutation_ranks(swapped)
+    return indices
+
+
+def apply_swap_mixer(state, beta, swap_indices):
+    """state ← Π_e exp(-iβ·T_e)·state for the ring transposition mixer, in place."""
+    beta = np.asarray(beta, dtype=np.float64)
+    c = np.cos(beta).astype(np.float32)
+    s = np.sin(beta).astype(np.float32)
+    for index in swap_indices:
+        swapped = state[index]
+        state *= c
+        state -= 1j * s * swapped
+    return state
+
+
+# ── Simulators ─────────────────────────────────────────────────────────────
+
+# scipy.optimize methods that take the adjoint gradient (jac=True)
+GRADIENT_METHODS = ("L-BFGS-B", "BFGS", "CG", "SLSQP", "TNC")
+
+
+class QAOASimulator(ABC):
+    """Shared QAOA driver: a diagonal cost vector and a mixer on the same basis.
+
+    Subclasses provide apply_mixer(state, beta) and mixer_backward(...);
+    the initial state is the uniform superposition over the simulated basis.
+
+    With a QAOAEvaluationCache (qaoa_cache.py) expectation() only
+    simulates parameter vectors not seen before for this instance.
+    """
+
+    # Circuit family the angles belong to (QAOAParameterStore key)
+    ansatz = None
+
+    def __init__(self, cost_diagonal, reps=1, chunk_size=1 << 18, cache=None):
+        self.cost_diagonal = cost_diagonal
+        self.dim = len(cost_diagonal)
+        self.reps = reps
+        self.chunk_size = chunk_size
+        self.cache = cache
+        self.num_evaluations = 0
+        self._fingerprint = None
+        self._energy_scale = None
+
+    @property
+    def fingerprint(self):
+        """Instance fingerprint used as the cache namespace (computed once)."""
+        if self._fingerprint is None:
+            self._fingerprint = self._compute_fingerprint()
+        return self._fingerprint
+
+    def energy_scale(self):
+        """Spread (standard deviation) of the cost over the basis; γ scales as its inverse."""
+        if self._energy_scale is None:
+            self._energy_scale = max(float(np.std(self.cost_diagonal)), 1e-12)
+        return self._energy_scale
+
+    def _compute_fingerprint(self):
+        return array_fingerprint(np.asarray(self.cost_diagonal, dtype=np.float64),
+                                 tag=type(self).__name__)
+
+    @abstractmethod
+    def apply_mixer(self, state, beta):
+        """state ← exp(-iβ·B)·state for this ansatz's mixer B, in place."""
+
+    @abstractmethod
+    def mixer_backward(self, state, costate, beta):
+        """Adjoint step through one mixer layer.
+
+        Called with state/costate at the point just after the mixer;
+        returns dE/dβ for that layer and un-applies the mixer from both
+        in place.
+        """
+
+    def initial_state(self, batch_shape=()):
+        """Uniform superposition (for every batch entry)."""
+        return np.full((self.dim,) + tuple(batch_shape), 1 / np.sqrt(self.dim), dtype=np.complex64)
+
+    def default_params(self):
+        """Linear-ramp start: β from π/4 down, γ up to ~1/(energy spread)."""
+        k = (np.arange(self.reps) + 0.5) / self.reps
+        return np.concatenate([np.pi / 4 * (1 - k), k / self.energy_scale()])
+
+    def statevector(self, params):
+        """Final QAOA state for params [β_1..β_p, γ_1..γ_p] (batched on trailing axes)."""
+        betas, gammas = split_params(params, self.reps)
+        state = self.initial_state(betas.shape[1:])
+        for beta, gamma in zip(betas, gammas):
+            apply_phase(state, self.cost_diagonal, gamma, self.chunk_size)
+            self.apply_mixer(state, beta)
+        return state
+
+    def probabilities(self, params):
+        state = self.statevector(params)
+        return state.real ** 2 + state.imag ** 2
+
+    def compute_expectation(self, params):
+        """<ψ(β, γ)|C|ψ(β, γ)> for the simulated cost diagonal, always simulated."""
+        self.num_evaluations += 1
+        probs = self.probabilities(params)
+        return np.tensordot(self.cost_diagonal, probs, axes=(0, 0)).astype(np.float64)
+
+    def expectation(self, params):
+        """compute_expectation through the evaluation cache, if there is one.
+
+        Batched params (2p, *batch) are looked up column by column and only
+        the missing ones are simulated, as one smaller batch.
+        """
+        if self.cache is None:
+            return self.compute_expectation(params)
+
+        params = np.asarray(params, dtype=np.float64)
+        if params.ndim == 1:
+            value = self.cache.get(self.fingerprint, params)
+            if value is None:
+                value = float(self.compute_expectation(params))
+                self.cache.put(self.fingerprint, params, value)
+            return np.float64(value)
+
+        population = params.reshape(len(params), -1).T
+        values, missing = self.cache.get_many(self.fingerprint, population)
+        if missing.any():
+            values[missing] = self.compute_expectation(population[missing].T)
+            self.cache.put_many(self.fingerprint, population[missing], values[missing])
+        return values.reshape(params.shape[1:])
+
+    def expectation_and_gradient(self, params):
+        """Expectation and its exact gradient w.r.t. [β_1..β_p, γ_1..γ_p].
+
+        Reverse-mode (adjoint) differentiation: after one forward pass the
+        costate λ = C|ψ> is propagated back through the layers together
+        with |ψ>, un-applying each unitary. For a layer exp(-iθG) the
+        derivative is 2·Im<λ|G|ψ> at the point just after it, so the whole
+        2p-dimensional gradient costs about two forward passes and no
+        finite differences.
+
+        With a cache, (value, gradient) pairs are stored under a separate
+        key so a rerun of the same optimization replays without simulating.
+        """
+        if self.cache is not None:
+            cached = self.cache.get(self.fingerprint + ":grad", params)
+            if cached is not None:
+                return cached[0], np.array(cached[1:])
+
+        self.num_evaluations += 1
+        betas, gammas = split_params(params, self.reps)
+        state = self.statevector(params)
+        costate = state.copy()
+
+        # λ = C|ψ>
+        for start in range(0, self.dim, self.chunk_size):
+            costate[start:start + self.chunk_size] *= self.cost_diagonal[start:start + self.chunk_size]
+        value = float(np.real(np.vdot(state, costate)))
+
+        grad_betas = np.zeros(self.reps)
+        grad_gammas = np.zeros(self.reps)
+        for k in reversed(range(self.reps)):
+            grad_betas[k] = self.mixer_backward(state, costate, betas[k])
+            grad_gammas[k] = 2 * np.imag(diagonal_overlap(costate, self.cost_diagonal, state,
+                                                          self.chunk_size))
+            apply_phase(state, self.cost_diagonal, -gammas[k], self.chunk_size)
+            apply_phase(costate, self.cost_diagonal, -gammas[k], self.chunk_size)
+
+        gradient = np.concatenate([grad_betas, grad_gammas])
+        if self.cache is not None:
+            self.cache.put(self.fingerprint, params, value)
+            self.cache.put(self.fingerprint + ":grad", params, [value, *gradient])
+        return value, gradient
+
+    def sample_indices(self, params, shots=1024, seed=None):
+        """Draws basis indices from the final state → (distinct indices, counts)."""
+        probs = self.probabilities(params).astype(np.float64)
+        probs /= probs.sum()
+        rng = np.random.default_rng(seed)
+        drawn = rng.choice(self.dim, size=shots, p=probs)
+        return np.unique(drawn, return_counts=True)
+
+    def optimize(self, x0=None, maxiter=100, method="L-BFGS-B"):
+        """Minimizes the expectation over (β, γ) with scipy.optimize.minimize.
+
+        Gradient-based methods (L-BFGS-B, BFGS, CG, SLSQP, TNC) get exact
+        adjoint gradients from expectation_and_gradient; others (COBYLA,
+        Nelder-Mead, ...) only see the expectation, through the cache.
+
+        The best point evaluated is returned, not the optimizer's last
+        iterate: on the steep landscapes of penalty-weighted QUBOs a failed
+        L-BFGS-B line search can end far above the best value it visited.
+
+        Returns:
+            dict: optimal_params, optimal_value, num_evaluations, history
+        """
+        if x0 is None:
+            x0 = self.default_params()
+        history = []
+        best = {"params": np.asarray(x0, dtype=np.float64), "value": np.inf}
+        start_evaluations = self.num_evaluations
+
+        def track(params, value):
+            history.append(value)
+            if value < best["value"]:
+                best["params"], best["value"] = np.array(params, dtype=np.float64), value
+
+        if method in GRADIENT_METHODS:
+            def objective(params):
+                value, gradient = self.expectation_and_gradient(params)
+                track(params, value)
+                return value, gradient
+        else:
+            def objective(params):
+                value = float(self.expectation(params))
+                track(params, value)
+                return value
+
+        minimize(objective, x0, method=method, jac=method in GRADIENT_METHODS,
+                 options={"maxiter": maxiter})
+        return {
+            "optimal_params": best["params"],
+            "optimal_value": float(best["value"]),
+            "num_evaluations": self.num_evaluations - start_evaluations,
+            "history": history,
+        }
+
+
+class StatevectorQAOA(QAOASimulator):
+    """QAOA for a QUBO simulated directly on a NumPy statevector.
+
+    The cost Hamiltonian is diagonal in the computational basis, so its
+    2^n energies are computed once (qubo_cost_diagonal) and every phase
+    layer is an elementwise multiply. The X-mixer is applied in place on
+    a complex64 state, half the memory of Qiskit's complex128
+    statevector. No circuits are built or transpiled.
+
+    Memory: 8·2^n bytes for the state plus 8·2^n for the energies
+    (25 qubits → 512 MB in total).
+    """
+
+    ansatz = "x_mixer"
+
+    def __init__(self, Q, offset=0.0, reps=1, chunk_size=1 << 18, cache=None):
+        super().__init__(qubo_cost_diagonal(Q, offset), reps=reps, chunk_size=chunk_size, cache=cache)
+        self.num_qubits = Q.shape[0]
+        self.Q = Q
+        self.offset = offset
+
+    def energy_scale(self):
+        # Closed form from Q, no pass over the 2^n energies
+        if self._energy_scale is None:
+            self._energy_scale = max(qubo_energy_std(self.Q), 1e-12)
+        return self._energy_scale
+
+    def _compute_fingerprint(self):
+        # Hashing the sparse QUBO is much cheaper than its 2^n energies
+        return qubo_fingerprint(self.Q, self.offset, tag=type(self).__name__)
+
+    def apply_mixer(self, state, beta):
+        return apply_x_mixer(state, beta, self.num_qubits, chunk_size=self.chunk_size)
+
+    def mixer_backward(self, state, costate, beta):
+        # All X_q commute, so the layer generator is B = Σ_q X_q
+        gradient = 2 * np.imag(np.vdot(costate, apply_mixer_hamiltonian(state, self.num_qubits)))
+        self.apply_mixer(state, -beta)
+        self.apply_mixer(costate, -beta)
+        return gradient
+
+    def sample(self, params, shots=1024, seed=None):
+        """Samples bitstrings from the final state.
+
+        Returns:
+            X     (np.ndarray): (K, n) uint8 distinct sampled bitstrings
+            shots (np.ndarray): (K,) how often each was drawn
+        """
+        indices, counts = self.sample_indices(params, shots=shots, seed=seed)
+        X = ((indices[:, None] >> np.arange(self.num_qubits)) & 1).astype(np.uint8)
+        return X, counts
+
+    def solve(self, distance_matrix, fix_start=False, shots=1024, maxiter=100, x0=None, seed=None):
+        """Optimizes the angles, samples the final state and decodes the best tour.
+
+        Returns:
+            dict: best_route, best_cost (inf if no feasible sample),
+                  feasible_fraction, optimal_params, optimal_value,
+                  num_evaluations, duration_sec
+        """
+        start_time = time.time()
+        opt = self.optimize(x0=x0, maxiter=maxiter)
+        X, counts = self.sample(opt["optimal_params"], shots=shots, seed=seed)
+        evaluation = evaluate_samples(X, self.Q, self.offset, distance_matrix,
+                                      fix_start=fix_start, shots=counts)
+
+        return {
+            "best_route": evaluation["best_route"],
+            "best_cost": evaluation["best_cost"],
+            "feasible_fraction": evaluation["feasible_fraction"],
+            "optimal_params": opt["optimal_params"].tolist(),
+            "optimal_value": opt["optimal_value"],
+            "num_evaluations": opt["num_evaluations"],
+            "duration_sec": time.time() - start_time,
+        }
+
+
+class PermutationQAOA(QAOASimulator):
+    """QAOA restricted to the feasible subspace of valid tours.
+
+    Basis states are the permutations of the free cities in lexicographic
+    order (index = Lehmer rank), so N = 7 with fix_start needs 6! = 720
+    amplitudes instead of 2^36, and N = 10 needs 9! = 362,880. The cost
+    diagonal is the tour length of each permutation. The mixer is the ring
+    transposition mixer Π_e exp(-iβ·T_e), where T_e swaps the cities at
+    adjacent tour positions e = (k, k+1 mod m) — the permutation-space
+    counterpart of the ring XY mixer, which never leaves the subspace.
+
+    With fix_start (default) city 0 is pinned to the first position.
+    """
+
+    ansatz = "ring_swap"
+
+    def __init__(self, distance_matrix, reps=1, fix_start=True, chunk_size=1 << 18, cache=None):
+        matrix = np.asarray(distance_matrix, dtype=np.float64)
+        self.num_cities = len(matrix)
+        self.fix_start = fix_start
+        first = 1 if fix_start else 0
+
+        self.permutations = lexicographic_permutations(self.num_cities - first)
+        self.routes = self.permutations.astype(np.int64) + first
+        if fix_start:
+            self.routes = np.hstack([np.zeros((len(self.routes), 1), dtype=np.int64), self.routes])
+        costs = matrix[self.routes, np.roll(self.routes, -1, axis=1)].sum(axis=1)
+
+        super().__init__(costs, reps=reps, chunk_size=chunk_size, cache=cache)
+        self.swap_indices = ring_swap_indices(self.permutations)
+
+    def apply_mixer(self, state, beta):
+        return apply_swap_mixer(state, beta, self.swap_indices)
+
+    def mixer_backward(self, state, costate, beta):
+        # The T_e do not commute: walk the edge factors in reverse order
+        gradient = 0.0
+        for e in reversed(range(len(self.swap_indices))):
+            index = self.swap_indices[e:e + 1]
+            gradient += 2 * np.imag(np.vdot(costate, state[index[0]]))
+            apply_swap_mixer(state, -beta, index)
+            apply_swap_mixer(costate, -beta, index)
+        return gradient
+
+    def sample(self, params, shots=1024, seed=None):
+        """Samples tours from the final state → (routes (K, N), counts (K,))."""
+        indices, counts = self.sample_indices(params, shots=shots, seed=seed)
+        return self.routes[indices], counts
+
+    def solve(self, shots=1024, maxiter=100, x0=None, seed=None):
+        """Optimizes the angles, samples tours and returns the best one.
+
+        Returns:
+            dict: best_route, best_cost, optimal_probability (probability
+                  mass on the optimal tours), optimal_params, optimal_value,
+                  num_evaluations, duration_sec
+        """
+        start_time = time.time()
+        opt = self.optimize(x0=x0, maxiter=maxiter)
+        indices, _ = self.sample_indices(opt["optimal_params"], shots=shots, seed=seed)
+        costs = self.cost_diagonal[indices]
+        best = int(indices[np.argmin(costs)])
+
+        probs = self.probabilities(opt["optimal_params"])
+        optimal = np.isclose(self.cost_diagonal, self.cost_diagonal.min())
+
+        return {
+            "best_route": self.routes[best].tolist(),
+            "best_cost": float(self.cost_diagonal[best]),
+            "optimal_probability": float(probs[optimal].sum()),
+            "optimal_params": opt["optimal_params"].tolist(),
+            "optimal_value": opt["optimal_value"],
+            "num_evaluations": opt["num_evaluations"],
+            "duration_sec": time.time() - start_time,
+        }
+
+
+if __name__ == "__main__":
+    from src.common.utils import get_raw_dir, load_tsp_data
+    from src.quantum.qubo_converter import create_tsp_qubo_sparse
+
+    # Reduced QUBOs: N = 4 → 9 qubits, N = 5 → 16 qubits
+    for n in [4, 5]:
+        if not (get_raw_dir() / f"tsp_n{n}.json").exists():
+            print(f"Skipping N={n}: no instance in data/raw")
+            continue
+        distance_matrix, _, _ = load_tsp_data(n)
+        Q, offset = create_tsp_qubo_sparse(distance_matrix, fix_start=True)
+        qaoa = StatevectorQAOA(Q, offset, reps=2)
+
+        res = qaoa.solve(distance_matrix, fix_start=True, maxiter=100, seed=2026)
+        print(f"N={n} ({qaoa.num_qubits} qubits) | Route: {res['best_route']} | "
+              f"Cost: {res['best_cost']:.2f} | Feasible: {res['feasible_fraction']:.1%} | "
+              f"Evaluations: {res['num_evaluations']} | Time: {res['duration_sec']:.2f}s")
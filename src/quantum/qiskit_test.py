@@ -1,5 +1,8 @@
 import json
+import math
 import os
+import sys
+import numpy as np
 from pathlib import Path
 from qiskit_optimization import QuadraticProgram
 from qiskit_optimization.algorithms import MinimumEigenOptimizer
@@ -7,9 +10,64 @@ from qiskit_algorithms import QAOA
 from qiskit_algorithms.optimizers import COBYLA
 from qiskit.primitives import StatevectorSampler
 
+current_file = Path(__file__).resolve()
+project_root = current_file.parents[2]
+if str(project_root) not in sys.path:
+    sys.path.append(str(project_root))
+
+from src.quantum.qaoa_cache import QAOAEvaluationCache, cached_objective, qubo_fingerprint
+from src.quantum.qaoa_params import QAOAParameterStore, qubo_energy_std
+from src.quantum.qaoa_standard import PermutationQAOA, StatevectorQAOA
+from src.quantum.qubo_converter import load_qubo_file
+from src.quantum.qubo_evaluator import decode_routes, feasible_mask, qubo_energies
+
+BACKENDS = ("qiskit", "statevector", "permutation")
+
+
+class CachedCOBYLA(COBYLA):
+    """COBYLA whose objective goes through a QAOAEvaluationCache.
+
+    fingerprint is set per problem before solving; without it (or without
+    a cache) this is plain COBYLA.
+    """
+
+    def __init__(self, cache=None, **kwargs):
+        super().__init__(**kwargs)
+        self.cache = cache
+        self.fingerprint = None
+
+    def minimize(self, fun, x0, jac=None, bounds=None):
+        if self.cache is not None and self.fingerprint is not None:
+            fun = cached_objective(fun, self.cache, self.fingerprint)
+        return super().minimize(fun, x0, jac=jac, bounds=bounds)
+
+
 class QuantumTSPSolver:
-    def __init__(self, output_dir):
+    def __init__(self, output_dir, backend="qiskit", reps=1, maxiter=30, shots=1024, cache=None,
+                 param_store=None, family="random"):
+        """
+        backend: "qiskit"      → Qiskit QAOA + MinimumEigenOptimizer
+                 "statevector" → StatevectorQAOA (qaoa_standard.py), devre kurmadan
+                                 doğrudan NumPy durum vektörü üzerinde simülasyon
+                 "permutation" → PermutationQAOA: yalnızca geçerli turlar (N-1)! genlik;
+                                 solve() QUBO yerine tsp_nN.json örneğini okur
+        cache:   QAOAEvaluationCache (qaoa_cache.py) — aynı (β, γ) noktaları tekrar
+                 simüle edilmez; path verilmişse her çözümden sonra diske yazılır
+        param_store: QAOAParameterStore (qaoa_params.py) — optimizasyon, aynı aileden
+                 (family) benzer örneklerin / bir önceki derinliğin açılarıyla başlar
+                 ve bulunan açılar depoya eklenir
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend: {backend!r} (expected one of {BACKENDS})")
+
         self.output_dir = output_dir
+        self.backend = backend
+        self.reps = reps
+        self.maxiter = maxiter
+        self.shots = shots
+        self.cache = cache
+        self.param_store = param_store
+        self.family = family
         # Klasör yoksa oluştur
         os.makedirs(self.output_dir, exist_ok=True)
         
@@ -18,8 +76,8 @@ class QuantumTSPSolver:
         # COBYLA: Hızlı ve hafif klasik optimizasyon algoritması
         # reps=1: Kuantum devresinin derinliğini minimumda tutar
         self.sampler = StatevectorSampler()
-        self.optimizer = COBYLA(maxiter=30) 
-        self.qaoa = QAOA(sampler=self.sampler, optimizer=self.optimizer, reps=1)
+        self.optimizer = CachedCOBYLA(cache=cache, maxiter=maxiter)
+        self.qaoa = QAOA(sampler=self.sampler, optimizer=self.optimizer, reps=reps)
         self.optimizer_algo = MinimumEigenOptimizer(self.qaoa)
 
     def solve(self, file_path):
@@ -27,90 +85,170 @@ class QuantumTSPSolver:
             print(f"HATA: Dosya bulunamadı -> {file_path}")
             return
 
-        print(f"\n--- {os.path.basename(file_path)} İşleniyor ---")
+        print(f"\n--- {os.path.basename(file_path)} İşleniyor ({self.backend}) ---")
+
+        if self.backend == "permutation":
+            return self._solve_permutation(file_path)
         
-        # 1. QUBO verisini JSON'dan oku
-        with open(file_path, 'r') as f:
-            data = json.load(f)
-            
-        num_cities = data["num_cities"]
-        qubo_dict_str = data["qubo"]
-        offset = data["offset"]
+        # 1. QUBO verisini oku (JSON veya .npz)
+        Q, offset, metadata = load_qubo_file(file_path)
+        num_cities = metadata["num_cities"]
 
-        required_qubits = num_cities ** 2
+        # fix_start QUBO'larında şehir 0 adım 0'a sabit: yalnızca 1..N-1 değişken
+        fix_start = bool(metadata["fix_start"])
+        required_qubits = Q.shape[0]
         print(f"Şehir Sayısı: {num_cities} | Gereken Qubit Sayısı: {required_qubits}")
         
-        if num_cities > 5:
+        if required_qubits > 25:
             print("UYARI: 25'ten fazla qubit yerel bilgisayarlarda yüksek RAM tüketimi nedeniyle programın çökmesine (MemoryError) sebep olabilir!")
 
-        # 2. Qiskit Quadratic Program'ı oluştur
+        # 2. Modeli Çöz
+        try:
+            print("Kuantum simülasyonu başlatılıyor. Lütfen bekleyin...")
+            if self.backend == "statevector":
+                route, actual_distance, status = self._solve_statevector(Q, offset, num_cities, fix_start)
+            else:
+                route, actual_distance, status = self._solve_qiskit(Q, offset, num_cities, fix_start)
+
+            print(f"Bulunan En İyi Rota: {route}")
+            print(f"Tahmini Toplam Mesafe: {actual_distance}")
+
+            # 3. Sonuçları JSON olarak kaydet
+            self.save_result(num_cities, route, actual_distance, status)
+            self._save_cache()
+            self._save_param_store()
+
+        except MemoryError:
+            print(f"HATA: {num_cities} şehir ({required_qubits} qubit) simülasyonu için sistem belleği (RAM) yetersiz kaldı!")
+        except Exception as e:
+            print(f"Beklenmeyen bir hata oluştu: {e}")
+
+    def _solve_permutation(self, file_path):
+        # Permütasyon alt uzayı QUBO'ya değil, doğrudan mesafe matrisine dayanır
+        with open(file_path, 'r') as f:
+            data = json.load(f)
+
+        num_cities = data["num_cities"]
+        print(f"Şehir Sayısı: {num_cities} | Genlik Sayısı: {math.factorial(num_cities - 1)} (geçerli turlar)")
+
+        qaoa = PermutationQAOA(data["distance_matrix"], reps=self.reps, cache=self.cache)
+        x0 = self._warm_start(qaoa, num_cities)
+        res = qaoa.solve(shots=self.shots, maxiter=self.maxiter, x0=x0)
+        if self.param_store is not None:
+            self.param_store.record_for(qaoa, self.family, num_cities, res["optimal_params"], res["optimal_value"])
+
+        print(f"Bulunan En İyi Rota: {res['best_route']}")
+        print(f"Toplam Mesafe: {res['best_cost']} | Optimal tur olasılığı: {res['optimal_probability']:.3f}")
+        self.save_result(num_cities, res["best_route"], res["best_cost"], "OptimizationResultStatus.SUCCESS")
+        self._save_cache()
+        self._save_param_store()
+
+    def _solve_qiskit(self, Q, offset, num_cities, fix_start):
+        first = 1 if fix_start else 0
+        M = num_cities - first
+
+        # Qiskit Quadratic Program'ı oluştur
         qp = QuadraticProgram()
-        
-        # Değişkenleri ekle (x_sehir_adim)
-        for i in range(num_cities):
-            for t in range(num_cities):
-                qp.binary_var(f"x_{i}_{t}")
+
+        # Değişkenleri ekle (x_sehir_adim), QUBO indeksi v = (i-first)*M + (t-first)
+        names = [f"x_{v // M + first}_{v % M + first}" for v in range(M * M)]
+        for name in names:
+            qp.binary_var(name)
 
         linear = {}
         quadratic = {}
-
-        # String anahtarları Qiskit'in anlayacağı formata geri çevir
-        for key_str, weight in qubo_dict_str.items():
-            u_str, v_str = key_str.split("_")
-            i1, t1 = u_str.split(",")
-            i2, t2 = v_str.split(",")
-            
-            var1 = f"x_{i1}_{t1}"
-            var2 = f"x_{i2}_{t2}"
-            
-            if var1 == var2:
-                linear[var1] = weight
+        coo = Q.tocoo()
+        for r, c, weight in zip(coo.row, coo.col, coo.data):
+            if r == c:
+                linear[names[r]] = linear.get(names[r], 0) + float(weight)
             else:
-                # Çiftleri (Tuple) sıralayarak tekrarı önle
-                pair = tuple(sorted([var1, var2]))
-                quadratic[pair] = quadratic.get(pair, 0) + weight
+                pair = (names[r], names[c])
+                quadratic[pair] = quadratic.get(pair, 0) + float(weight)
 
         # Hedefi minimize et olarak ayarla
         qp.minimize(linear=linear, quadratic=quadratic)
+        # Örneklemeye dayalı Qiskit değerleri, statevector beklenen değerlerinden ayrı tutulur
+        self.optimizer.fingerprint = qubo_fingerprint(Q, offset, tag=f"qiskit-reps{self.reps}")
 
-        # 3. Modeli Çöz
-        try:
-            print("Kuantum simülasyonu başlatılıyor. Lütfen bekleyin...")
-            result = self.optimizer_algo.solve(qp)
-            
-            # 4. Sonuçları ayrıştır ve rotayı bul
-            route = [-1] * num_cities
-            for var, val in zip(qp.variables, result.x):
-                if val == 1.0:
-                    # var.name formatı: x_i_t
-                    parts = var.name.split('_')
-                    city = int(parts[1])
-                    step = int(parts[2])
-                    route[step] = city
-
-            # Gerçek mesafe değerini bulmak için offset'i geri ekliyoruz
-            actual_distance = result.fval + offset
+        # Qiskit QAOA devresi StatevectorQAOA ile aynı (β, γ) sırası ve ölçeğini kullanır
+        scale = qubo_energy_std(Q)
+        self.qaoa.initial_point = None
+        if self.param_store is not None:
+            self.qaoa.initial_point = self.param_store.warm_start(self.family, "x_mixer", num_cities,
+                                                                  self.reps, scale=scale)
+        result = self.optimizer_algo.solve(qp)
 
-            print(f"Bulunan En İyi Rota: {route}")
-            print(f"Tahmini Toplam Mesafe: {actual_distance}")
+        # Örneklenmiş, offset'siz enerji beklenen değerlerle karşılaştırılamaz: value kaydedilmez
+        if self.param_store is not None and result.min_eigen_solver_result is not None:
+            self.param_store.record(self.family, "x_mixer", num_cities,
+                                    result.min_eigen_solver_result.optimal_point,
+                                    scale=scale, fingerprint=self.optimizer.fingerprint)
 
-            # 5. Sonuçları JSON olarak kaydet
-            self.save_result(num_cities, route, actual_distance, str(result.status))
+        # Sonuçları ayrıştır ve rotayı bul
+        route = [-1] * num_cities
+        if fix_start:
+            route[0] = 0
+        for var, val in zip(qp.variables, result.x):
+            if val == 1.0:
+                # var.name formatı: x_i_t
+                parts = var.name.split('_')
+                city = int(parts[1])
+                step = int(parts[2])
+                route[step] = city
 
-        except MemoryError:
-            print(f"HATA: {num_cities} şehir ({required_qubits} qubit) simülasyonu için sistem belleği (RAM) yetersiz kaldı!")
-        except Exception as e:
-            print(f"Beklenmeyen bir hata oluştu: {e}")
+        # Gerçek mesafe değerini bulmak için offset'i geri ekliyoruz
+        return route, result.fval + offset, str(result.status)
+
+    def _solve_statevector(self, Q, offset, num_cities, fix_start):
+        qaoa = StatevectorQAOA(Q, offset, reps=self.reps, cache=self.cache)
+        opt = qaoa.optimize(x0=self._warm_start(qaoa, num_cities), maxiter=self.maxiter)
+        if self.param_store is not None:
+            self.param_store.record_for(qaoa, self.family, num_cities, opt["optimal_params"], opt["optimal_value"])
+        X, _ = qaoa.sample(opt["optimal_params"], shots=self.shots)
+
+        # MinimumEigenOptimizer gibi: örneklenenler arasından en düşük enerjili olan
+        best = int(np.argmin(qubo_energies(Q, X, offset)))
+        sample = X[best:best + 1]
+        feasible = bool(feasible_mask(sample, num_cities, fix_start)[0])
+        route = decode_routes(sample, num_cities, fix_start)[0].tolist()
+        energy = float(qubo_energies(Q, sample, offset)[0])
+
+        print(f"Değerlendirme sayısı: {opt['num_evaluations']} | Beklenen enerji: {opt['optimal_value']:.4f}")
+        status = "OptimizationResultStatus.SUCCESS" if feasible else "OptimizationResultStatus.INFEASIBLE"
+        return route, energy, status
+
+    def _warm_start(self, qaoa, num_cities):
+        # Depoda uygun kayıt yoksa None → simülatörün doğrusal rampa başlangıcı
+        if self.param_store is None:
+            return None
+        x0 = self.param_store.warm_start_for(qaoa, self.family, num_cities)
+        if x0 is not None:
+            print(f"Sıcak başlangıç: {np.round(x0, 4).tolist()}")
+        return x0
+
+    def _save_param_store(self):
+        if self.param_store is not None and self.param_store.path is not None:
+            self.param_store.save()
+
+    def _save_cache(self):
+        if self.cache is None:
+            return
+        stats = self.cache.stats()
+        print(f"Önbellek: {stats['hits']} isabet / {stats['misses']} ıskalama | {stats['entries']} kayıt")
+        if self.cache.path is not None:
+            self.cache.save()
 
     def save_result(self, num_cities, route, distance, status):
         result_data = {
             "num_cities": num_cities,
+            "backend": self.backend,
             "optimal_route": route,
             "total_distance": distance,
             "status": status
         }
         
-        output_file = os.path.join(self.output_dir, f"tsp_n{num_cities}_result.json")
+        suffix = "" if self.backend == "qiskit" else f"_{self.backend}"
+        output_file = os.path.join(self.output_dir, f"tsp_n{num_cities}{suffix}_result.json")
         with open(output_file, 'w') as f:
             json.dump(result_data, f, indent=4)
             
@@ -133,8 +271,34 @@ if __name__ == "__main__":
         # "tsp_n7_qubo.json", # 49 qubit — yerel simülatörde çalışmaz
     ]
 
-    solver = QuantumTSPSolver(output_dir=target_output_dir)
+    # Değerlendirme önbelleği: tekrar eden çalıştırmalar aynı noktaları yeniden simüle etmez
+    cache = QAOAEvaluationCache(path=os.path.join(target_output_dir, "qaoa_cache.json"))
+    # Açı deposu: her çözüm, önceki örneklerin / derinliklerin en iyi açılarıyla başlar
+    param_store = QAOAParameterStore(path=os.path.join(target_output_dir, "qaoa_params.json"))
+
+    solver = QuantumTSPSolver(output_dir=target_output_dir, cache=cache, param_store=param_store)
 
     for file_name in target_files:
         full_path = os.path.join(input_dir, file_name)
-        solver.solve(full_path)
\ No newline at end of file
+        solver.solve(full_path)
+
+    # NumPy durum vektörü: devre kurulmaz, 25 qubit ~512 MB
+    statevector_files = [
+        "tsp_n5_qubo_fixed.npz",  # 16 qubit
+        "tsp_n6_qubo_fixed.npz",  # 25 qubit
+    ]
+
+    statevector_solver = QuantumTSPSolver(output_dir=target_output_dir, backend="statevector",
+                                          reps=2, maxiter=100, cache=cache, param_store=param_store)
+
+    for file_name in statevector_files:
+        full_path = os.path.join(input_dir, file_name)
+        statevector_solver.solve(full_path)
+
+    # Yalnızca geçerli turlar: N = 7 → 720 genlik, yerelde rahatça çalışır
+    permutation_solver = QuantumTSPSolver(output_dir=target_output_dir, backend="permutation",
+                                          reps=3, maxiter=200, cache=cache, param_store=param_store)
+
+    for file_name in ["tsp_n5.json", "tsp_n6.json", "tsp_n7.json"]:
+        full_path = os.path.join(input_dir, file_name)
+        permutation_solver.solve(full_path)
\ No newline at end of file
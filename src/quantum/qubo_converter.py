@@ -1,6 +1,190 @@
 import numpy as np
 import json
 import os
+import scipy.sparse as sp
+
+
+def default_penalty_weight(distance_matrix):
+    """Penalty large enough that breaking a constraint never shortens a tour."""
+    matrix = np.asarray(distance_matrix, dtype=float)
+    return float(np.max(matrix)) * len(matrix) + 1
+
+
+def _upper_triangular(rows, cols, data, size):
+    """Sums (row, col, value) terms into an upper-triangular CSR matrix."""
+    Q = sp.coo_matrix((data, (np.minimum(rows, cols), np.maximum(rows, cols))),
+                      shape=(size, size)).tocsr()
+    Q.sum_duplicates()
+    Q.eliminate_zeros()
+    return Q
+
+
+class TSPQuboComponents:
+    """Objective and constraint parts of the TSP QUBO, kept separate.
+
+    The full QUBO is objective + P·constraints with offset
+    P·constraint_offset, so a penalty_weight sweep only needs combine()
+    — a sparse linear combination — instead of a rebuild.
+
+    With fix_start=True city 0 is pinned to step 0 and only cities and
+    steps 1..N-1 remain: (N-1)² variables, x_{i,t} at index
+    (i-1)*(N-1) + (t-1). The legs from and back to city 0 become linear
+    terms on the first and last free step.
+    """
+
+    def __init__(self, objective, constraints, constraint_offset, num_cities, fix_start=False):
+        self.objective = objective
+        self.constraints = constraints
+        self.constraint_offset = constraint_offset
+        self.num_cities = num_cities
+        self.fix_start = fix_start
+
+    @property
+    def num_variables(self):
+        return self.objective.shape[0]
+
+    def combine(self, penalty_weight):
+        """Returns (Q, offset) for the given penalty weight."""
+        Q = (self.objective + penalty_weight * self.constraints).tocsr()
+        return Q, penalty_weight * self.constraint_offset
+
+
+def build_tsp_qubo_components(distance_matrix, fix_start=False):
+    """Builds the TSP QUBO objective and unit-penalty constraints as sparse matrices.
+
+    Variable x_{i,t} (city i at step t) sits at index v = i*M + t over the
+    M free cities/steps (M = N, or N-1 with fix_start, where city k+1 is
+    local index k). All index sets are generated with array arithmetic;
+    N = 100 (10^4 variables, ~2·10^6 nonzeros) builds in a fraction of a
+    second.
+    """
+    matrix = np.asarray(distance_matrix, dtype=float)
+    N = len(matrix)
+    first = 1 if fix_start else 0
+    M = N - first
+    var = np.arange(M * M).reshape(M, M)  # var[i, t] = i*M + t
+    a, b = np.triu_indices(M, k=1)
+
+    # Constraints: every city once and every step once, (1 - Σx)² per row and column.
+    # Expanded: -2 per variable (-1 from each), +2 per pair sharing a city or a step.
+    rows = np.concatenate([var.ravel(), var[:, a].ravel(), var[a, :].ravel()])
+    cols = np.concatenate([var.ravel(), var[:, b].ravel(), var[b, :].ravel()])
+    data = np.concatenate([np.full(M * M, -2.0), np.full(2 * M * len(a), 2.0)])
+    constraints = _upper_triangular(rows, cols, data, M * M)
+
+    # Objective: d_ij for city i at step t followed by city j at the next step.
+    # The cyclic tour wraps around from the last step; with fix_start the
+    # wrap-around goes through city 0 and is handled by the linear terms.
+    i, j = np.nonzero(~np.eye(M, dtype=bool))
+    t = np.arange(M) if not fix_start else np.arange(M - 1)
+    u = var[i[:, None], t[None, :]].ravel()
+    w = var[j[:, None], ((t + 1) % M)[None, :]].ravel()
+    dist = np.repeat(matrix[i + first, j + first], len(t))
+
+    if fix_start:
+        cities = np.arange(1, N)
+        u = np.concatenate([u, var[:, 0], var[:, M - 1]])
+        w = np.concatenate([w, var[:, 0], var[:, M - 1]])
+        dist = np.concatenate([dist, matrix[0, cities], matrix[cities, 0]])
+    objective = _upper_triangular(u, w, dist, M * M)
+
+    return TSPQuboComponents(objective, constraints, 2.0 * M, N, fix_start)
+
+
+def create_tsp_qubo_sparse(distance_matrix, penalty_weight=None, fix_start=False):
+    """Builds the TSP QUBO as an upper-triangular scipy.sparse CSR matrix.
+
+    Same Hamiltonian as create_tsp_qubo (or its reduced form with
+    fix_start, see TSPQuboComponents). Linear terms sit on the diagonal
+    and every quadratic term is stored once at (min(u, v), max(u, v)), so
+
+        energy(x) = x^T Q x + offset
+
+    Returns:
+        Q      (scipy.sparse.csr_matrix): upper-triangular QUBO
+        offset (float):                   constant term 2·M·penalty_weight
+    """
+    if penalty_weight is None:
+        penalty_weight = default_penalty_weight(distance_matrix)
+    return build_tsp_qubo_components(distance_matrix, fix_start=fix_start).combine(penalty_weight)
+
+
+def qubo_to_dict(Q, num_cities, fix_start=False):
+    """Sparse QUBO → legacy dict {((i1, t1), (i2, t2)): weight}.
+
+    Keys always use real city and step numbers, also for fix_start QUBOs.
+    """
+    coo = sp.coo_matrix(Q)
+    first = 1 if fix_start else 0
+    M = num_cities - first
+
+    def label(v):
+        return (int(v) // M + first, int(v) % M + first)
+
+    return {(label(r), label(c)): float(v) for r, c, v in zip(coo.row, coo.col, coo.data)}
+
+
+def save_qubo(path, Q, offset, num_cities, penalty_weight, **metadata):
+    """Saves a sparse QUBO and its metadata to a single .npz file."""
+    coo = sp.coo_matrix(Q)
+    np.savez_compressed(
+        path,
+        row=coo.row.astype(np.int32),
+        col=coo.col.astype(np.int32),
+        data=coo.data,
+        shape=np.array(coo.shape),
+        offset=offset,
+        num_cities=num_cities,
+        penalty_weight=penalty_weight,
+        **metadata,
+    )
+
+
+def load_qubo(path):
+    """Loads a QUBO written by save_qubo.
+
+    Returns:
+        Q        (scipy.sparse.csr_matrix)
+        offset   (float)
+        metadata (dict): num_cities, penalty_weight and any extra fields
+    """
+    with np.load(path) as f:
+        Q = sp.coo_matrix((f["data"], (f["row"], f["col"])), shape=tuple(f["shape"])).tocsr()
+        offset = float(f["offset"])
+        metadata = {key: f[key].item() for key in f.files
+                    if key not in ("row", "col", "data", "shape", "offset")}
+    return Q, offset, metadata
+
+
+def load_qubo_file(path):
+    """Loads a QUBO from .npz (save_qubo) or legacy string-keyed JSON.
+
+    Both give the same (Q, offset, metadata) as load_qubo; metadata always
+    has num_cities and fix_start.
+    """
+    if str(path).endswith(".npz"):
+        Q, offset, metadata = load_qubo(path)
+        metadata.setdefault("fix_start", False)
+        return Q, offset, metadata
+
+    with open(path, "r") as f:
+        data = json.load(f)
+
+    num_cities = data["num_cities"]
+    fix_start = bool(data.get("fix_start", False))
+    first = 1 if fix_start else 0
+    M = num_cities - first
+
+    # "i1,t1_i2,t2" → variable indices (i - first)*M + (t - first)
+    labels = np.array([key.replace("_", ",").split(",") for key in data["qubo"]], dtype=np.int64)
+    labels = labels.reshape(-1, 4) - first
+    rows = labels[:, 0] * M + labels[:, 1]
+    cols = labels[:, 2] * M + labels[:, 3]
+    weights = np.fromiter(data["qubo"].values(), dtype=np.float64, count=len(labels))
+
+    Q = _upper_triangular(rows, cols, weights, M * M)
+    return Q, float(data["offset"]), {"num_cities": num_cities, "fix_start": fix_start}
+
 
 def create_tsp_qubo(distance_matrix, penalty_weight=None):
     matrix = np.array(distance_matrix)
@@ -36,8 +220,14 @@ def create_tsp_qubo(distance_matrix, penalty_weight=None):
     offset = 2 * N * penalty_weight
     return Q, offset
 
-def process_files(input_files):
-    """Reads JSON files, converts them to QUBO, and saves them."""
+def process_files(input_files, formats=("npz",), fix_start=False):
+    """Reads JSON files, converts them to QUBO, and saves them.
+
+    formats: "npz" writes the sparse QUBO (tsp_nN_qubo.npz, see save_qubo);
+             "json" additionally writes the legacy string-keyed dict
+             (tsp_nN_qubo.json) read by qiskit_test.py.
+    fix_start: build the reduced (N-1)² QUBO; recorded in both outputs.
+    """
     for file_path in input_files:
         if not os.path.exists(file_path):
             print(f"ERROR: File not found -> {file_path}")
@@ -52,29 +242,39 @@ def process_files(input_files):
         
         print(f"Processing: {file_path} ({num_cities} Cities)")
 
-        # 2. Calculate the QUBO matrix and offset value
-        qubo, offset = create_tsp_qubo(distance_matrix)
-
-        # 3. Convert tuple keys to String (required for JSON format)
-        # Ex: ((0, 1), (1, 2)) -> "0,1_1,2"
-        stringified_qubo = {}
-        for (u, v), weight in qubo.items():
-            key_str = f"{u[0]},{u[1]}_{v[0]},{v[1]}"
-            stringified_qubo[key_str] = weight
-
-        # 4. Prepare the output data
-        output_data = {
-            "num_cities": num_cities,
-            "offset": offset,
-            "qubo": stringified_qubo
-        }
-
-        # 5. Save the new file (Ex: tsp_n5_qubo.json)
-        output_path = file_path.replace(".json", "_qubo.json")
-        with open(output_path, 'w') as f:
-            json.dump(output_data, f, indent=4)
-        
-        print(f"Successfully saved: {output_path}\n")
+        # 2. Build the sparse QUBO matrix and offset value
+        penalty_weight = default_penalty_weight(distance_matrix)
+        qubo, offset = create_tsp_qubo_sparse(distance_matrix, penalty_weight, fix_start=fix_start)
+
+        suffix = "_qubo_fixed" if fix_start else "_qubo"
+
+        if "npz" in formats:
+            output_path = file_path.replace(".json", f"{suffix}.npz")
+            save_qubo(output_path, qubo, offset, num_cities, penalty_weight, fix_start=fix_start)
+            print(f"Successfully saved: {output_path}")
+
+        if "json" in formats:
+            # Convert tuple keys to String (required for JSON format)
+            # Ex: ((0, 1), (1, 2)) -> "0,1_1,2"
+            stringified_qubo = {
+                f"{u[0]},{u[1]}_{v[0]},{v[1]}": weight
+                for (u, v), weight in qubo_to_dict(qubo, num_cities, fix_start).items()
+            }
+
+            output_data = {
+                "num_cities": num_cities,
+                "fix_start": fix_start,
+                "offset": offset,
+                "qubo": stringified_qubo
+            }
+
+            # Save the new file (Ex: tsp_n5_qubo.json, tsp_n5_qubo_fixed.json)
+            output_path = file_path.replace(".json", f"{suffix}.json")
+            with open(output_path, 'w') as f:
+                json.dump(output_data, f, indent=4)
+            print(f"Successfully saved: {output_path}")
+
+        print()
 
 # --- EXECUTION SECTION ---
 if __name__ == "__main__":
@@ -98,5 +298,8 @@ if __name__ == "__main__":
     # Join file names with the directory path
     files_to_process = [os.path.join(data_dir, file) for file in target_files]
     
-    # Start the process
-    process_files(files_to_process)
\ No newline at end of file
+    # Start the process (JSON is still written for qiskit_test.py)
+    process_files(files_to_process, formats=("npz", "json"))
+
+    # Reduced (N-1)² QUBOs for the statevector simulators
+    process_files(files_to_process, formats=("npz",), fix_start=True)
\ No newline at end of file
@@ -0,0 +1,166 @@
+import sys
+import numpy as np
+from pathlib import Path
+
+current_file = Path(__file__).resolve()
+project_root = current_file.parents[2]
+if str(project_root) not in sys.path:
+    sys.path.append(str(project_root))
+
+
+def unpack_bitstrings(samples, num_variables, bitorder="big"):
+    """Returns samples as a (B, num_variables) uint8 0/1 array.
+
+    samples is either already unpacked — bool or 0/1 of shape
+    (B, num_variables) — or packed uint8 of shape (B, ceil(n/8)) as made by
+    np.packbits(x, axis=1), with variable v at bit v.
+    """
+    samples = np.atleast_2d(np.asarray(samples))
+    if samples.shape[1] == num_variables and (samples.dtype == bool or samples.max(initial=0) <= 1):
+        return samples.astype(np.uint8, copy=False)
+    if samples.dtype != np.uint8:
+        raise ValueError(f"Expected packed uint8 samples, got {samples.dtype}")
+    return np.unpackbits(samples, axis=1, count=num_variables, bitorder=bitorder)
+
+
+def qubo_energies(Q, X, offset=0.0):
+    """Energies x^T Q x + offset for every row of X in one sparse product."""
+    X = np.asarray(X, dtype=np.float64)
+    QX = np.asarray(Q @ X.T)  # (n, B)
+    return np.einsum("bn,nb->b", X, QX) + offset
+
+
+def _grid_size(num_cities, fix_start):
+    return num_cities - 1 if fix_start else num_cities
+
+
+def feasible_mask(X, num_cities, fix_start=False):
+    """True where a sample is a permutation matrix (one city per step, one step per city)."""
+    M = _grid_size(num_cities, fix_start)
+    grid = np.asarray(X).reshape(-1, M, M)  # grid[b, i, t]
+    return (grid.sum(axis=1) == 1).all(axis=1) & (grid.sum(axis=2) == 1).all(axis=1)
+
+
+def decode_routes(X, num_cities, fix_start=False, mask=None):
+    """Decodes samples into (B, N) routes; rows that are not feasible are -1.
+
+    With fix_start, city 0 is prepended and local indices are shifted back
+    to real city numbers.
+    """
+    M = _grid_size(num_cities, fix_start)
+    grid = np.asarray(X).reshape(-1, M, M)
+    if mask is None:
+        mask = feasible_mask(grid, num_cities, fix_start)
+
+    routes = np.full((len(grid), num_cities), -1, dtype=np.int64)
+    steps = grid[mask].argmax(axis=1)  # city at each step
+    if fix_start:
+        routes[mask, 0] = 0
+        routes[mask, 1:] = steps + 1
+    else:
+        routes[mask] = steps
+    return routes
+
+
+def route_costs(routes, distance_matrix):
+    """Closed-tour lengths of (B, N) routes; rows containing -1 are NaN."""
+    matrix = np.asarray(distance_matrix, dtype=np.float64)
+    routes = np.asarray(routes)
+    valid = (routes >= 0).all(axis=1)
+    costs = np.full(len(routes), np.nan)
+    r = routes[valid]
+    costs[valid] = matrix[r, np.roll(r, -1, axis=1)].sum(axis=1)
+    return costs
+
+
+def parse_counts(counts, num_variables):
+    """Qiskit counts {bitstring: shots} → (X, shots).
+
+    Qiskit bitstrings are little-endian (qubit 0 is the rightmost
+    character), so columns are reversed to put variable v in column v.
+    Hex keys ("0x1f") and register separators (spaces) are accepted.
+    """
+    keys = []
+    for key in counts:
+        key = key.replace(" ", "")
+        if key.startswith("0x"):
+            key = format(int(key, 16), f"0{num_variables}b")
+        keys.append(key.zfill(num_variables))
+
+    shots = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+    chars = np.frombuffer("".join(keys).encode("ascii"), dtype=np.uint8)
+    X = (chars.reshape(len(keys), num_variables) - ord("0"))[:, ::-1]
+    return np.ascontiguousarray(X), shots
+
+
+def evaluate_samples(samples, Q, offset, distance_matrix, fix_start=False, shots=None):
+    """Scores a batch of sampled bitstrings against the QUBO and the real tour costs.
+
+    Args:
+        samples: packed uint8 or unpacked 0/1 samples (see unpack_bitstrings)
+        Q, offset: QUBO from create_tsp_qubo_sparse / load_qubo
+        distance_matrix: NxN matrix the QUBO was built from
+        fix_start: whether the QUBO is the reduced (N-1)² form
+        shots: optional per-sample counts used to weight feasible_fraction
+
+    Returns:
+        dict with per-sample energies, feasible, routes, costs and the best
+        feasible route / cost (None / inf when no sample is feasible).
+    """
+    num_cities = len(distance_matrix)
+    X = unpack_bitstrings(samples, Q.shape[0])
+    energies = qubo_energies(Q, X, offset)
+    feasible = feasible_mask(X, num_cities, fix_start)
+    routes = decode_routes(X, num_cities, fix_start, mask=feasible)
+    costs = route_costs(routes, distance_matrix)
+
+    if shots is None:
+        shots = np.ones(len(X), dtype=np.int64)
+
+    best_route, best_cost = None, float("inf")
+    if feasible.any():
+        best = int(np.nanargmin(costs))
+        best_route, best_cost = routes[best].tolist(), float(costs[best])
+
+    return {
+        "energies": energies,
+        "feasible": feasible,
+        "routes": routes,
+        "costs": costs,
+        "feasible_fraction": float(shots[feasible].sum() / max(shots.sum(), 1)),
+        "best_route": best_route,
+        "best_cost": best_cost,
+    }
+
+
+def evaluate_counts(counts, Q, offset, distance_matrix, fix_start=False):
+    """evaluate_samples on a Qiskit counts histogram."""
+    X, shots = parse_counts(counts, Q.shape[0])
+    result = evaluate_samples(X, Q, offset, distance_matrix, fix_start=fix_start, shots=shots)
+    result["shots"] = shots
+    return result
+
+
+if __name__ == "__main__":
+    import time
+    from src.quantum.qubo_converter import create_tsp_qubo_sparse
+
+    # Score a synthetic shot histogram: half valid tours, half random bitstrings
+    rng = np.random.default_rng(2026)
+    num_cities, num_samples = 7, 100_000
+    coords = rng.random((num_cities, 2)) * 100
+    distance_matrix = np.sqrt(((coords[:, None] - coords[None]) ** 2).sum(axis=2))
+    Q, offset = create_tsp_qubo_sparse(distance_matrix, fix_start=True)
+    M = num_cities - 1
+
+    perms = rng.permuted(np.tile(np.arange(M), (num_samples // 2, 1)), axis=1)
+    valid = np.zeros((num_samples // 2, M, M), dtype=np.uint8)
+    valid[np.arange(num_samples // 2)[:, None], perms, np.arange(M)] = 1
+    noise = rng.integers(0, 2, (num_samples // 2, M * M), dtype=np.uint8)
+    packed = np.packbits(np.vstack([valid.reshape(-1, M * M), noise]), axis=1)
+
+    start = time.time()
+    result = evaluate_samples(packed, Q, offset, distance_matrix, fix_start=True)
+    print(f"Scored {num_samples} samples in {time.time() - start:.3f}s")
+    print(f"Feasible fraction: {result['feasible_fraction']:.3f}")
+    print(f"Best route: {result['best_route']} | Cost: {result['best_cost']:.2f}")
@@ -0,0 +1,519 @@
+import json
+import sys
+import numpy as np
+import pytest
+from pathlib import Path
+
+current_file = Path(__file__).resolve()
+project_root = current_file.parents[1]
+if str(project_root) not in sys.path:
+    sys.path.append(str(project_root))
+
+from src.classical import or_tools_portfolio
+from src.classical.genetic_algo import GeneticAlgorithmTSP
+from src.classical.or_tools_portfolio import (DEFAULT_PORTFOLIO, ORToolsPortfolioSolver, config_name,
+                                              record_portfolio_win)
+from src.classical.or_tools_solver import ORToolsTSPSolver
+from src.classical.sim_annealing import SimulatedAnnealingTSP
+from src.common import benchmark_runner, utils
+from src.common.branch_and_bound_solver import BranchAndBoundSolver
+from src.common.brute_force_solver import BruteForceSolver
+from src.common.distance_oracle import DistanceOracle, EuclideanDistanceOracle
+from src.common.held_karp_solver import HeldKarpSolver
+from src.common.neighbor_lists import build_neighbor_lists
+from src.common.shared_instance import SharedInstanceStore, attach_instance
+from src.common.tsp_generator import TSPGenerator
+from src.common.tsplib import (TSPLIBDistanceOracle, read_tour, read_tsplib, tsplib_distance_matrix,
+                               write_tour, write_tsp)
+from src.common.utils import TSPInstance, load_tsp_data, load_tsp_instance
+
+
+def random_instance(n, seed):
+    coords = np.random.default_rng(seed).random((n, 2)) * 100
+    matrix = np.sqrt(((coords[:, None] - coords[None]) ** 2).sum(axis=2))
+    return TSPInstance(n, matrix, coords)
+
+
+def tour_cost(matrix, tour):
+    return float(sum(matrix[tour[k], tour[(k + 1) % len(tour)]] for k in range(len(tour))))
+
+
+def assert_permutations(routes, n):
+    routes = np.atleast_2d(routes)
+    assert routes.shape[1] == n
+    assert (np.sort(routes, axis=1) == np.arange(n)).all()
+
+
+# ── GA population ──────────────────────────────────────────────────────────
+
+def make_ga(n=30, seed=0, neighbors=None, mutation_rate=1.0, **kwargs):
+    return GeneticAlgorithmTSP(n, pop_size=64, mutation_rate=mutation_rate, seed=seed,
+                               neighbors=neighbors, instance=random_instance(n, seed), **kwargs)
+
+
+def test_evaluate_population_matches_tour_costs():
+    ga = make_ga(seed=0)
+    population = ga.create_population()
+    assert_permutations(population, ga.num_cities)
+    expected = [tour_cost(ga.distance_matrix, route) for route in population]
+    np.testing.assert_allclose(ga.evaluate_population(population), expected)
+
+
+def test_next_generation_keeps_elite_and_permutations():
+    ga = make_ga(seed=3, mutation_rate=0.3)
+    population = ga.create_population()
+    distances = ga.evaluate_population(population)
+    nxt = ga.next_generation(population, distances)
+    assert_permutations(nxt, ga.num_cities)
+    assert ga.evaluate_population(nxt).min() <= distances.min() + 1e-9
+
+
+# ── GA operators ───────────────────────────────────────────────────────────
+
+@pytest.mark.parametrize("seed", range(5))
+def test_ox_crossover_returns_permutations(seed):
+    ga = make_ga(seed=seed)
+    parents1, parents2 = ga.create_population(), ga.create_population()
+    children = ga.crossover(parents1, parents2)
+    assert_permutations(children, ga.num_cities)
+
+
+def test_ox_crossover_keeps_parent_segment_and_order():
+    ga = make_ga(n=12, seed=1)
+    parents1, parents2 = ga.create_population(), ga.create_population()
+    children = ga.crossover(parents1, parents2)
+    for child, p1, p2 in zip(children, parents1, parents2):
+        kept = child == p1
+        # Cities not kept from parent 1 appear in parent 2's relative order
+        rest = child[~kept]
+        order = [c for c in p2 if c in set(rest)]
+        assert rest.tolist() == order
+
+
+def test_swap_mutation_returns_permutations():
+    ga = make_ga(seed=2)
+    population = ga.create_population()
+    routes = ga.mutate(population.copy())
+    assert_permutations(routes, ga.num_cities)
+    # mutation_rate=1: every route swaps exactly two cities
+    assert ((routes != population).sum(axis=1) == 2).all()
+
+
+# ── Island-model GA ────────────────────────────────────────────────────────
+
+@pytest.mark.parametrize("topology", ["ring", "full"])
+def test_run_islands_same_result_in_process_and_pool(topology):
+    runs = []
+    for workers in (1, 2):
+        ga = make_ga(n=20, seed=7, mutation_rate=0.2, generations=30)
+        runs.append(ga.run_islands(num_islands=3, migration_interval=10, num_migrants=2,
+                                   topology=topology, workers=workers))
+
+    (tour1, cost1, _, history1), (tour2, cost2, _, history2) = runs
+    assert tour1 == tour2 and cost1 == cost2 and history1 == history2
+    assert len(history1) == 30 and history1[-1] == cost1
+    assert np.all(np.diff(history1) <= 0)
+    assert sorted(tour1[:-1]) == list(range(20)) and tour1[0] == tour1[-1]
+
+
+# ── SA 2-opt moves ─────────────────────────────────────────────────────────
+
+def make_sa(n=25, seed=4, neighbors=None, **kwargs):
+    return SimulatedAnnealingTSP(n, seed=seed, neighbors=neighbors,
+                                 instance=random_instance(n, seed), **kwargs)
+
+
+def check_two_opt_moves(sa, steps=500):
+    n = sa.num_cities
+    route = list(np.random.default_rng(sa.seed).permutation(n))
+    position = [0] * n
+    for p, city in enumerate(route):
+        position[city] = p
+
+    for _ in range(steps):
+        i, j = sa._two_opt_move(route, position)
+        before = sa.calculate_distance(route)
+        delta = sa._two_opt_delta(route, i, j)
+        sa._apply_two_opt(route, position, i, j)
+        assert sa.calculate_distance(route) == pytest.approx(before + delta)
+        assert sorted(route) == list(range(n))
+        assert all(route[position[c]] == c for c in range(n))
+
+
+def test_sa_two_opt_delta_matches_rescore():
+    check_two_opt_moves(make_sa())
+
+
+def test_sa_run_cost_matches_returned_tour():
+    sa = make_sa(alpha=0.95)
+    tour, cost, _, _ = sa.run()
+    assert sorted(tour[:-1]) == list(range(sa.num_cities)) and tour[0] == tour[-1]
+    assert cost == pytest.approx(tour_cost(sa.distance_matrix, tour[:-1]))
+
+
+# ── Parallel tempering ─────────────────────────────────────────────────────
+
+def test_parallel_tempering_cost_matches_returned_tour():
+    sa = make_sa(n=30, seed=5)
+    tour, cost, _, history = sa.run_parallel_tempering(num_replicas=4, min_temp=0.5,
+                                                       num_steps=2000, swap_interval=50)
+    assert sorted(tour[:-1]) == list(range(30)) and tour[0] == tour[-1]
+    assert cost == pytest.approx(tour_cost(sa.distance_matrix, tour[:-1]), rel=1e-12)
+    # The incrementally tracked best cost agrees with the re-scored tour
+    assert history[-1] == pytest.approx(cost, rel=1e-9)
+    assert np.all(np.diff(history) <= 0)
+
+    stats = sa.replica_stats
+    assert len(stats["temperatures"]) == 4 and len(stats["swap_acceptance_rates"]) == 3
+    assert all(0.0 <= rate <= 1.0 for rate in stats["acceptance_rates"])
+
+
+# ── Candidate neighbour lists ──────────────────────────────────────────────
+
+def test_neighbor_lists_match_sorted_distances():
+    instance = random_instance(40, 6)
+    neighbors = build_neighbor_lists(instance.coordinates, k=5)
+    assert neighbors.shape == (40, 5)
+
+    matrix = instance.distance_matrix.copy()
+    np.fill_diagonal(matrix, np.inf)
+    np.testing.assert_array_equal(neighbors, np.argsort(matrix, axis=1, kind="stable")[:, :5])
+
+
+def test_neighbor_mutation_creates_candidate_edges():
+    instance = random_instance(30, 2)
+    neighbors = build_neighbor_lists(instance.coordinates, k=5)
+    ga = make_ga(seed=2, neighbors=neighbors)
+    population = ga.create_population()
+    routes = ga.mutate(population.copy())
+    assert_permutations(routes, ga.num_cities)
+
+    # The candidate c lands right after its city a: one of the changed slots
+    # (or both, when c already followed a) holds a neighbour of its predecessor
+    candidate = np.zeros((30, 30), dtype=bool)
+    np.put_along_axis(candidate, neighbors, True, axis=1)
+    for route, original in zip(routes, population):
+        changed = np.flatnonzero(route != original)
+        assert len(changed) in (0, 2)
+        if len(changed):
+            assert candidate[route[changed - 1], route[changed]].any()
+
+
+def test_neighbor_two_opt_moves_keep_permutation():
+    instance = random_instance(25, 4)
+    check_two_opt_moves(make_sa(neighbors=build_neighbor_lists(instance.coordinates, k=5)))
+
+
+# ── Held-Karp ──────────────────────────────────────────────────────────────
+
+@pytest.mark.parametrize("n, seed", [(4, 0), (5, 1), (6, 2), (7, 3), (8, 4), (8, 5)])
+def test_held_karp_matches_brute_force(n, seed):
+    matrix = random_instance(n, seed).distance_matrix
+    _, optimum = BruteForceSolver(matrix).solve()
+
+    path, cost = HeldKarpSolver(matrix).solve()
+    assert cost == pytest.approx(optimum, rel=1e-9)
+    assert sorted(path[:-1]) == list(range(n)) and path[0] == path[-1] == 0
+    assert tour_cost(matrix, path[:-1]) == pytest.approx(cost)
+
+
+# ── Branch and bound ───────────────────────────────────────────────────────
+
+@pytest.mark.parametrize("n, seed", [(4, 0), (5, 1), (6, 2), (7, 3), (8, 4), (8, 5)])
+def test_branch_and_bound_matches_brute_force(n, seed):
+    matrix = random_instance(n, seed).distance_matrix
+    _, optimum = BruteForceSolver(matrix).solve()
+
+    result = BranchAndBoundSolver(matrix, workers=1).solve()
+    assert result["proven_optimal"]
+    assert result["best_cost"] == pytest.approx(optimum, rel=1e-9)
+    assert sorted(result["best_tour"][:-1]) == list(range(n))
+    assert tour_cost(matrix, result["best_tour"][:-1]) == pytest.approx(result["best_cost"])
+
+
+# ── OR-Tools ───────────────────────────────────────────────────────────────
+
+def test_ortools_transit_matrix_matches_callback():
+    matrix = random_instance(30, 8).distance_matrix
+    by_callback = ORToolsTSPSolver(matrix, scale=1000).solve()
+    by_matrix = ORToolsTSPSolver(matrix, use_transit_matrix=True, scale=1000).solve()
+    assert by_matrix["best_tour"] == by_callback["best_tour"]
+    assert by_matrix["best_cost"] == pytest.approx(by_callback["best_cost"])
+
+
+@pytest.mark.parametrize("scale", [1, 1000])
+def test_ortools_history_ends_at_returned_cost(scale):
+    matrix = random_instance(30, 9).distance_matrix
+    solver = ORToolsTSPSolver(matrix, use_transit_matrix=True, scale=scale,
+                              metaheuristic="GUIDED_LOCAL_SEARCH", solution_limit=200)
+    result = solver.solve()
+    history = result["convergence_history"]
+
+    assert result["best_cost"] == pytest.approx(tour_cost(matrix, result["best_tour"][:-1]))
+    # Float costs of the best-so-far solutions, so the curve ends at the returned cost
+    assert history[-1] == pytest.approx(result["best_cost"], rel=1e-12)
+    # Steps are non-increasing up to the rounding of the integer objective
+    assert np.all(np.diff(history) <= 30 * 0.5 / scale)
+    # The callback is registered once: a second solve reports the same curve
+    assert solver.solve()["convergence_history"] == history
+
+
+# ── OR-Tools portfolio ─────────────────────────────────────────────────────
+
+def test_portfolio_credits_every_tied_config(tmp_path, monkeypatch):
+    matrix = random_instance(6, 10).distance_matrix
+    _, optimum = BruteForceSolver(matrix).solve()
+    solver = ORToolsPortfolioSolver(matrix, configs=DEFAULT_PORTFOLIO[:3],
+                                    time_limit_sec=0.3, workers=1)
+    result = solver.solve()
+
+    # Every configuration reaches the optimum of a 6-city instance
+    names = [config_name(config) for config in DEFAULT_PORTFOLIO[:3]]
+    assert result["best_cost"] == pytest.approx(optimum)
+    assert result["tied_configs"] == names
+    assert result["winning_config"] == names[0]
+
+    monkeypatch.setattr(or_tools_portfolio, "_wins_path", lambda: tmp_path / "wins.json")
+    record_portfolio_win(6, result["tied_configs"])
+    record_portfolio_win(6, names[1:2])
+    wins = json.loads((tmp_path / "wins.json").read_text())
+    assert wins == {"6": {names[0]: 1, names[1]: 2, names[2]: 1}}
+
+
+# ── Benchmark checkpoints ──────────────────────────────────────────────────
+
+@pytest.fixture
+def sweep(tmp_path, monkeypatch):
+    """run_benchmark_sweep on a 10-city instance in tmp_path, with a fake solver
+    that records the seeds it runs (and fails on seeds listed in `failing`)."""
+    instances = {10: random_instance(10, 11)}
+    calls, failing = [], set()
+
+    def fake_run(algorithm_name, n, seed, neighbors=None, instance=None):
+        if seed in failing:
+            raise ValueError("solver crashed")
+        calls.append(seed)
+        return float(seed), 0.5
+
+    monkeypatch.setattr(benchmark_runner, "get_results_dir", lambda algorithm: tmp_path)
+    monkeypatch.setattr(benchmark_runner, "load_tsp_instance", lambda n: instances[n])
+    monkeypatch.setattr(benchmark_runner, "run_single_test", fake_run)
+
+    def run(**kwargs):
+        calls.clear()
+        return benchmark_runner.run_benchmark_sweep(["sa"], [10], runs=4, workers=1, **kwargs)
+
+    run.calls, run.failing, run.instances = calls, failing, instances
+    run.checkpoint = tmp_path / "tsp_n10_benchmark_30runs.checkpoint.jsonl"
+    return run
+
+
+def test_checkpoint_resume_skips_finished_seeds(sweep):
+    summary = sweep()[("sa", 10)]
+    assert sweep.calls == [2000, 2001, 2002, 2003]
+    assert summary["stats"]["mean_cost"] == pytest.approx(2001.5)
+
+    # Simulate a crash after two runs: header + two rows + a torn line
+    lines = sweep.checkpoint.read_text().splitlines()
+    sweep.checkpoint.write_text("\n".join(lines[:3]) + '\n{"run": 3, "se')
+    summary = sweep()[("sa", 10)]
+    assert sweep.calls == [2002, 2003]
+    assert [r["seed"] for r in summary["raw_results"]] == [2000, 2001, 2002, 2003]
+
+    sweep()
+    assert sweep.calls == []
+
+
+def test_checkpoint_is_discarded_when_parameters_or_instance_change(sweep):
+    sweep()
+    sweep(neighbor_k=5)
+    assert sweep.calls == [2000, 2001, 2002, 2003]
+    sweep(neighbor_k=5)
+    assert sweep.calls == []
+
+    sweep.instances[10] = random_instance(10, 12)
+    sweep(neighbor_k=5)
+    assert sweep.calls == [2000, 2001, 2002, 2003]
+
+
+def test_failed_runs_raise_after_the_rest_are_checkpointed(sweep):
+    sweep.failing.add(2001)
+    with pytest.raises(RuntimeError, match="seed=2001") as error:
+        sweep()
+    assert isinstance(error.value.__cause__, ValueError)
+    assert sweep.calls == [2000, 2002, 2003]
+
+    sweep.failing.clear()
+    assert sweep()[("sa", 10)]["total_runs"] == 4
+    assert sweep.calls == [2001]
+
+
+# ── Shared instances ───────────────────────────────────────────────────────
+
+def test_shared_instance_maps_the_published_arrays():
+    instance = random_instance(15, 13)
+    instance.optimal_cost = 123.0
+    with SharedInstanceStore() as store:
+        attached = attach_instance(store.publish(instance))
+        assert isinstance(attached.distance_matrix, np.memmap)
+        assert isinstance(attached.coordinates, np.memmap)
+        np.testing.assert_array_equal(attached.distance_matrix, instance.distance_matrix)
+        np.testing.assert_array_equal(attached.coordinates, instance.coordinates)
+        assert (attached.name, attached.num_cities, attached.optimal_cost) == ("tsp_n15", 15, 123.0)
+
+
+def test_ortools_run_on_coordinate_only_shared_instance():
+    dense = random_instance(15, 14)
+    coordinate_only = TSPInstance(15, None, dense.coordinates)
+    expected, _ = benchmark_runner.run_single_test("ortools", 15, 2000, instance=dense)
+
+    with SharedInstanceStore() as store:
+        attached = attach_instance(store.publish(coordinate_only))
+        assert attached.distance_matrix is None
+        best_cost, _ = benchmark_runner.run_single_test("ortools", 15, 2000, instance=attached)
+    assert best_cost == pytest.approx(expected)
+
+
+# ── Binary instance format ─────────────────────────────────────────────────
+
+@pytest.fixture
+def raw_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(utils, "get_raw_dir", lambda: tmp_path)
+    monkeypatch.setattr(utils, "get_ground_truth_dir", lambda: tmp_path)
+    return tmp_path
+
+
+def test_binary_instance_round_trip(raw_dir):
+    generator = TSPGenerator(40, seed=3)
+    generator.calculate_distance_matrix()
+    generator.save_to_binary(output_dir=raw_dir)
+
+    instance = load_tsp_instance(40)
+    assert isinstance(instance.distance_matrix, np.memmap)
+    assert instance.distance_matrix.dtype == np.float64
+    np.testing.assert_array_equal(instance.distance_matrix, generator.distance_matrix)
+    np.testing.assert_array_equal(instance.coordinates, generator.coordinates)
+
+    tour = np.random.default_rng(0).permutation(40)
+    assert instance.distance_oracle.tour_cost(tour) == pytest.approx(tour_cost(generator.distance_matrix, tour),
+                                                                     rel=1e-12)
+
+
+def test_coordinate_only_binary_instance_caches_its_matrix(raw_dir):
+    generator = TSPGenerator(40, seed=4)
+    generator.calculate_distance_matrix()
+    generator.save_to_binary(store_matrix=False, output_dir=raw_dir)
+    cache_path = raw_dir / "tsp_n40_distance_matrix.cache.npy"
+
+    lazy = load_tsp_instance(40, dense=False)
+    assert lazy.distance_matrix is None and not cache_path.exists()
+    tour = np.random.default_rng(1).permutation(40)
+    assert lazy.distance_oracle.tour_cost(tour) == pytest.approx(tour_cost(generator.distance_matrix, tour))
+
+    matrix, coordinates, _ = load_tsp_data(40)
+    assert cache_path.exists() and isinstance(matrix, np.memmap)
+    np.testing.assert_array_equal(matrix, generator.distance_matrix)
+
+    # Later loads map the cached file instead of rebuilding it
+    built = cache_path.stat().st_mtime_ns
+    np.testing.assert_array_equal(load_tsp_instance(40).distance_matrix, generator.distance_matrix)
+    assert cache_path.stat().st_mtime_ns == built
+
+
+# ── Distance oracles ───────────────────────────────────────────────────────
+
+def test_euclidean_oracle_matches_dense_matrix():
+    instance = random_instance(30, 15)
+    oracle = EuclideanDistanceOracle(instance.coordinates)
+    rng = np.random.default_rng(15)
+    a, b = rng.integers(0, 30, (2, 8, 5))
+
+    np.testing.assert_allclose(oracle.edges(a, b), instance.distance_matrix[a, b])
+    assert oracle.pair(3, 7) == pytest.approx(instance.distance_matrix[3, 7])
+    np.testing.assert_allclose(oracle.dense_matrix(block_size=7), instance.distance_matrix)
+    tour = rng.permutation(30)
+    assert oracle.tour_cost(tour) == pytest.approx(tour_cost(instance.distance_matrix, tour))
+
+
+def test_oracle_without_pair_cannot_be_created():
+    class EdgesOnly(DistanceOracle):
+        def edges(self, a, b):
+            return np.zeros(np.broadcast(a, b).shape)
+
+    with pytest.raises(TypeError, match="pair"):
+        EdgesOnly()
+
+
+def test_shared_instance_keeps_tsplib_oracle():
+    coords = np.random.default_rng(7).integers(0, 1000, (20, 2)).astype(float)
+    instance = TSPInstance(20, None, coords, name="att20",
+                           distance_oracle=TSPLIBDistanceOracle(coords, "ATT"))
+    tour = np.random.default_rng(8).permutation(20)
+
+    with SharedInstanceStore() as store:
+        attached = attach_instance(store.publish(instance))
+        assert isinstance(attached.distance_oracle, TSPLIBDistanceOracle)
+        assert attached.distance_oracle.edge_weight_type == "ATT"
+        np.testing.assert_array_equal(attached.distance_oracle.dense_matrix(),
+                                      tsplib_distance_matrix(coords, "ATT"))
+        assert attached.distance_oracle.tour_cost(tour) == instance.distance_oracle.tour_cost(tour)
+
+
+# ── Instance generator ─────────────────────────────────────────────────────
+
+@pytest.mark.parametrize("distribution", TSPGenerator.DISTRIBUTIONS)
+def test_generator_is_reproducible(distribution):
+    np.random.seed(0)
+    global_state = np.random.get_state()[1].copy()
+
+    first = TSPGenerator(200, seed=11, distribution=distribution).generate_data()
+    again = TSPGenerator(200, seed=11, distribution=distribution).generate_data()
+    other = TSPGenerator(200, seed=12, distribution=distribution).generate_data()
+
+    np.testing.assert_array_equal(first, again)
+    assert not np.array_equal(first, other)
+    assert first.shape == (200, 2) and first.min() >= 0 and first.max() <= 100
+    # Generators are local: the global NumPy stream is left alone
+    np.testing.assert_array_equal(np.random.get_state()[1], global_state)
+
+
+@pytest.mark.parametrize("n", [5, 6, 7])
+def test_uniform_generator_reproduces_stored_instances(n):
+    with open(project_root / "data" / "raw" / f"tsp_n{n}.json") as f:
+        stored = json.load(f)
+    generator = TSPGenerator(n)
+    generator.calculate_distance_matrix()
+    np.testing.assert_array_equal(generator.coordinates, stored["coordinates"])
+    np.testing.assert_allclose(generator.distance_matrix, stored["distance_matrix"], rtol=1e-12)
+
+
+# ── TSPLIB round trip ──────────────────────────────────────────────────────
+
+def test_tsplib_coordinates_round_trip(tmp_path):
+    coords = np.random.default_rng(5).integers(0, 1000, (8, 2)).astype(float)
+    matrix = tsplib_distance_matrix(coords, "EUC_2D")
+    optimal_path, optimum = HeldKarpSolver(matrix).solve()
+
+    write_tsp(tmp_path / "rt8.tsp", "rt8", coordinates=coords)
+    write_tour(tmp_path / "rt8.opt.tour", optimal_path, "rt8.opt.tour")
+
+    problem = read_tsplib(tmp_path / "rt8.tsp")
+    assert problem.dimension == 8 and problem.edge_weight_type == "EUC_2D"
+    np.testing.assert_array_equal(problem.coordinates, coords)
+    np.testing.assert_array_equal(problem.dense_distance_matrix(), matrix)
+
+    tour = read_tour(tmp_path / "rt8.opt.tour")
+    assert tour.tolist() == optimal_path[:-1]
+    assert problem.distance_oracle().tour_cost(tour) == pytest.approx(optimum)
+    assert HeldKarpSolver(problem.dense_distance_matrix()).solve()[1] == pytest.approx(optimum)
+
+
+def test_tsplib_explicit_matrix_round_trip(tmp_path):
+    matrix = random_instance(7, 6).distance_matrix
+    _, optimum = BruteForceSolver(matrix).solve()
+
+    write_tsp(tmp_path / "ex7.tsp", "ex7", distance_matrix=matrix)
+    problem = read_tsplib(tmp_path / "ex7.tsp")
+    assert problem.edge_weight_type == "EXPLICIT"
+    np.testing.assert_array_equal(problem.dense_distance_matrix(), matrix)
+    assert HeldKarpSolver(problem.dense_distance_matrix()).solve()[1] == pytest.approx(optimum)
@@ -0,0 +1,393 @@
+import itertools
+import math
+import sys
+import numpy as np
+import pytest
+from pathlib import Path
+from scipy import sparse
+from scipy.linalg import expm
+
+current_file = Path(__file__).resolve()
+project_root = current_file.parents[1]
+if str(project_root) not in sys.path:
+    sys.path.append(str(project_root))
+
+from src.quantum.hybrid_ga_qaoa import BatchedQAOAEvaluator
+from src.quantum.qaoa_cache import QAOAEvaluationCache
+from src.quantum.qaoa_params import QAOAParameterStore, extend_params, interpolate_params, qubo_energy_std
+from src.quantum.qaoa_standard import (PermutationQAOA, QAOASimulator, StatevectorQAOA, apply_swap_mixer,
+                                       apply_x_mixer, lexicographic_permutations, permutation_ranks,
+                                       qubo_cost_diagonal, ring_swap_indices)
+from src.quantum.qubo_converter import create_tsp_qubo, create_tsp_qubo_sparse
+from src.quantum.qubo_evaluator import evaluate_counts, parse_counts
+
+
+def random_distance_matrix(n, seed):
+    coords = np.random.default_rng(seed).random((n, 2)) * 100
+    return np.sqrt(((coords[:, None] - coords[None]) ** 2).sum(axis=2))
+
+
+def legacy_energy(Q_dict, offset, x_grid):
+    """Energy of a full N x N assignment grid under the legacy dict QUBO."""
+    return sum(w * x_grid[u] * x_grid[v] for (u, v), w in Q_dict.items()) + offset
+
+
+def tour_grid(route):
+    grid = np.zeros((len(route), len(route)), dtype=np.uint8)
+    grid[route, np.arange(len(route))] = 1  # grid[city, step]
+    return grid
+
+
+# ── Sparse QUBO ────────────────────────────────────────────────────────────
+
+@pytest.mark.parametrize("n", [3, 4, 5])
+def test_sparse_qubo_matches_legacy_energies(n):
+    matrix = random_distance_matrix(n, seed=n)
+    Q_dict, offset_dict = create_tsp_qubo(matrix)
+    Q, offset = create_tsp_qubo_sparse(matrix)
+    assert offset == pytest.approx(offset_dict)
+
+    rng = np.random.default_rng(0)
+    grids = [rng.integers(0, 2, (n, n)) for _ in range(50)]
+    grids += [tour_grid(rng.permutation(n)) for _ in range(10)]
+    for grid in grids:
+        x = grid.ravel().astype(float)
+        assert x @ (Q @ x) + offset == pytest.approx(legacy_energy(Q_dict, offset_dict, grid))
+
+
+# ── Fixed-start QUBO ───────────────────────────────────────────────────────
+
+@pytest.mark.parametrize("n", [3, 4, 5])
+def test_fixed_start_qubo_matches_legacy_energies(n):
+    """Reduced QUBO energy == full legacy energy with city 0 pinned to step 0."""
+    matrix = random_distance_matrix(n, seed=10 + n)
+    Q_dict, offset_dict = create_tsp_qubo(matrix)
+    Q, offset = create_tsp_qubo_sparse(matrix, fix_start=True)
+    assert Q.shape == ((n - 1) ** 2, (n - 1) ** 2)
+
+    rng = np.random.default_rng(1)
+    reduced = [rng.integers(0, 2, (n - 1, n - 1)) for _ in range(50)]
+    reduced += [tour_grid(rng.permutation(n - 1)) for _ in range(10)]
+    for block in reduced:
+        grid = np.zeros((n, n), dtype=np.int64)
+        grid[0, 0] = 1
+        grid[1:, 1:] = block
+        x = block.ravel().astype(float)
+        assert x @ (Q @ x) + offset == pytest.approx(legacy_energy(Q_dict, offset_dict, grid))
+
+
+def test_feasible_tour_energy_is_tour_length():
+    matrix = random_distance_matrix(5, seed=3)
+    Q, offset = create_tsp_qubo_sparse(matrix, fix_start=True)
+    route = [0, 3, 1, 4, 2]
+    x = tour_grid(np.array(route[1:]) - 1).ravel().astype(float)
+    length = sum(matrix[route[k], route[(k + 1) % 5]] for k in range(5))
+    assert x @ (Q @ x) + offset == pytest.approx(length)
+
+
+# ── Sample decoding ────────────────────────────────────────────────────────
+
+def test_parse_counts_little_endian():
+    # Variable 0 is the rightmost character of a Qiskit bitstring
+    X, shots = parse_counts({"001": 5, "0x6": 2}, 3)
+    assert X.tolist() == [[1, 0, 0], [0, 1, 1]]
+    assert shots.tolist() == [5, 2]
+
+
+@pytest.mark.parametrize("fix_start", [False, True])
+def test_evaluate_counts_decodes_known_tour(fix_start):
+    n = 5
+    matrix = random_distance_matrix(n, seed=7)
+    Q, offset = create_tsp_qubo_sparse(matrix, fix_start=fix_start)
+    route = [0, 2, 4, 1, 3]
+
+    grid = tour_grid(np.array(route[1:]) - 1) if fix_start else tour_grid(np.array(route))
+    bits = grid.ravel()
+    tour_key = "".join(str(b) for b in bits[::-1])   # little-endian string
+    broken_key = "1" * len(bits)
+
+    result = evaluate_counts({tour_key: 30, broken_key: 10}, Q, offset, matrix, fix_start=fix_start)
+    length = sum(matrix[route[k], route[(k + 1) % n]] for k in range(n))
+
+    assert result["best_route"] == route
+    assert result["best_cost"] == pytest.approx(length)
+    assert result["feasible"].tolist() == [True, False]
+    assert result["feasible_fraction"] == pytest.approx(0.75)
+    assert result["energies"][0] == pytest.approx(length)
+
+
+# ── Statevector kernels ────────────────────────────────────────────────────
+
+PAULI_X = np.array([[0, 1], [1, 0]])
+
+
+def x_mixer_unitary(beta, num_qubits):
+    """Dense exp(-iβ·Σ_q X_q); qubit q is bit q of the basis index."""
+    mixer = np.zeros((1 << num_qubits, 1 << num_qubits))
+    for q in range(num_qubits):
+        mixer += np.kron(np.kron(np.eye(1 << (num_qubits - q - 1)), PAULI_X), np.eye(1 << q))
+    return expm(-1j * beta * mixer)
+
+
+def random_state(dim, seed, batch_shape=()):
+    rng = np.random.default_rng(seed)
+    state = rng.normal(size=(dim,) + batch_shape) + 1j * rng.normal(size=(dim,) + batch_shape)
+    return (state / np.linalg.norm(state, axis=0)).astype(np.complex64)
+
+
+def test_cost_diagonal_matches_brute_force_energies():
+    n = 6
+    Q = sparse.random(n, n, density=0.6, random_state=20, format="csr") * 10 - sparse.eye(n)
+    diagonal = qubo_cost_diagonal(Q, offset=2.5)
+
+    dense = Q.toarray()
+    for k in range(1 << n):
+        x = (k >> np.arange(n)) & 1
+        assert diagonal[k] == pytest.approx(x @ dense @ x + 2.5)
+
+
+@pytest.mark.parametrize("num_qubits, block_qubits", [(5, 2), (5, 4), (3, 4)])
+def test_x_mixer_matches_expm(num_qubits, block_qubits):
+    state = random_state(1 << num_qubits, seed=21)
+    expected = x_mixer_unitary(0.37, num_qubits) @ state
+    apply_x_mixer(state, 0.37, num_qubits, block_qubits=block_qubits, chunk_size=8)
+    np.testing.assert_allclose(state, expected, atol=1e-5)
+
+
+def test_batched_x_mixer_uses_per_state_angles():
+    betas = np.array([0.1, 0.8, -0.4])
+    states = random_state(16, seed=22, batch_shape=(3,))
+    expected = np.stack([x_mixer_unitary(b, 4) @ states[:, k] for k, b in enumerate(betas)], axis=1)
+    apply_x_mixer(states, betas, 4)
+    np.testing.assert_allclose(states, expected, atol=1e-5)
+
+
+def test_statevector_expectation_matches_dense_circuit():
+    Q, offset = create_tsp_qubo_sparse(random_distance_matrix(3, seed=23), fix_start=True)
+    simulator = StatevectorQAOA(Q, offset, reps=2)
+    n, scale = Q.shape[0], simulator.energy_scale()
+    betas, gammas = [0.6, 0.2], [0.3 / scale, 0.9 / scale]
+
+    cost = qubo_cost_diagonal(Q, offset)
+    state = np.full(1 << n, 1 / np.sqrt(1 << n), dtype=complex)
+    for beta, gamma in zip(betas, gammas):
+        state = x_mixer_unitary(beta, n) @ (np.exp(-1j * gamma * cost) * state)
+    expected = float(np.real(np.vdot(state, cost * state)))
+
+    value = simulator.compute_expectation(np.array(betas + gammas))
+    assert value == pytest.approx(expected, rel=1e-4)
+
+
+def test_simulator_without_mixer_backward_cannot_be_created():
+    class ForwardOnly(QAOASimulator):
+        def apply_mixer(self, state, beta):
+            return state
+
+    with pytest.raises(TypeError, match="mixer_backward"):
+        ForwardOnly(np.zeros(4))
+
+
+# ── Permutation-subspace QAOA ──────────────────────────────────────────────
+
+@pytest.mark.parametrize("m", [1, 3, 5])
+def test_lexicographic_permutations_and_ranks(m):
+    perms = lexicographic_permutations(m)
+    assert perms.tolist() == [list(p) for p in itertools.permutations(range(m))]
+    np.testing.assert_array_equal(permutation_ranks(perms), np.arange(len(perms)))
+
+
+@pytest.mark.parametrize("m", [2, 3, 4])
+def test_swap_mixer_matches_expm(m):
+    swap_indices = ring_swap_indices(lexicographic_permutations(m))
+    dim = math.factorial(m)
+
+    unitary = np.eye(dim)
+    for index in swap_indices:
+        swap = np.zeros((dim, dim))
+        swap[np.arange(dim), index] = 1  # (T_e ψ)[k] = ψ[index[k]]
+        np.testing.assert_array_equal(swap @ swap, np.eye(dim))
+        unitary = expm(-1j * 0.45 * swap) @ unitary
+
+    state = random_state(dim, seed=m)
+    expected = unitary @ state
+    apply_swap_mixer(state, 0.45, swap_indices)
+    np.testing.assert_allclose(state, expected, atol=1e-5)
+
+
+@pytest.mark.parametrize("fix_start", [True, False])
+def test_permutation_costs_are_tour_lengths(fix_start):
+    matrix = random_distance_matrix(5, seed=24)
+    simulator = PermutationQAOA(matrix, fix_start=fix_start)
+    assert simulator.dim == (24 if fix_start else 120)
+    for route, cost in zip(simulator.routes, simulator.cost_diagonal):
+        assert sorted(route) == list(range(5))
+        assert cost == pytest.approx(sum(matrix[route[k], route[(k + 1) % 5]] for k in range(5)))
+
+    # The mixer never leaves the subspace: the state stays normalized
+    state = simulator.statevector(simulator.default_params())
+    assert np.linalg.norm(state) == pytest.approx(1.0, abs=1e-5)
+
+
+# ── Adjoint gradients ──────────────────────────────────────────────────────
+
+def finite_difference(f, x, steps):
+    grad = np.zeros_like(x)
+    for k in range(len(x)):
+        step = np.zeros_like(x)
+        step[k] = steps[k]
+        grad[k] = (f(x + step) - f(x - step)) / (2 * steps[k])
+    return grad
+
+
+def assert_gradient_matches(simulator, params, rtol):
+    value, gradient = simulator.expectation_and_gradient(params)
+    assert value == pytest.approx(float(simulator.expectation(params)), rel=1e-5)
+
+    # Central differences on the float32 state: β steps in radians, γ steps
+    # relative to the energy scale the γ angles live on
+    reps = simulator.reps
+    steps = np.concatenate([np.full(reps, 1e-3), np.full(reps, 1e-3 / simulator.energy_scale())])
+    numeric = finite_difference(lambda p: float(simulator.expectation(p)), params, steps)
+    assert np.linalg.norm(gradient - numeric) <= rtol * np.linalg.norm(numeric)
+
+
+def test_statevector_gradient_matches_finite_differences():
+    matrix = random_distance_matrix(4, seed=5)
+    Q, offset = create_tsp_qubo_sparse(matrix, penalty_weight=50.0, fix_start=True)
+    simulator = StatevectorQAOA(Q, offset, reps=2)
+    params = np.array([0.4, 0.2, 0.3 / simulator.energy_scale(), 0.7 / simulator.energy_scale()])
+    assert_gradient_matches(simulator, params, rtol=1e-3)
+
+
+def test_permutation_gradient_matches_finite_differences():
+    simulator = PermutationQAOA(random_distance_matrix(6, seed=6), reps=3)
+    params = np.concatenate([[0.5, 0.3, 0.1], np.array([0.2, 0.5, 0.8]) / simulator.energy_scale()])
+    assert_gradient_matches(simulator, params, rtol=1e-3)
+
+
+# ── Batched population evaluation ──────────────────────────────────────────
+
+def make_simulators():
+    Q, offset = create_tsp_qubo_sparse(random_distance_matrix(4, seed=25), fix_start=True)
+    return [StatevectorQAOA(Q, offset, reps=2), PermutationQAOA(random_distance_matrix(6, seed=26), reps=2)]
+
+
+def random_population(simulator, size, seed):
+    rng = np.random.default_rng(seed)
+    betas = rng.uniform(-np.pi, np.pi, (size, simulator.reps))
+    gammas = rng.uniform(-2, 2, (size, simulator.reps)) / simulator.energy_scale()
+    return np.hstack([betas, gammas])
+
+
+@pytest.mark.parametrize("simulator", make_simulators(), ids=["statevector", "permutation"])
+@pytest.mark.parametrize("block_entries, workers", [(1, 1), (1 << 12, 1), (1 << 12, 2)])
+def test_batched_evaluator_matches_single_state(simulator, block_entries, workers):
+    population = random_population(simulator, 7, seed=27)
+    expected = [float(simulator.compute_expectation(params)) for params in population]
+
+    with BatchedQAOAEvaluator(simulator, block_entries=block_entries, workers=workers) as evaluator:
+        values = evaluator.evaluate(population)
+    np.testing.assert_allclose(values, expected, rtol=1e-4)
+    assert evaluator.num_evaluations == 7
+
+
+def test_batched_evaluator_only_simulates_cache_misses():
+    simulator = make_simulators()[1]
+    simulator.cache = QAOAEvaluationCache()
+    population = random_population(simulator, 6, seed=28)
+
+    evaluator = BatchedQAOAEvaluator(simulator, block_entries=1 << 12)
+    first = evaluator.evaluate(population)
+    again = evaluator.evaluate(np.vstack([population[:3], random_population(simulator, 2, seed=29)]))
+    assert evaluator.num_evaluations == 8
+    np.testing.assert_array_equal(again[:3], first[:3])
+
+
+# ── Evaluation cache ───────────────────────────────────────────────────────
+
+def test_cache_evicts_least_recently_used_and_counts_hits():
+    cache = QAOAEvaluationCache(max_entries=2, tolerance=1e-6)
+    cache.put("inst", [0.1, 0.2], 1.0)
+    cache.put("inst", [0.3, 0.4], 2.0)
+    assert cache.get("inst", [0.1 + 1e-8, 0.2]) == 1.0   # rounds to the same key
+    cache.put("inst", [0.5, 0.6], 3.0)                   # evicts [0.3, 0.4]
+
+    assert cache.get("inst", [0.3, 0.4]) is None
+    assert cache.get("other", [0.1, 0.2]) is None        # fingerprints are separate
+    assert cache.get("inst", [0.1, 0.2, 0.0]) is None    # so are depths
+    assert len(cache) == 2
+    assert cache.stats() == {"entries": 2, "hits": 1, "misses": 3, "hit_rate": 0.25}
+
+    values, missing = cache.get_many("inst", [[0.5, 0.6], [0.7, 0.8]])
+    assert values[0] == 3.0 and missing.tolist() == [False, True]
+
+
+def test_cache_save_and_load(tmp_path):
+    path = tmp_path / "cache.json"
+    cache = QAOAEvaluationCache(max_entries=3, path=path)
+    for k in range(4):
+        cache.put("inst", [0.1 * k], float(k))
+    cache.put("inst", [0.2], [1.5, 0.1, -0.2])           # value and gradient
+    cache.save()
+
+    loaded = QAOAEvaluationCache(max_entries=3, path=path)
+    assert len(loaded) == 3
+    assert loaded.get("inst", [0.0]) is None
+    assert loaded.get("inst", [0.3]) == 3.0
+    assert loaded.get("inst", [0.2]) == [1.5, 0.1, -0.2]
+
+    # Keys of another tolerance do not line up, so that file is ignored
+    assert len(QAOAEvaluationCache(tolerance=1e-3, path=path)) == 0
+
+
+def test_cached_simulator_replays_expectations():
+    simulator = PermutationQAOA(random_distance_matrix(5, seed=30), reps=2, cache=QAOAEvaluationCache())
+    params = simulator.default_params()
+    value = simulator.expectation(params)
+    assert simulator.expectation(params) == value
+    assert simulator.cache.hits == 1 and simulator.cache.misses == 1
+    assert value == pytest.approx(float(simulator.compute_expectation(params)))
+
+
+# ── Parameter transfer ─────────────────────────────────────────────────────
+
+def test_interpolate_params():
+    np.testing.assert_allclose(interpolate_params([0.5, 0.2]), [0.5, 0.5, 0.2, 0.2])
+    np.testing.assert_allclose(interpolate_params([0.6, 0.2, 0.1, 0.5]),
+                               [0.6, 0.4, 0.2, 0.1, 0.3, 0.5])
+    assert len(extend_params([0.6, 0.2, 0.1, 0.5], reps=5)) == 10
+    with pytest.raises(ValueError):
+        extend_params([0.6, 0.2, 0.1, 0.5], reps=1)
+
+
+def test_qubo_energy_std_matches_cost_diagonal():
+    Q, offset = create_tsp_qubo_sparse(random_distance_matrix(4, seed=31), fix_start=True)
+    assert qubo_energy_std(Q) == pytest.approx(np.std(qubo_cost_diagonal(Q, offset)), rel=1e-9)
+
+
+def test_parameter_store_transfers_median(tmp_path):
+    store = QAOAParameterStore(tmp_path / "params.json")
+    store.record("random", "ring_swap", 6, [0.5, 0.3, 2.0, 4.0], value=1.0, scale=0.1)
+    store.record("random", "ring_swap", 6, [0.7, 0.1, 3.0, 5.0], value=2.0, scale=0.1)
+    store.record("random", "ring_swap", 6, [0.6, 0.2, 1.0, 3.0], value=3.0, scale=0.1)
+    store.record("random", "ring_swap", 5, [9.0, 9.0, 9.0, 9.0], scale=1.0)  # farther N
+    store.record("random", "x_mixer", 6, [9.0, 9.0, 9.0, 9.0], scale=1.0)    # other ansatz
+    store.save()
+
+    # Stored γ are normalized (γ·scale): median [0.6, 0.2 | 0.2, 0.4], then
+    # INTERP to p=3 and divided by the new instance's scale
+    loaded = QAOAParameterStore(tmp_path / "params.json")
+    params = loaded.warm_start("random", "ring_swap", 7, reps=3, scale=0.5)
+    np.testing.assert_allclose(params, np.concatenate([[0.6, 0.4, 0.2], np.array([0.2, 0.3, 0.4]) / 0.5]))
+
+    seeds = loaded.seeds("random", "ring_swap", 7, reps=2, scale=0.1, limit=3)
+    np.testing.assert_allclose(seeds, [[0.6, 0.2, 2.0, 4.0], [0.5, 0.3, 2.0, 4.0], [0.7, 0.1, 3.0, 5.0]])
+    assert loaded.warm_start("tsplib", "ring_swap", 7, reps=3) is None
+
+
+def test_parameter_store_keeps_best_record_per_instance():
+    store = QAOAParameterStore()
+    store.record("random", "ring_swap", 6, [0.5, 1.0], value=2.0, fingerprint="abc")
+    store.record("random", "ring_swap", 6, [0.9, 1.0], value=3.0, fingerprint="abc")
+    store.record("random", "ring_swap", 6, [0.4, 1.0], value=1.0, fingerprint="abc")
+    assert len(store) == 1 and store.records[0]["betas"] == [0.4]